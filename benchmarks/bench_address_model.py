@@ -0,0 +1,65 @@
+import timeit
+from memvis.memory import AddressRange
+from memvis.memory import convert_hex_to_int
+from memvis.memory import format_address
+from memvis.concurrent import AddressRangeIndex
+
+
+MAP_COUNTS = [100, 1000, 10000]
+MAP_SIZE = 0x1000
+FIRST_ADDRESS = 0x7f0000000000
+PAGE_HEIGHT = 26
+PAGE_WIDTH = 10
+REPEAT = 5
+NUMBER = 200
+
+
+def create_hex_ranges(map_count):
+    return [("{:x}".format(FIRST_ADDRESS + index * 2 * MAP_SIZE),
+             "{:x}".format(FIRST_ADDRESS + index * 2 * MAP_SIZE + MAP_SIZE))
+            for index in range(map_count)]
+
+
+def hex_string_frame(hex_ranges, start_address):
+    # Address handling of a frame when addresses were passed around as hex
+    # strings: the window is parsed, every scanned map range is parsed and
+    # each row label is computed from the parsed start address.
+    start = convert_hex_to_int(start_address)
+    end_address = hex(int(start_address, 16) + PAGE_HEIGHT * PAGE_WIDTH)
+    end = convert_hex_to_int(end_address)
+    for map_start, map_end in hex_ranges:
+        if convert_hex_to_int(map_start) < end and start < convert_hex_to_int(map_end):
+            break
+    start_value = int(start_address, 16)
+    return [hex(start_value + row * PAGE_WIDTH) for row in range(PAGE_HEIGHT)]
+
+
+def integer_frame(address_index, start_address):
+    end_address = start_address + PAGE_HEIGHT * PAGE_WIDTH
+    address_index.find_overlapping(start_address, end_address)
+    return [format_address(start_address + row * PAGE_WIDTH) for row in range(PAGE_HEIGHT)]
+
+
+def measure(function, *args):
+    timings = timeit.repeat(lambda: function(*args), repeat=REPEAT, number=NUMBER)
+    return min(timings) / NUMBER * 1e6
+
+
+def run():
+    print("{:>8} {:>16} {:>16} {:>10}".format(
+        "maps", "hex string (us)", "integer (us)", "speedup"))
+    for map_count in MAP_COUNTS:
+        hex_ranges = create_hex_ranges(map_count)
+        address_index = AddressRangeIndex(
+            [AddressRange(convert_hex_to_int(start), convert_hex_to_int(end))
+             for start, end in hex_ranges])
+        start_address = convert_hex_to_int(hex_ranges[-1][0])
+
+        hex_string_time = measure(hex_string_frame, hex_ranges, hex(start_address))
+        integer_time = measure(integer_frame, address_index, start_address)
+        print("{:>8} {:>16.2f} {:>16.2f} {:>9.1f}x".format(
+            map_count, hex_string_time, integer_time, hex_string_time / integer_time))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,82 @@
+import os
+import re
+import timeit
+import tempfile
+import tracemalloc
+from memvis.memory import parse_memory_maps
+
+
+LINE_COUNT = 50000
+REPEAT = 3
+LEGACY_MAP_LINE_REGEX = \
+    r'([0-9a-f]+)-([0-9a-f]+) (.{4}) ([0-9a-f]+) ([0-9a-f]{2,3}):([0-9a-f]{2,3}) ([0-9]+)(?: +(.*))?'
+
+
+class LegacyAddressSpaceMetadata(object):
+    # Shape of the metadata before the bulk parser: a regex compiled for every
+    # line and a dict-backed instance.
+    def __init__(self, memory_map_line):
+        matches = re.compile(LEGACY_MAP_LINE_REGEX).match(memory_map_line)
+        self.address_range = matches.group(1), matches.group(2)
+        self.memory_size = int(matches.group(2), 16) - int(matches.group(1), 16)
+        self.permissions = matches.group(3)
+        self.offset = int(matches.group(4), 16)
+        self.device = matches.group(5) + ":" + matches.group(6)
+        self.inode = matches.group(7)
+        self.path_name = matches.group(8)
+
+
+def create_maps_file(line_count):
+    maps_file = tempfile.NamedTemporaryFile("w", suffix=".maps", delete=False)
+    address = 0x7f0000000000
+    with maps_file:
+        for index in range(line_count):
+            if index % 3 == 0:
+                path_name = "/usr/lib/x86_64-linux-gnu/libsynthetic{}.so".format(index % 97)
+                maps_file.write("{:x}-{:x} r-xp {:08x} fe:00 {} {}{}\n".format(
+                    address, address + 0x1000, index * 0x1000, 400000 + index % 97,
+                    " " * 20, path_name))
+            else:
+                maps_file.write("{:x}-{:x} rw-p 00000000 00:00 0\n".format(
+                    address, address + 0x1000))
+            address += 0x2000
+    return maps_file.name
+
+
+def parse_legacy(maps_path):
+    with open(maps_path) as maps_file:
+        return [LegacyAddressSpaceMetadata(line) for line in maps_file.readlines()]
+
+
+def parse_bulk(maps_path):
+    with open(maps_path) as maps_file:
+        return parse_memory_maps(maps_file.readlines())
+
+
+def measure_time(function, maps_path):
+    return min(timeit.repeat(lambda: function(maps_path), repeat=REPEAT, number=1)) * 1e3
+
+
+def measure_memory(function, maps_path):
+    tracemalloc.start()
+    maps_metadata = function(maps_path)
+    memory_size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del maps_metadata
+    return memory_size / 2 ** 20
+
+
+def run():
+    maps_path = create_maps_file(LINE_COUNT)
+    try:
+        print("Parsing a synthetic maps file with {} lines".format(LINE_COUNT))
+        print("{:>8} {:>12} {:>12}".format("parser", "time (ms)", "memory (MiB)"))
+        for name, function in [("legacy", parse_legacy), ("bulk", parse_bulk)]:
+            print("{:>8} {:>12.1f} {:>12.1f}".format(
+                name, measure_time(function, maps_path), measure_memory(function, maps_path)))
+    finally:
+        os.remove(maps_path)
+
+
+if __name__ == "__main__":
+    run()
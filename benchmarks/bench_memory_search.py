@@ -0,0 +1,76 @@
+import os
+import sys
+import timeit
+import subprocess
+from memvis.memory import MemoryReader
+from memvis.memory import ProcessMemorySearch
+from memvis.memory import parse_search_query
+
+
+TARGET_SIZE = 512 * 2 ** 20
+REPEAT = 3
+NEEDLE = "memvis-needle"
+TARGET_SOURCE = """
+import sys
+import time
+heap = bytearray(b"\\x01") * {}
+for offset in range(0, len(heap), 2 ** 24):
+    heap[offset:offset + {}] = b"{}"
+sys.stdout.write("ready\\n")
+sys.stdout.flush()
+time.sleep(3600)
+"""
+QUERIES = [("bytes", "x:" + NEEDLE.encode("ascii").hex()),
+           ("string", NEEDLE),
+           ("pointer", "p:0x7fffdeadbeef")]
+
+
+def start_target(size):
+    target = subprocess.Popen(
+        [sys.executable, "-c", TARGET_SOURCE.format(size, len(NEEDLE), NEEDLE)],
+        stdout=subprocess.PIPE)
+    target.stdout.readline()
+    return target
+
+
+def get_worker_counts():
+    cpu_count = os.cpu_count() or 1
+    worker_counts = [1]
+    while worker_counts[-1] < 2 * cpu_count:
+        worker_counts.append(worker_counts[-1] * 2)
+    return worker_counts
+
+
+def measure(target_pid, maps_metadata, patterns, workers):
+    memory_search = ProcessMemorySearch(target_pid, lambda: maps_metadata, workers=workers)
+    matches = memory_search.search(patterns)
+    seconds = min(timeit.repeat(lambda: memory_search.search(patterns),
+                                repeat=REPEAT, number=1))
+    return len(matches), seconds
+
+
+def run():
+    target = start_target(TARGET_SIZE)
+    try:
+        memory_reader = MemoryReader(target.pid, use_ptrace=False)
+        maps_metadata = [metadata for metadata in memory_reader.maps_metadata
+                         if metadata.is_readable()]
+        memory_reader.close()
+        size = sum(metadata.memory_size for metadata in maps_metadata)
+        print("Searching {} MiB of readable mappings on {} cores".format(
+            size // 2 ** 20, os.cpu_count()))
+        print("{:>10} {:>8} {:>10} {:>12} {:>10}".format(
+            "query", "workers", "matches", "time (ms)", "GB/s"))
+        for name, query in QUERIES:
+            patterns = parse_search_query(query)
+            for workers in get_worker_counts():
+                match_count, seconds = measure(target.pid, maps_metadata, patterns, workers)
+                print("{:>10} {:>8} {:>10} {:>12.1f} {:>10.2f}".format(
+                    name, workers, match_count, seconds * 1e3, size / seconds / 1e9))
+    finally:
+        target.kill()
+        target.wait()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,70 @@
+import os
+import sys
+import time
+import timeit
+import subprocess
+from memvis.memory import MemoryReader
+from memvis.memory import MEM_FILE_BACKEND
+from memvis.memory import PARALLEL_MEM_FILE_BACKEND
+
+
+TARGET_SIZE = 512 * 2 ** 20
+REPEAT = 3
+TARGET_SOURCE = """
+import sys
+import time
+heap = bytearray(b"\\x01") * {}
+sys.stdout.write("ready\\n")
+sys.stdout.flush()
+time.sleep(3600)
+"""
+
+
+def start_target(size):
+    target = subprocess.Popen([sys.executable, "-c", TARGET_SOURCE.format(size)],
+                              stdout=subprocess.PIPE)
+    target.stdout.readline()
+    # Give the target time to block in sleep so its stack pointer is readable.
+    time.sleep(0.5)
+    return target
+
+
+def get_worker_counts():
+    cpu_count = os.cpu_count() or 1
+    worker_counts = [1]
+    while worker_counts[-1] < 2 * cpu_count:
+        worker_counts.append(worker_counts[-1] * 2)
+    return worker_counts
+
+
+def measure(target_pid, read_backend, read_workers=1):
+    memory_reader = MemoryReader(target_pid, use_ptrace=False, read_backend=read_backend,
+                                 read_workers=read_workers)
+    try:
+        memory_maps = memory_reader.read_memory()
+        size = sum(len(memory_map.memory_bytes) for memory_map in memory_maps)
+        seconds = min(timeit.repeat(memory_reader.read_memory, repeat=REPEAT, number=1))
+    finally:
+        memory_reader.close()
+    return size, seconds
+
+
+def run():
+    target = start_target(TARGET_SIZE)
+    try:
+        print("Reading all mappings of a target with a {} MiB heap on {} cores".format(
+            TARGET_SIZE // 2 ** 20, os.cpu_count()))
+        print("{:>10} {:>8} {:>12} {:>10}".format("backend", "workers", "time (ms)", "GB/s"))
+        configurations = [(MEM_FILE_BACKEND, 1)] + \
+            [(PARALLEL_MEM_FILE_BACKEND, workers) for workers in get_worker_counts()]
+        for read_backend, read_workers in configurations:
+            size, seconds = measure(target.pid, read_backend, read_workers)
+            print("{:>10} {:>8} {:>12.1f} {:>10.2f}".format(
+                read_backend, read_workers, seconds * 1e3, size / seconds / 1e9))
+    finally:
+        target.kill()
+        target.wait()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,187 @@
+import os
+import sys
+import json
+import time
+import random
+import timeit
+import argparse
+import platform
+import subprocess
+from memvis.memory import MemoryReader
+from memvis.memory import READ_BACKENDS
+from memvis.memory import parse_memory_maps
+from memvis.memory import get_process_maps_path
+from memvis.concurrent import AtomicMemoryReference
+from memvis.cli import ConsoleMemoryTable
+from .synthetic_target import SyntheticTarget
+from .synthetic_target import DEFAULT_MAPPING_COUNT
+from .synthetic_target import DEFAULT_MAPPING_SIZE
+
+
+RESULTS_FORMAT_VERSION = 1
+DEFAULT_REPEAT = 5
+MAPS_PARSE_NUMBER = 200
+GET_RANGE_SAMPLES = 10000
+DRAW_SAMPLES = 2000
+PAGE_HEIGHT = 26
+PAGE_WIDTH = 10
+
+
+def get_percentiles(timings):
+    timings = sorted(timings)
+    return {
+        "min_us": timings[0] * 1e6,
+        "p50_us": timings[len(timings) // 2] * 1e6,
+        "p99_us": timings[min(len(timings) * 99 // 100, len(timings) - 1)] * 1e6,
+        "max_us": timings[-1] * 1e6,
+    }
+
+
+def time_calls(function, arguments):
+    timings = []
+    for argument in arguments:
+        start = time.perf_counter()
+        function(argument)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def get_window_addresses(memory_maps, count):
+    # Windows start anywhere inside the readable regions, including near
+    # their ends, so some of them span two regions.
+    random_generator = random.Random(0)
+    regions = [(memory_map.address, len(memory_map.memory_bytes)) for memory_map in memory_maps
+               if len(memory_map.memory_bytes) > 0]
+    return [address + random_generator.randrange(size)
+            for address, size in (random_generator.choice(regions) for _ in range(count))]
+
+
+def bench_maps_parsing(target, repeat):
+    with open(get_process_maps_path(target.pid)) as maps_file:
+        maps_lines = maps_file.readlines()
+    seconds = min(timeit.repeat(lambda: parse_memory_maps(maps_lines),
+                                repeat=repeat, number=MAPS_PARSE_NUMBER)) / MAPS_PARSE_NUMBER
+    return {
+        "line_count": len(maps_lines),
+        "parse_us": seconds * 1e6,
+        "line_ns": seconds / len(maps_lines) * 1e9,
+    }
+
+
+def bench_region_reads(target, repeat):
+    results = {}
+    for read_backend in READ_BACKENDS:
+        memory_reader = MemoryReader(target.pid, use_ptrace=False, read_backend=read_backend)
+        try:
+            memory_maps = memory_reader.read_memory()
+            size = sum(len(memory_map.memory_bytes) for memory_map in memory_maps)
+            seconds = min(timeit.repeat(memory_reader.read_memory, repeat=repeat, number=1))
+        finally:
+            memory_reader.close()
+        results[read_backend] = {
+            "region_count": len(memory_maps),
+            "bytes": size,
+            "read_ms": seconds * 1e3,
+            "gb_per_second": size / seconds / 1e9,
+        }
+    return results
+
+
+def bench_reference_get_range(memory_maps, repeat):
+    memory_reference = AtomicMemoryReference()
+    memory_reference.set_memory_maps(memory_maps)
+    window_size = PAGE_HEIGHT * PAGE_WIDTH
+    addresses = get_window_addresses(memory_maps, GET_RANGE_SAMPLES)
+    timings = min((time_calls(lambda address: memory_reference.get_range(
+        address, address + window_size), addresses) for _ in range(repeat)), key=sum)
+    results = get_percentiles(timings)
+    results["window_bytes"] = window_size
+    return results
+
+
+def bench_table_draw(memory_maps, repeat):
+    memory_reference = AtomicMemoryReference()
+    memory_reference.set_memory_maps(memory_maps)
+    memory_table = ConsoleMemoryTable(0, height=PAGE_HEIGHT, width=PAGE_WIDTH)
+    window_size = PAGE_HEIGHT * PAGE_WIDTH
+    windows = []
+    for address in get_window_addresses(memory_maps, DRAW_SAMPLES):
+        _, metadata, memory_bytes = memory_reference.get_range(address, address + window_size)
+        windows.append((address, metadata, memory_bytes))
+
+    def draw_frame(window):
+        memory_table.set_memory_bytes(*window)
+        memory_table.draw()
+
+    timings = min((time_calls(draw_frame, windows) for _ in range(repeat)), key=sum)
+    return get_percentiles(timings)
+
+
+def get_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return ""
+
+
+def run_suite(mapping_count, mapping_size, repeat):
+    results = {}
+    with SyntheticTarget(mapping_count, mapping_size) as target:
+        results["maps_parsing"] = bench_maps_parsing(target, repeat)
+        results["region_reads"] = bench_region_reads(target, repeat)
+        memory_reader = MemoryReader(target.pid, use_ptrace=False)
+        try:
+            memory_maps = memory_reader.read_memory()
+        finally:
+            memory_reader.close()
+    results["reference_get_range"] = bench_reference_get_range(memory_maps, repeat)
+    results["table_draw"] = bench_table_draw(memory_maps, repeat)
+    return {
+        "format_version": RESULTS_FORMAT_VERSION,
+        "timestamp": time.time(),
+        "revision": get_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "parameters": {
+            "mapping_count": mapping_count,
+            "mapping_size": mapping_size,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def get_argument_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.bench_suite",
+        description="Measure the memvis hot paths against a synthetic target and print" +
+        " the results as JSON.")
+    parser.add_argument("-c", "--mapping-count", dest="mapping_count", type=int,
+                        help="Number of anonymous mappings in the target.",
+                        default=DEFAULT_MAPPING_COUNT)
+    parser.add_argument("-s", "--mapping-size", dest="mapping_size", type=int,
+                        help="Size of every mapping in KiB.",
+                        default=DEFAULT_MAPPING_SIZE // 1024)
+    parser.add_argument("-r", "--repeat", dest="repeat", type=int,
+                        help="Number of repetitions. The fastest one is reported.",
+                        default=DEFAULT_REPEAT)
+    parser.add_argument("-o", "--output", dest="output_path",
+                        help="File to write the results to instead of standard output.")
+    return parser
+
+
+def run():
+    args = get_argument_parser().parse_args()
+    report = run_suite(args.mapping_count, args.mapping_size * 1024, args.repeat)
+    if args.output_path is None:
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        sys.stdout.write("\n")
+    else:
+        with open(args.output_path, "w") as output_file:
+            json.dump(report, output_file, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,53 @@
+import sys
+import subprocess
+
+
+DEFAULT_MAPPING_COUNT = 256
+DEFAULT_MAPPING_SIZE = 256 * 1024
+TARGET_SOURCE = """
+import sys
+import mmap
+import time
+mappings = []
+for index in range({mapping_count}):
+    mapping = mmap.mmap(-1, {mapping_size})
+    mapping.write(bytes([index % 255 + 1]) * {mapping_size})
+    # A read-only page between the writable mappings keeps the kernel from
+    # merging them into one region.
+    guard = mmap.mmap(-1, mmap.PAGESIZE, prot=mmap.PROT_READ)
+    mappings.append((mapping, guard))
+sys.stdout.write("ready\\n")
+sys.stdout.flush()
+time.sleep(3600)
+"""
+
+
+class SyntheticTarget(object):
+    def __init__(self, mapping_count=DEFAULT_MAPPING_COUNT, mapping_size=DEFAULT_MAPPING_SIZE):
+        self.mapping_count = mapping_count
+        self.mapping_size = mapping_size
+        self.process = None
+        self.pid = None
+
+    def start(self):
+        self.process = subprocess.Popen(
+            [sys.executable, "-c", TARGET_SOURCE.format(
+                mapping_count=self.mapping_count, mapping_size=self.mapping_size)],
+            stdout=subprocess.PIPE)
+        self.process.stdout.readline()
+        self.pid = self.process.pid
+        return self
+
+    def stop(self):
+        if self.process is not None:
+            self.process.kill()
+            self.process.wait()
+            self.process.stdout.close()
+            self.process = None
+            self.pid = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.stop()
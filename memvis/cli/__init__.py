@@ -1 +1,3 @@
 from .console import *
+from .console_target import *
+from .memory_views import *
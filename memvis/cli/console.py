@@ -1,83 +1,261 @@
+import os
+import sys
 import time
 import curses
+import signal
 import logging
-import argparse
+import itertools
+import selectors
 import threading
-import prettytable
 from ..memory import convert_hex_to_int
+from ..memory import parse_search_query
+from ..memory import SearchMatch
+from ..memory import TIMING_SPANS
+from ..memory import GET_RANGE_SPAN
+from ..memory import RENDER_SPAN
+from ..concurrent import PointerIndex
+from ..concurrent import WORD_SIZE
 from .console_memory_table import ConsoleMemoryTable
+from .memory_views import VIEWS
+from .memory_views import POINTER_VIEW
+from .memory_views import PointerAnnotator
 
 UP = 259
 DOWN = 258
 LEFT = 260
 RIGHT = 261
 JUMP = 106
+SEARCH = ord('/')
+NEXT_MATCH = ord('n')
+PREVIOUS_MATCH = ord('N')
+REFERRERS = ord('r')
+NEXT_TARGET = ord('\t')
+HISTORY_BACK = ord('[')
+HISTORY_FORWARD = ord(']')
+HEATMAP = ord('h')
+TIMINGS = ord('t')
+NEXT_VIEW = ord('v')
+ENDIANNESS = ord('e')
+HEATMAP_REFRESH_PERIOD = 0.2
+SAMPLING_STATUS_PERIOD = 1.0
+TIMINGS_STATUS_PERIOD = 1.0
+TIMINGS_LOG_PERIOD = 10.0
+QUIT = (ord('q'), ord('Q'))
 
 
 class Console:
-    def __init__(self, target_pid, start_address, memory_reference, page_height=35,
-                 page_width=12, convert_ascii=True, frame_rate=10):
+    def __init__(self, targets, page_height=35, page_width=12, convert_ascii=True):
         self._log = logging.getLogger(self.__class__.__name__)
-        self.target_pid = target_pid
-        self.memory_reference = memory_reference
-        self.start_address = start_address
+        self.targets = list(targets)
+        self.target_index = 0
+        target = self.targets[0]
+        self.target_pid = target.pid
+        self.memory_reference = target.memory_reference
+        self.memory_search = target.memory_search
+        self.snapshot_history = target.snapshot_history
+        self.history_generation = None
+        self.sampling_monitor = None
+        self.sampling_status_at = 0
+        self.timings_status_at = 0
+        self.timings_logged_at = 0
+        self.view_index = 0
+        self.big_endian = False
+        self.pointer_annotator = PointerAnnotator()
+        self.start_address = target.start_address
         self.page_height = page_height
         self.page_width = page_width
         self.memory_table = ConsoleMemoryTable(
-            start_address, height=page_height, width=page_width, convert_ascii=convert_ascii)
+            self.start_address, height=page_height, width=page_width, convert_ascii=convert_ascii)
         self.end_address = self.memory_table.end_address
+        self.memory_reference.set_viewport(
+            self.start_address, self.end_address)
         self.standard_source = curses.initscr()
-        self.current_address_space_index = 0
         self.running = False
-        self.frame_rate = frame_rate
+        self.resized = False
+        self.drawn_frame = None
+        self.pad = None
+        self.search_thread = None
+        self.pointer_index = PointerIndex()
+        self.pending_matches = None
+        self.search_matches = []
+        self.match_index = -1
+        self.notify_read, self.notify_write = os.pipe()
+        os.set_blocking(self.notify_read, False)
+        os.set_blocking(self.notify_write, False)
+        for target in self.targets:
+            target.memory_reference.add_snapshot_listener(self.__on_snapshot)
 
     def start(self):
         self._log.info("Starting console UI.")
         self.running = True
-        self.key = ''
         self.standard_source.nodelay(1)
+        self.standard_source.keypad(1)
+        curses.noecho()
         curses.cbreak()
         curses.curs_set(0)
-        pad = curses.newwin(curses.LINES, curses.COLS, 1, 3)
-        while self.key not in [ord('q'), ord('Q')]:
-            self.standard_source.keypad(1)
-            self.key = self.standard_source.getch()
-            curses.flushinp()
-
-            if self.key == UP:
-                self.__increment_address(-1)
-            if self.key == DOWN:
-                self.__increment_address(1)
-
-            if self.key == LEFT:
-                self.__change_page(-1)
-            if self.key == RIGHT:
-                self.__change_page(1)
-
-            index, metadata, memory_bytes = self.memory_reference.get_range(
-                self.start_address, self.end_address)
-            self.current_address_space_index = index
-            self.memory_table.set_memory_bytes(
-                self.start_address, metadata, memory_bytes)
-            tableStr = self.memory_table.draw()
-
-            pad.addstr(tableStr)
-            pad.refresh()
-
-            pad.move(0, 0)
-            if self.key == JUMP:
-                self.__jump_to_address(pad)
-            time.sleep(1 / self.frame_rate)
+        self.pad = self.__create_pad()
+        selector = selectors.DefaultSelector()
+        selector.register(sys.stdin, selectors.EVENT_READ)
+        selector.register(self.notify_read, selectors.EVENT_READ)
+        previous_handler = signal.signal(signal.SIGWINCH, self.__on_resize)
+        try:
+            self.__draw()
+            while self.running:
+                timeout = None
+                if self.sampling_monitor is not None:
+                    timeout = HEATMAP_REFRESH_PERIOD
+                elif TIMING_SPANS.enabled:
+                    timeout = TIMINGS_STATUS_PERIOD
+                for selector_key, _ in selector.select(timeout):
+                    if selector_key.fileobj == self.notify_read:
+                        self.__drain_notifications()
+                self.__handle_keys(self.__read_keys())
+                if self.pending_matches is not None:
+                    self.__show_matches()
+                if self.resized:
+                    self.__resize()
+                if self.sampling_monitor is not None:
+                    self.__show_sampling_status()
+                elif TIMING_SPANS.enabled:
+                    self.__show_timings()
+                if self.running:
+                    self.__draw()
+        finally:
+            self.__stop_sampling()
+            signal.signal(signal.SIGWINCH, previous_handler)
+            selector.close()
 
-    def __jump_to_address(self, pad):
-        curses.echo()
-        curses.nocbreak()
-        curses.curs_set(1)
-        self.standard_source.addstr(10, 10, "Input address to jump to: ")
-        self.standard_source.nodelay(0)
-        self.standard_source.refresh()
-        jump_address = self.standard_source.getstr(11, 10, 14).decode("utf-8")
+    def __handle_keys(self, keys):
+        for key, repeats in itertools.groupby(keys):
+            count = len(list(repeats))
+            if key in QUIT:
+                self.running = False
+                return
+            if key == UP:
+                self.__increment_address(-count)
+            if key == DOWN:
+                self.__increment_address(count)
+            if key == LEFT:
+                self.__change_page(-count)
+            if key == RIGHT:
+                self.__change_page(count)
+            if key == curses.KEY_RESIZE:
+                self.resized = True
+            if key == JUMP:
+                self.__jump_to_address(self.pad)
+                self.memory_table.invalidate()
+                self.drawn_frame = None
+            if key == SEARCH and self.memory_search is not None:
+                self.__start_search()
+                self.memory_table.invalidate()
+                self.drawn_frame = None
+            if key == NEXT_TARGET:
+                self.__switch_target(count)
+            if key == REFERRERS:
+                self.__start_referrer_search()
+            if key == NEXT_MATCH:
+                self.__move_to_match(count)
+            if key == PREVIOUS_MATCH:
+                self.__move_to_match(-count)
+            if key == HISTORY_BACK:
+                self.__scrub_history(-count)
+            if key == HISTORY_FORWARD:
+                self.__scrub_history(count)
+            if key == HEATMAP and count % 2:
+                self.__toggle_heatmap()
+            if key == TIMINGS and count % 2:
+                self.__toggle_timings()
+            if key == NEXT_VIEW:
+                self.__set_view((self.view_index + count) % len(VIEWS), self.big_endian)
+            if key == ENDIANNESS and count % 2:
+                self.__set_view(self.view_index, not self.big_endian)
+
+    def __read_keys(self):
+        keys = []
+        key = self.standard_source.getch()
+        while key != -1:
+            keys.append(key)
+            key = self.standard_source.getch()
+        return keys
+
+    def __get_snapshot(self):
+        if self.history_generation is None:
+            return self.memory_reference.get_snapshot()
+        return self.snapshot_history.get_snapshot(
+            self.snapshot_history.find_index(self.history_generation))
+
+    def __draw(self):
+        snapshot = self.__get_snapshot()
+        heat_generation = None
+        if self.sampling_monitor is not None:
+            heat_generation = self.sampling_monitor.change_generation
+        frame = self.target_index, snapshot.generation, self.start_address, self.match_index, \
+            heat_generation, self.view_index, self.big_endian
+        if frame == self.drawn_frame:
+            return
+        started_at = TIMING_SPANS.start()
+        _, metadata, memory_bytes = snapshot.get_range(
+            self.start_address, self.end_address)
+        changed_ranges = snapshot.get_changed_ranges(
+            self.start_address, self.end_address)
+        TIMING_SPANS.stop(GET_RANGE_SPAN, started_at, len(memory_bytes))
+        if self.match_index >= 0:
+            match = self.search_matches[self.match_index]
+            changed_ranges = changed_ranges + [(match.address, match.address + match.size)]
+        annotate = None
+        if VIEWS[self.view_index] is POINTER_VIEW:
+            self.pointer_annotator.set_snapshot(snapshot)
+            annotate = self.pointer_annotator.annotate
+        self.memory_table.set_view(VIEWS[self.view_index], self.big_endian, annotate)
+        self.memory_table.set_memory_bytes(
+            self.start_address, metadata, memory_bytes, changed_ranges)
+        if self.sampling_monitor is not None:
+            self.memory_table.set_heat(
+                self.sampling_monitor.get_heat(self.start_address, self.end_address))
+        else:
+            self.memory_table.set_heat(None)
+        started_at = TIMING_SPANS.start()
+        self.memory_table.render(self.pad)
+        self.pad.refresh()
+        TIMING_SPANS.stop(RENDER_SPAN, started_at)
+        self.drawn_frame = frame
+
+    def __create_pad(self):
+        return curses.newwin(max(curses.LINES - 1, 1), max(curses.COLS - 3, 1), 1, 3)
+
+    def __resize(self):
+        self.resized = False
+        columns, lines = os.get_terminal_size(sys.stdout.fileno())
+        curses.resizeterm(lines, columns)
+        curses.update_lines_cols()
+        self.standard_source.clear()
         self.standard_source.refresh()
+        self.pad = self.__create_pad()
+        self.memory_table.invalidate()
+        self.drawn_frame = None
+
+    def __notify(self):
+        try:
+            os.write(self.notify_write, b"\0")
+        except (BlockingIOError, OSError):
+            pass
+
+    def __drain_notifications(self):
+        try:
+            while os.read(self.notify_read, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def __on_snapshot(self, generation):
+        self.__notify()
+
+    def __on_resize(self, signal_number, frame):
+        self.resized = True
+        self.__notify()
+
+    def __jump_to_address(self, pad):
+        jump_address = self.__prompt("Input address to jump to: ", 14)
         try:
             jump_address_int = convert_hex_to_int(jump_address)
             self.__jump_start_address_to(jump_address_int)
@@ -85,31 +263,214 @@ class Console:
             print("Wrong input! " + str(len(jump_address)))
             time.sleep(0.5)
 
+    def __start_search(self):
+        query = self.__prompt("Search (text, x:hex bytes, p:pointer): ", 64)
+        try:
+            patterns = parse_search_query(query)
+        except ValueError:
+            self.__set_status("Wrong search query: " + query)
+            return
+        self.__run_in_background("Searching for: " + query, self.memory_search.search, patterns)
+
+    def __start_referrer_search(self):
+        self.__run_in_background("Searching for pointers to: " + hex(self.start_address),
+                                 self.__find_referrers, self.start_address)
+
+    def __find_referrers(self, address):
+        self.pointer_index.update(self.__get_snapshot())
+        return [SearchMatch(referrer, WORD_SIZE)
+                for referrer in self.pointer_index.find_referrers(address)]
+
+    def __run_in_background(self, status, function, *args):
+        if self.search_thread is not None and self.search_thread.is_alive():
+            self.__set_status("A search is already running.")
+            return
+        self.__set_status(status)
+        self.search_thread = threading.Thread(
+            target=self.__run_search, args=(function,) + args, daemon=True)
+        self.search_thread.start()
+
+    def __run_search(self, function, *args):
+        target_index = self.target_index
+        try:
+            matches = function(*args)
+        except (IOError, OSError) as exception:
+            self._log.error("Search failed. Cause : {}".format(str(exception)))
+            matches = []
+        self.pending_matches = target_index, matches
+        self.__notify()
+
+    def __show_matches(self):
+        target_index, matches = self.pending_matches
+        self.pending_matches = None
+        if target_index != self.target_index:
+            return
+        self.search_matches = matches
+        self.match_index = -1
+        if not self.search_matches:
+            self.__set_status("No matches found.")
+            return
+        self.__move_to_match(1)
+
+    def __move_to_match(self, amount):
+        if not self.search_matches:
+            return
+        if self.match_index < 0 and amount < 0:
+            amount += 1
+        self.match_index = (self.match_index + amount) % len(self.search_matches)
+        match = self.search_matches[self.match_index]
+        self.__set_status("Match {}/{} at {}".format(
+            self.match_index + 1, len(self.search_matches), hex(match.address)))
+        self.__jump_start_address_to(match.address)
+
+    def __switch_target(self, amount):
+        if len(self.targets) < 2:
+            return
+        self.targets[self.target_index].start_address = self.start_address
+        self.__stop_sampling()
+        self.target_index = (self.target_index + amount) % len(self.targets)
+        target = self.targets[self.target_index]
+        self.target_pid = target.pid
+        self.memory_reference = target.memory_reference
+        self.memory_search = target.memory_search
+        self.snapshot_history = target.snapshot_history
+        self.history_generation = None
+        self.search_matches = []
+        self.match_index = -1
+        self.drawn_frame = None
+        self.__jump_start_address_to(target.start_address)
+        self.__set_status("Process {} ({}/{})".format(
+            target.pid, self.target_index + 1, len(self.targets)))
+
+    def __toggle_heatmap(self):
+        if self.sampling_monitor is not None:
+            self.__stop_sampling()
+            self.__set_status("Heatmap off")
+            return
+        create_sampling_monitor = self.targets[self.target_index].create_sampling_monitor
+        if create_sampling_monitor is None:
+            self.__set_status("Sampling is not available for this target.")
+            return
+        try:
+            self.sampling_monitor = create_sampling_monitor(
+                [(self.start_address, self.end_address)])
+        except (IOError, OSError) as exception:
+            self._log.error("Failed to start sampling. Cause : {}".format(str(exception)))
+            self.__set_status("Failed to start sampling: " + str(exception))
+            return
+        self.sampling_monitor.start()
+        self.sampling_status_at = 0
+
+    def __stop_sampling(self):
+        if self.sampling_monitor is not None:
+            self.sampling_monitor.stop()
+            self.sampling_monitor = None
+
+    def __show_sampling_status(self):
+        now = time.monotonic()
+        if now - self.sampling_status_at < SAMPLING_STATUS_PERIOD:
+            return
+        self.sampling_status_at = now
+        statistics = self.sampling_monitor.get_statistics()
+        self.__set_status("Heatmap: {:.0f}/{} Hz, {:.0f} us per sample, {:.1f}% busy,"
+                          " changed words: {}".format(statistics.get_sample_rate(), self.sampling_monitor.sample_rate,
+                                  statistics.get_sample_time() * 1e6,
+                                  100 * statistics.get_busy_fraction(),
+                                  statistics.changed_word_count))
+
+    def __set_view(self, view_index, big_endian):
+        self.view_index = view_index
+        self.big_endian = big_endian
+        view = VIEWS[view_index]
+        self.__set_status("View: {} {}".format(
+            view.name, "big endian" if big_endian else "little endian"))
+
+    def __toggle_timings(self):
+        if TIMING_SPANS.enabled:
+            TIMING_SPANS.log_spans()
+            TIMING_SPANS.disable()
+            self.__set_status("Timings off")
+            return
+        TIMING_SPANS.enable()
+        self.timings_logged_at = time.monotonic()
+        self.timings_status_at = 0
+        self.__set_status("Timings on, p50/p99 per stage")
+
+    def __show_timings(self):
+        now = time.monotonic()
+        if now - self.timings_status_at >= TIMINGS_STATUS_PERIOD:
+            self.timings_status_at = now
+            summary = TIMING_SPANS.get_summary()
+            if summary:
+                self.__set_status(summary)
+        if now - self.timings_logged_at >= TIMINGS_LOG_PERIOD:
+            self.timings_logged_at = now
+            TIMING_SPANS.log_spans()
+
+    def __scrub_history(self, amount):
+        if self.snapshot_history is None or len(self.snapshot_history) == 0:
+            self.__set_status("No snapshot history.")
+            return
+        history_size = len(self.snapshot_history)
+        if self.history_generation is not None:
+            index = self.snapshot_history.find_index(self.history_generation) + amount
+        elif amount < 0:
+            live_generation = self.memory_reference.get_generation()
+            newest = history_size - 1
+            if self.snapshot_history.get_generation(newest) == live_generation:
+                newest -= 1
+            index = newest + amount + 1
+        else:
+            return
+        if index >= history_size:
+            self.history_generation = None
+            self.__set_status("Live")
+            return
+        index = max(index, 0)
+        self.history_generation = self.snapshot_history.get_generation(index)
+        self.__set_status("History {}/{} from {:.1f}s ago".format(
+            index + 1, history_size, time.time() - self.snapshot_history.get_timestamp(index)))
+
+    def __set_status(self, status):
+        try:
+            self.standard_source.addstr(0, 3, status[:max(curses.COLS - 4, 0)])
+            self.standard_source.clrtoeol()
+            self.standard_source.refresh()
+        except curses.error:
+            pass
+
+    def __prompt(self, message, length):
+        curses.echo()
+        curses.nocbreak()
+        curses.curs_set(1)
+        self.standard_source.addstr(10, 10, message)
+        self.standard_source.nodelay(0)
+        self.standard_source.refresh()
+        answer = self.standard_source.getstr(11, 10, length).decode("utf-8")
+        self.standard_source.refresh()
         self.standard_source.nodelay(1)
         curses.noecho()
         curses.cbreak()
         curses.curs_set(0)
+        return answer
 
     def __change_page(self, amount):
-        address_ranges = self.memory_reference.address_ranges
-        self.current_address_space_index += amount
-        if self.current_address_space_index < 0:
-            self.current_address_space_index = 0
-        if self.current_address_space_index >= len(address_ranges):
-            self.current_address_space_index = len(address_ranges) - 1
-        space = address_ranges[self.current_address_space_index]
-        self.__jump_start_address_to(space.start)
+        space = self.memory_reference.get_adjacent_range(
+            self.start_address, amount)
+        if space is not None:
+            self.__jump_start_address_to(space.start)
 
     def __jump_start_address_to(self, address):
-        self.start_address = hex(address)
-        self.end_address = hex(
-            address + self.page_height * self.page_width)
+        self.start_address = address
+        self.end_address = address + self.page_height * self.page_width
+        self.memory_reference.set_viewport(
+            self.start_address, self.end_address)
 
     def __increment_address(self, amount):
-        start_int = convert_hex_to_int(self.start_address)
-        start_int = start_int + amount * self.page_width
-        self.start_address = hex(start_int)
-        self.end_address = hex(start_int + self.page_height * self.page_width)
+        self.start_address = self.start_address + amount * self.page_width
+        self.end_address = self.start_address + self.page_height * self.page_width
+        self.memory_reference.set_viewport(
+            self.start_address, self.end_address)
 
     def __del__(self):
         self._log.info("Destroying console UI.")
@@ -118,3 +479,5 @@ class Console:
         curses.curs_set(1)
         curses.echo()
         curses.endwin()
+        os.close(self.notify_read)
+        os.close(self.notify_write)
@@ -1,4 +1,7 @@
-from prettytable import PrettyTable
+import curses
+from ..memory import format_address
+from .memory_views import BYTE_VIEW
+from .memory_views import decode_rows
 
 ADDRESS = 0
 PERMISSIONS = 1
@@ -8,6 +11,31 @@ INODE = 4
 PATHNAME = 5
 MAX_METADATA_LINE = 19
 WILDCARD = "????????"
+METADATA_COLUMN_WIDTH = MAX_METADATA_LINE + 2
+ADDRESS_COLUMN_WIDTH = 18
+BYTE_COLUMN_WIDTH = 6
+HEADER_ROWS = 3
+HIGHLIGHT = curses.A_REVERSE
+HIGHLIGHT_ATTRIBUTES = (curses.A_NORMAL, HIGHLIGHT)
+HEAT_ATTRIBUTES = (curses.A_NORMAL, curses.A_UNDERLINE, curses.A_BOLD,
+                   curses.A_BOLD | curses.A_UNDERLINE, curses.A_REVERSE)
+
+
+def create_glyph_table(convert_ascii):
+    glyphs = []
+    for byte_value in range(256):
+        if convert_ascii and 31 < byte_value < 127:
+            glyph = chr(byte_value)
+        elif byte_value == 0:
+            glyph = "0x00"
+        else:
+            glyph = hex(byte_value)
+        glyphs.append(glyph.center(BYTE_COLUMN_WIDTH))
+    return tuple(glyphs)
+
+
+ASCII_GLYPHS = create_glyph_table(True)
+HEX_GLYPHS = create_glyph_table(False)
 
 
 class ConsoleMemoryTable(object):
@@ -17,44 +45,182 @@ class ConsoleMemoryTable(object):
         self.start = 0
         self.end = height * width
         self.start_address = start_address
-        self.end_address = self.__calculate_offset_address(
-            start_address, self.end)
-        self.header = self.__get_header_row()
+        self.end_address = start_address + self.end
         self.convert_ascii = convert_ascii
+        self.glyphs = ASCII_GLYPHS if convert_ascii else HEX_GLYPHS
+        self.view = BYTE_VIEW
+        self.big_endian = False
+        self.annotate = None
+        self.word_rows = None
+        self.__set_layout()
+        self.metadata = None
+        self.metadata_cells = self.__get_metadata_cells()
         self.memory_bytes = None
+        self.highlights = bytes(self.end)
+        self.heat = None
+        self.drawn_rows = None
 
-    def set_memory_bytes(self, start_address, metadata, memory_bytes):
+    def set_memory_bytes(self, start_address, metadata, memory_bytes, changed_ranges=None):
         self.start_address = start_address
-        self.metadata = metadata
-        self.end_address = self.__calculate_offset_address(
-            start_address, self.end)
+        if metadata is not self.metadata:
+            self.metadata = metadata
+            self.metadata_cells = self.__get_metadata_cells()
+        self.end_address = start_address + self.end
         self.memory_bytes = memory_bytes
+        self.highlights = self.__get_highlights(changed_ranges)
+        self.word_rows = None
+        if self.view.is_word_view():
+            self.word_rows = decode_rows(self.view, memory_bytes, self.width, self.height,
+                                         self.big_endian)
+
+    def set_heat(self, heat):
+        self.heat = heat
+
+    def set_view(self, view, big_endian=False, annotate=None):
+        self.annotate = annotate
+        if view is self.view and big_endian == self.big_endian:
+            return
+        self.view = view
+        self.big_endian = big_endian
+        self.__set_layout()
+        if self.memory_bytes is not None:
+            self.word_rows = None
+            if view.is_word_view():
+                self.word_rows = decode_rows(view, self.memory_bytes, self.width, self.height,
+                                             big_endian)
+        self.invalidate()
+
+    def invalidate(self):
+        self.drawn_rows = None
+
+    def render(self, window):
+        if self.drawn_rows is None:
+            self.__render_frame(window)
+            self.drawn_rows = [((), ())] * self.height
+
+        for row in range(self.height):
+            cells = self.__get_row_cells(row)
+            attributes = self.__get_row_attributes(row)
+            drawn_cells, drawn_attributes = self.drawn_rows[row]
+            if cells == drawn_cells and attributes == drawn_attributes:
+                continue
+            for column, cell in enumerate(cells):
+                if column < len(drawn_cells) and drawn_cells[column] == cell and \
+                        drawn_attributes[column] == attributes[column]:
+                    continue
+                self.__write(window, HEADER_ROWS + row,
+                             self.column_offsets[column], cell, attributes[column])
+            self.drawn_rows[row] = cells, attributes
 
     def draw(self):
-        start_address_value = int(self.start_address, 16)
-        table = PrettyTable(self.header)
-        offset = 0
+        lines = [self.border, self.__join_cells(self.header), self.border]
+        for row in range(self.height):
+            lines.append(self.__join_cells(self.__get_row_cells(row)))
+        lines.append(self.border)
+        return "\n".join(lines)
+
+    def __get_row_cells(self, row):
+        position = row * self.width
+        glyphs = self.glyphs
+        cells = [self.metadata_cells[row],
+                 format_address(self.start_address + position).center(ADDRESS_COLUMN_WIDTH)]
+        if self.word_rows is not None:
+            format_value = self.view.format_value
+            cells += [format_value(value, self.annotate).center(self.word_column_width)
+                      [:self.word_column_width] for value in self.word_rows[row]]
+            position += self.word_count * self.view.word_size
+        cells += [glyphs[byte_value]
+                  for byte_value in self.memory_bytes[position:(row + 1) * self.width]]
+        return cells
+
+    def __get_row_attributes(self, row):
+        position = row * self.width
+        if self.heat is not None:
+            levels, attributes = self.heat[position:position + self.width], HEAT_ATTRIBUTES
+        else:
+            levels = self.highlights[position:position + self.width]
+            attributes = HIGHLIGHT_ATTRIBUTES
+        if not any(levels):
+            return self.plain_attributes
+        if self.view.is_word_view():
+            # A word cell takes the strongest level of its bytes.
+            word_size = self.view.word_size
+            levels = [max(levels[index:index + word_size])
+                      for index in range(0, self.word_count * word_size, word_size)] + \
+                list(levels[self.word_count * word_size:])
+        return [curses.A_NORMAL, curses.A_NORMAL] + [attributes[level] for level in levels]
+
+    def __set_layout(self):
+        # Word views merge the byte columns of a word into one cell, so the
+        # table keeps its width. Bytes after the last whole word of a row
+        # stay byte cells.
+        word_size = self.view.word_size
+        self.word_count = self.width // word_size if self.view.is_word_view() else 0
+        self.word_column_width = word_size * (BYTE_COLUMN_WIDTH + 1) - 1
+        self.column_widths = [METADATA_COLUMN_WIDTH, ADDRESS_COLUMN_WIDTH] + \
+            [self.word_column_width] * self.word_count + \
+            [BYTE_COLUMN_WIDTH] * (self.width - self.word_count * word_size)
+        self.column_offsets = self.__get_column_offsets()
+        self.border = "+" + "+".join("-" * column_width
+                                     for column_width in self.column_widths) + "+"
+        self.header = self.__get_header_row()
+        self.plain_attributes = [curses.A_NORMAL] * len(self.column_widths)
+
+    def __get_highlights(self, changed_ranges):
+        highlights = bytearray(self.end)
+        for changed_start, changed_end in changed_ranges or ():
+            start = max(changed_start - self.start_address, 0)
+            end = min(changed_end - self.start_address, self.end)
+            if start < end:
+                highlights[start:end] = b"\x01" * (end - start)
+        return highlights
+
+    def __render_frame(self, window):
+        border_row = HEADER_ROWS + self.height
+        self.__write(window, 0, 0, self.border)
+        self.__write(window, 1, 0, self.__join_cells(self.header))
+        self.__write(window, 2, 0, self.border)
+        for row in range(HEADER_ROWS, border_row):
+            for column_offset in self.column_offsets:
+                self.__write(window, row, column_offset - 1, "|")
+            self.__write(window, row, len(self.border) - 1, "|")
+        self.__write(window, border_row, 0, self.border)
+
+    def __write(self, window, row, column, text, attribute=curses.A_NORMAL):
+        height, width = window.getmaxyx()
+        if row >= height or column >= width:
+            return
+        try:
+            window.addstr(row, column, text[:width - column], attribute)
+        except curses.error:
+            # Writing the bottom right cell moves the cursor out of the
+            # window, which curses reports after the text is drawn.
+            pass
+
+    def __join_cells(self, cells):
+        return "|" + "|".join(cells) + "|"
+
+    def __get_column_offsets(self):
+        offsets = []
+        offset = 1
+        for column_width in self.column_widths:
+            offsets.append(offset)
+            offset += column_width + 1
+        return offsets
+
+    def __get_metadata_cells(self):
+        cells = []
         path_leftover = ""
-        for position in range(self.start, self.end, self.width):
-            next_line = self.memory_bytes[position: position + self.width]
-            line_as_string = []
-            metadata_string = self.__get_metadata_at_position(offset)
+        for position in range(self.height):
+            metadata_string = self.__get_metadata_at_position(position)
             if metadata_string == "":
                 metadata_string = path_leftover
                 path_leftover = ""
             if len(metadata_string) > MAX_METADATA_LINE:
                 path_leftover = metadata_string[MAX_METADATA_LINE:]
                 metadata_string = metadata_string[:MAX_METADATA_LINE]
-
-            line_as_string += [metadata_string]
-            line_as_string = line_as_string + \
-                [hex(start_address_value + offset * self.width)]
-            line_as_string += list(
-                map(lambda x: str(self.__convert_to_ascii_symbol(x)), next_line))
-            table.add_row(line_as_string)
-            offset += 1
-
-        return str(table)
+            cells.append(metadata_string.center(METADATA_COLUMN_WIDTH))
+        return cells
 
     def __get_metadata_at_position(self, position):
         if self.metadata is None:
@@ -74,30 +240,20 @@ class ConsoleMemoryTable(object):
         return metadata
 
     def __get_address_range(self):
-        start, end = self.metadata.address_range
-        return start + "-" + end
+        return str(self.metadata.address_range)
 
     def __get_pathname(self):
         path_name = self.metadata.path_name
-        if path_name is "":
+        if path_name == "":
             return WILDCARD
         return path_name
 
     def __get_header_row(self):
-        header = ["Address Space Data ", "    Address     "]
-        for i in range(self.width):
-            header = header + [hex(i)]
+        header = ["Address Space Data".center(METADATA_COLUMN_WIDTH),
+                  "Address".center(ADDRESS_COLUMN_WIDTH)]
+        word_size = self.view.word_size
+        for i in range(self.word_count):
+            header = header + [hex(i * word_size).center(self.word_column_width)]
+        for i in range(self.word_count * word_size, self.width):
+            header = header + [hex(i).center(BYTE_COLUMN_WIDTH)]
         return header
-
-    def __calculate_offset_address(self, hex_address, offset):
-        address_int = int(hex_address, 16)
-        address_int += offset
-        return hex(address_int)
-
-    def __convert_to_ascii_symbol(self, byte_value):
-        if self.convert_ascii and 31 < byte_value < 127:
-            return chr(byte_value)
-        hex_value = hex(byte_value)
-        if byte_value == 0:
-            hex_value += '0'
-        return hex_value
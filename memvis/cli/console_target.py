@@ -0,0 +1,9 @@
+class ConsoleTarget(object):
+    def __init__(self, pid, memory_reference, start_address, memory_search=None,
+                 snapshot_history=None, create_sampling_monitor=None):
+        self.pid = pid
+        self.memory_reference = memory_reference
+        self.start_address = start_address
+        self.memory_search = memory_search
+        self.snapshot_history = snapshot_history
+        self.create_sampling_monitor = create_sampling_monitor
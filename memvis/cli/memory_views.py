@@ -0,0 +1,102 @@
+import os
+import struct
+from ..memory import ElfSymbolCache
+
+
+MAX_ANNOTATIONS = 4096
+
+
+def format_hex_word(word_size):
+    word_format = "0x{:0" + str(2 * word_size) + "x}"
+    return lambda value, annotate: word_format.format(value)
+
+
+def format_float(value, annotate):
+    return "{:.6g}".format(value)
+
+
+def format_pointer(value, annotate):
+    annotation = annotate(value) if annotate is not None else None
+    if annotation is None:
+        return "{:#x}".format(value)
+    return "{:#x} {}".format(value, annotation)
+
+
+class MemoryView(object):
+    __slots__ = ("name", "word_size", "format_character", "format_value")
+
+    def __init__(self, name, word_size, format_character=None, format_value=None):
+        self.name = name
+        self.word_size = word_size
+        self.format_character = format_character
+        self.format_value = format_value
+
+    def is_word_view(self):
+        return self.word_size > 1
+
+    def decode(self, memory_bytes, big_endian=False):
+        size = len(memory_bytes) - len(memory_bytes) % self.word_size
+        word_format = (">" if big_endian else "<") + self.format_character
+        return [value for value, in struct.iter_unpack(word_format, memory_bytes[:size])]
+
+
+BYTE_VIEW = MemoryView("bytes", 1)
+POINTER_VIEW = MemoryView("pointers", 8, "Q", format_pointer)
+VIEWS = (BYTE_VIEW,
+         MemoryView("u32", 4, "I", format_hex_word(4)),
+         MemoryView("u64", 8, "Q", format_hex_word(8)),
+         MemoryView("f32", 4, "f", format_float),
+         MemoryView("f64", 8, "d", format_float),
+         POINTER_VIEW)
+
+
+def decode_rows(view, memory_bytes, row_size, row_count, big_endian=False):
+    # Rows that hold a whole number of words are decoded with one unpack for
+    # the frame, otherwise every row is unpacked on its own.
+    words_per_row = row_size // view.word_size
+    if row_size % view.word_size == 0:
+        values = view.decode(memory_bytes[:row_size * row_count], big_endian)
+        return [values[row * words_per_row:(row + 1) * words_per_row]
+                for row in range(row_count)]
+    return [view.decode(memory_bytes[row * row_size:
+                                     row * row_size + words_per_row * view.word_size],
+                        big_endian)
+            for row in range(row_count)]
+
+
+class PointerAnnotator(object):
+    def __init__(self, symbol_cache=None):
+        self.symbol_cache = symbol_cache if symbol_cache is not None else ElfSymbolCache()
+        self.address_ranges = None
+        self.snapshot = None
+        self.annotations = {}
+
+    def set_snapshot(self, snapshot):
+        if snapshot.address_ranges != self.address_ranges:
+            self.address_ranges = snapshot.address_ranges
+            self.annotations = {}
+        self.snapshot = snapshot
+
+    def annotate(self, value):
+        annotation = self.annotations.get(value, False)
+        if annotation is False:
+            if len(self.annotations) >= MAX_ANNOTATIONS:
+                self.annotations = {}
+            annotation = self.annotations[value] = self.__annotate(value)
+        return annotation
+
+    def __annotate(self, value):
+        if self.snapshot is None:
+            return None
+        index = self.snapshot.address_index.find_containing(value)
+        if index is None:
+            return None
+        metadata = self.snapshot.ordered_memory_maps[index].metadata
+        if metadata.inode == "0" or not metadata.path_name.startswith("/"):
+            return metadata.path_name or "anon"
+        file_name = os.path.basename(metadata.path_name)
+        symbol = self.symbol_cache.symbolize(metadata, value)
+        if symbol is not None:
+            return "{}!{}".format(file_name, symbol)
+        return "{}+{:#x}".format(file_name,
+                                 value - metadata.address_range.start + metadata.offset)
@@ -1,2 +1,9 @@
 from .atomic_memory_reference import *
 from .memory_updater import *
+from .address_range_index import *
+from .memory_snapshot import *
+from .pointer_index import *
+from .read_scheduler import *
+from .memory_session import *
+from .snapshot_history import *
+from .sampling_monitor import *
@@ -0,0 +1,35 @@
+from bisect import bisect_left
+from bisect import bisect_right
+
+
+class AddressRangeIndex(object):
+    def __init__(self, address_ranges):
+        self.address_ranges = address_ranges
+        self.starts = [address_range.start for address_range in address_ranges]
+        self.ends = [address_range.end for address_range in address_ranges]
+
+    def find_overlapping(self, start, end):
+        first = bisect_right(self.ends, start)
+        last = bisect_left(self.starts, end)
+        return range(first, max(first, last))
+
+    def find_containing(self, address):
+        position = bisect_right(self.starts, address) - 1
+        if position >= 0 and address < self.ends[position]:
+            return position
+        return None
+
+    def find_adjacent(self, address, amount):
+        if not self.address_ranges:
+            return None
+        position = bisect_right(self.starts, address) - 1
+        if amount < 0 and (position < 0 or address >= self.ends[position]):
+            position += 1
+        position = min(max(position + amount, 0), len(self.address_ranges) - 1)
+        return position
+
+    def __len__(self):
+        return len(self.address_ranges)
+
+    def __getitem__(self, index):
+        return self.address_ranges[index]
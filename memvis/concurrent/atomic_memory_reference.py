@@ -1,73 +1,50 @@
 from threading import Lock
-from ..memory.memory_reader import convert_hex_to_int
-from ..memory.memory_reader import MemoryReader
+from .memory_snapshot import MemorySnapshot
 import logging
 
 
-class AddressRange(object):
-    def __init__(self, start, end):
-        self.start = convert_hex_to_int(start)
-        self.end = convert_hex_to_int(end)
-
-    def __eq__(self, other):
-        return self.start == other.start and \
-            self.end == other.end
-
-    def __lt__(self, other):
-        return self.start < other.start
-
-    def __hash__(self):
-        return self.start.__hash__()
-
-
 class AtomicMemoryReference(object):
     def __init__(self):
         self.__lock = Lock()
         self._log = logging.getLogger(self.__class__.__name__)
-        self.address_ranges = []
-        self.memory_maps = {}
+        self.snapshot = MemorySnapshot()
+        self.viewport = None
+        self.viewport_listeners = []
+        self.snapshot_listeners = []
 
-    def get_range(self, startAddress, endAddress):
-        result = []
-        start = convert_hex_to_int(startAddress)
-        end = convert_hex_to_int(endAddress)
-        length = end - start
-        metadata = None
-        for index, address_range in enumerate(self.address_ranges):
-            memory_map = self.memory_maps[address_range]
-            map_start, map_end = memory_map.metadata.get_address_range_ints()
-            if start < map_start:
-                slice_end = min(map_start, end)
-                zeroes = [0] * (slice_end - start)
-                result = result + zeroes
-                start = slice_end
-            if start > end:
-                return index, metadata, result
-            if end < map_end:
-                slice_start = start - map_start
-                slice_end = end - map_start
-                memory_slice = memory_map.memory_bytes[slice_start:slice_end]
-                result = result + memory_slice
-                metadata = memory_map.metadata
-                return index, metadata, result
-            if end > map_end and start < map_end:
-                slice_start = start - map_start
-                slice_end = map_end - map_start
-                memory_slice = memory_map.memory_bytes[slice_start:slice_end]
-                result = result + memory_slice
-                start = map_end
-                metadata = memory_map.metadata
-        if len(result) < length:
-            self._log.error(result)
-            result = result + [0] * (length - len(result))
+    def get_snapshot(self):
+        return self.snapshot
 
-        return 0, metadata, result
+    def get_generation(self):
+        return self.snapshot.generation
 
-    def set_memory_maps(self, memory_maps):
-        self.memory_maps = {}
-        for memory_map in memory_maps:
-            start, end = memory_map.metadata.address_range
-            address_range = AddressRange(start, end)
-            self.memory_maps[address_range] = memory_map
+    def get_range(self, start, end):
+        return self.snapshot.get_range(start, end)
+
+    def get_changed_ranges(self, start, end):
+        return self.snapshot.get_changed_ranges(start, end)
 
-        self.address_ranges = sorted(self.memory_maps)
+    def get_adjacent_range(self, address, amount):
+        return self.snapshot.get_adjacent_range(address, amount)
+
+    def set_memory_maps(self, memory_maps):
+        with self.__lock:
+            snapshot = MemorySnapshot(memory_maps, self.snapshot.generation + 1)
+            self.snapshot = snapshot
+        for listener in self.snapshot_listeners:
+            listener(snapshot.generation)
+        return snapshot.generation
+
+    def set_viewport(self, start_address, end_address):
+        self.viewport = start_address, end_address
+        for listener in self.viewport_listeners:
+            listener(start_address, end_address)
+
+    def get_viewport(self):
+        return self.viewport
+
+    def add_viewport_listener(self, listener):
+        self.viewport_listeners.append(listener)
+
+    def add_snapshot_listener(self, listener):
+        self.snapshot_listeners.append(listener)
@@ -0,0 +1,62 @@
+import logging
+from ..memory import DEFAULT_PREFETCH_SIZE
+from ..memory import MEM_FILE_BACKEND
+from ..memory import DEFAULT_READ_WORKERS
+from ..memory import SharedMappingCache
+from .atomic_memory_reference import AtomicMemoryReference
+from .memory_updater import MemoryUpdater
+from .read_scheduler import ReadScheduler
+from .snapshot_history import SnapshotHistory
+
+
+class MemorySession(object):
+    def __init__(self, pids, use_ptrace=True, update_period=5, lazy=True,
+                 prefetch_size=DEFAULT_PREFETCH_SIZE, incremental=False,
+                 read_backend=MEM_FILE_BACKEND, read_workers=DEFAULT_READ_WORKERS,
+                 read_budget=None, share_mappings=True, history_budget=0):
+        self._log = logging.getLogger(self.__class__.__name__)
+        self.pids = list(pids)
+        self.read_scheduler = ReadScheduler(read_budget)
+        self.shared_mappings = SharedMappingCache() if share_mappings else None
+        self.memory_references = {}
+        self.memory_updaters = {}
+        self.snapshot_histories = {}
+        for pid in self.pids:
+            self.memory_references[pid] = AtomicMemoryReference()
+            if history_budget > 0:
+                self.__add_snapshot_history(pid, history_budget // len(self.pids))
+            self.memory_updaters[pid] = MemoryUpdater(
+                pid, self.memory_references[pid], use_ptrace, update_period, lazy,
+                prefetch_size, incremental, read_backend, read_workers=read_workers,
+                read_scheduler=self.read_scheduler, shared_mappings=self.shared_mappings)
+
+    def start(self):
+        self._log.info("Starting memory session for processes : {}".format(self.pids))
+        for memory_updater in self.memory_updaters.values():
+            memory_updater.start()
+        self.read_scheduler.start()
+
+    def stop(self):
+        for memory_updater in self.memory_updaters.values():
+            memory_updater.stop()
+        self.read_scheduler.stop()
+        self.read_scheduler.join()
+        if self.shared_mappings is not None:
+            self._log.info("Shared mappings : {} stored, {} bytes not read again."
+                           .format(len(self.shared_mappings), self.shared_mappings.saved_size))
+
+    def get_memory_reference(self, pid):
+        return self.memory_references[pid]
+
+    def get_memory_updater(self, pid):
+        return self.memory_updaters[pid]
+
+    def get_snapshot_history(self, pid):
+        return self.snapshot_histories.get(pid)
+
+    def __add_snapshot_history(self, pid, history_budget):
+        memory_reference = self.memory_references[pid]
+        snapshot_history = SnapshotHistory(history_budget)
+        memory_reference.add_snapshot_listener(
+            lambda generation: snapshot_history.record(memory_reference.get_snapshot()))
+        self.snapshot_histories[pid] = snapshot_history
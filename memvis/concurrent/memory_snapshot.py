@@ -0,0 +1,61 @@
+from bisect import bisect_left
+from .address_range_index import AddressRangeIndex
+
+
+class MemorySnapshot(object):
+    __slots__ = ("generation", "memory_maps", "address_ranges",
+                 "ordered_memory_maps", "address_index")
+
+    def __init__(self, memory_maps=(), generation=0):
+        maps_by_range = {}
+        for memory_map in memory_maps:
+            maps_by_range[memory_map.metadata.address_range] = memory_map
+
+        self.generation = generation
+        self.memory_maps = maps_by_range
+        self.address_ranges = tuple(sorted(maps_by_range))
+        self.ordered_memory_maps = tuple(maps_by_range[address_range]
+                                         for address_range in self.address_ranges)
+        self.address_index = AddressRangeIndex(self.address_ranges)
+
+    def get_range(self, start, end):
+        result = bytearray(end - start)
+        index = 0
+        metadata = None
+        for map_index in self.address_index.find_overlapping(start, end):
+            address_range = self.address_index[map_index]
+            memory_map = self.ordered_memory_maps[map_index]
+            slice_start = max(start, address_range.start)
+            slice_end = min(end, address_range.end)
+            if slice_start == start and slice_end == end:
+                return map_index, memory_map.metadata, \
+                    memory_map.get_range(start, end)
+            memory_map.copy_range(
+                result, slice_start - start, slice_start, slice_end)
+            index = map_index
+            metadata = memory_map.metadata
+
+        return index, metadata, result
+
+    def get_changed_ranges(self, start, end):
+        changed_ranges = []
+        for map_index in self.address_index.find_overlapping(start, end):
+            map_changed_ranges = self.ordered_memory_maps[map_index].changed_ranges
+            if not map_changed_ranges:
+                continue
+            position = max(bisect_left(map_changed_ranges, (start, start)) - 1, 0)
+            for changed_start, changed_end in map_changed_ranges[position:]:
+                if changed_start >= end:
+                    break
+                if changed_end > start:
+                    changed_ranges.append((max(changed_start, start), min(changed_end, end)))
+        return changed_ranges
+
+    def get_adjacent_range(self, address, amount):
+        index = self.address_index.find_adjacent(address, amount)
+        if index is None:
+            return None
+        return self.address_index[index]
+
+    def __len__(self):
+        return len(self.ordered_memory_maps)
@@ -1,28 +1,55 @@
-import threading
-import time
+import asyncio
 import logging
 from ..memory import MemoryReader
+from ..memory import MemoryReaderError
+from ..memory import DEFAULT_PREFETCH_SIZE
+from ..memory import MEM_FILE_BACKEND
+from ..memory import DEFAULT_READ_WORKERS
+from ..memory import PAGE_SIZE
+from ..memory import get_window_bounds
+from .read_scheduler import ReadScheduler
+
+BACKGROUND_BATCH_SIZE = 256 * PAGE_SIZE
 
 
 class MemoryUpdater(object):
-    def __init__(self, pid, memory_reference, use_ptrace=True, update_period=5):
+    def __init__(self, pid, memory_reference, use_ptrace=True, update_period=5,
+                 lazy=True, prefetch_size=DEFAULT_PREFETCH_SIZE, incremental=False,
+                 read_backend=MEM_FILE_BACKEND, background_batch_size=BACKGROUND_BATCH_SIZE,
+                 read_workers=DEFAULT_READ_WORKERS, read_scheduler=None, shared_mappings=None):
         self._log = logging.getLogger(self.__class__.__name__)
         self.pid = pid
         self.running = False
-        self.thread = threading.Thread(target=self.__update_memory_maps)
         self.memory_reference = memory_reference
-        self.memory_reader = MemoryReader(pid)
+        self.memory_reader = MemoryReader(
+            pid, use_ptrace, incremental=incremental, read_backend=read_backend,
+            read_workers=read_workers, shared_mappings=shared_mappings)
         self.update_period = update_period
-        self.exit = threading.Event()
+        self.lazy = lazy
+        self.prefetch_size = prefetch_size
+        self.background_batch_size = background_batch_size
+        self.loaded_window = None
+        self.memory_maps = None
+        self.owns_scheduler = read_scheduler is None
+        self.read_scheduler = read_scheduler
+        if read_scheduler is None:
+            self.read_scheduler = ReadScheduler()
+        self.read_scheduler.add_close_callback(self.memory_reader.close)
+        self.wakeup = asyncio.Event()
+        self.memory_reference.add_viewport_listener(self.__on_viewport_change)
 
     def start(self):
         self._log.info("Starting memory updater.")
         self.running = True
-        self.thread.start()
+        self.read_scheduler.schedule(self.__update_memory_maps)
+        if self.owns_scheduler:
+            self.read_scheduler.start()
 
     def stop(self):
         self.running = False
-        self.exit.set()
+        self.__wake()
+        if self.owns_scheduler:
+            self.read_scheduler.stop()
 
     def get_stack_pointer(self):
         return self.memory_reader.get_stack_pointer()
@@ -30,13 +57,83 @@ class MemoryUpdater(object):
     def __del__(self):
         self._log.info("Destroying memory updater.")
         self.running = False
-        if self.thread.is_alive():
-            self.thread.join()
+        if self.owns_scheduler:
+            self.read_scheduler.stop()
+            self.read_scheduler.join()
 
-    def __update_memory_maps(self):
+    async def __update_memory_maps(self):
         self._log.info("Updating memory maps.")
         while self.running:
-            memory_map = self.memory_reader.read_memory()
-            self._log.info("Memory maps size: " + str(len(memory_map)))
-            self.memory_reference.set_memory_maps(memory_map)
-            self.exit.wait(self.update_period)
+            self.wakeup.clear()
+            await self.__refresh_memory_map_metadata()
+            read_task = asyncio.ensure_future(self.__read_memory())
+            wakeup_task = asyncio.ensure_future(self.wakeup.wait())
+            await asyncio.wait([read_task, wakeup_task],
+                               return_when=asyncio.FIRST_COMPLETED)
+            if not read_task.done():
+                read_task.cancel()
+            await asyncio.gather(read_task, return_exceptions=True)
+            if self.running and not self.wakeup.is_set():
+                try:
+                    await asyncio.wait_for(wakeup_task, self.update_period)
+                except asyncio.TimeoutError:
+                    pass
+            wakeup_task.cancel()
+
+    async def __refresh_memory_map_metadata(self):
+        try:
+            maps_diff = await self.__run(self.memory_reader.refresh_memory_map_metadata)
+        except MemoryReaderError as exception:
+            self._log.error("Keeping previous memory maps metadata. Cause : {}"
+                            .format(str(exception)))
+            return
+        if maps_diff.has_changes():
+            self._log.info("Memory maps changed : {}".format(str(maps_diff)))
+
+    async def __read_memory(self):
+        viewport = self.memory_reference.get_viewport()
+        if self.lazy and viewport is not None:
+            start_address, end_address = viewport
+            self.loaded_window = get_window_bounds(
+                start_address, end_address, self.prefetch_size)
+            read_pass = await self.__run(
+                self.memory_reader.create_window_read_pass, start_address, end_address,
+                self.prefetch_size, self.memory_maps)
+        else:
+            read_pass = await self.__run(
+                self.memory_reader.create_read_pass, self.memory_maps)
+
+        try:
+            if viewport is not None and not self.lazy:
+                self.loaded_window = get_window_bounds(
+                    viewport[0], viewport[1], self.prefetch_size)
+                await self.__run(read_pass.read_overlapping, *self.loaded_window)
+                self.__publish(read_pass.get_memory_maps())
+            while not read_pass.is_done():
+                await self.read_scheduler.acquire(self.background_batch_size)
+                await self.__run(read_pass.read_next, self.background_batch_size)
+        except asyncio.CancelledError:
+            await self.__run(read_pass.cancel)
+            self.memory_maps = read_pass.get_memory_maps()
+            self._log.info("Cancelled background memory read.")
+            raise
+
+        self.memory_maps = read_pass.get_memory_maps()
+        self.__publish(self.memory_maps)
+
+    def __publish(self, memory_maps):
+        self._log.info("Memory maps size: " + str(len(memory_maps)))
+        self.memory_reference.set_memory_maps(memory_maps)
+
+    async def __run(self, function, *args):
+        return await self.read_scheduler.run(function, *args)
+
+    def __wake(self):
+        self.read_scheduler.call_soon_threadsafe(self.wakeup.set)
+
+    def __on_viewport_change(self, start_address, end_address):
+        if self.loaded_window is None:
+            return
+        window_start, window_end = self.loaded_window
+        if start_address < window_start or end_address > window_end:
+            self.__wake()
@@ -0,0 +1,151 @@
+import re
+from array import array
+from bisect import bisect_left
+from bisect import bisect_right
+from ..memory import PAGE_SIZE
+from ..memory import diff_memory_bytes
+
+WORD_SIZE = 8
+SCAN_CHUNK_SIZE = 256 * PAGE_SIZE
+POINTER_PREFIX_BYTE = 5
+MAX_SINGLE_UPDATES = 256
+
+
+def align_to_word_start(address):
+    return address - address % WORD_SIZE
+
+
+def align_to_word_end(address):
+    return align_to_word_start(address + WORD_SIZE - 1)
+
+
+def get_prefix_regex(low, high):
+    # Every pointer into [low, high) has its sixth byte within the sixth bytes
+    # of the bounds and its two top bytes zero, so only those words need to
+    # be decoded.
+    if high > 1 << 48:
+        return None
+    low_prefix = (low >> 40) & 0xff
+    high_prefix = ((high - 1) >> 40) & 0xff
+    if low_prefix == 0:
+        return None
+    return re.compile(b"[" + re.escape(bytes([low_prefix])) + b"-" +
+                      re.escape(bytes([high_prefix])) + b"]")
+
+
+def extract_pointers(memory_map, address_index, start=None, end=None):
+    if not address_index or memory_map.is_unreadable():
+        return []
+    map_end = memory_map.address + len(memory_map.memory_bytes)
+    start = align_to_word_end(memory_map.address if start is None
+                              else max(memory_map.address, start))
+    end = align_to_word_start(map_end if end is None else min(map_end, end))
+    starts, ends = address_index.starts, address_index.ends
+    low, high = starts[0], ends[-1]
+    prefix_regex = get_prefix_regex(low, high)
+
+    pointers = []
+    append = pointers.append
+    for chunk_start in range(start, end, SCAN_CHUNK_SIZE):
+        chunk_end = min(chunk_start + SCAN_CHUNK_SIZE, end)
+        chunk = memoryview(memory_map.get_range(chunk_start, chunk_end))
+        words = chunk.cast("Q")
+        if prefix_regex is None:
+            candidates = range(len(words))
+        else:
+            candidates = (match.start() for match in prefix_regex.finditer(
+                chunk[POINTER_PREFIX_BYTE::WORD_SIZE].tobytes()))
+        for word_index in candidates:
+            word = words[word_index]
+            if low <= word < high and word < ends[bisect_right(starts, word) - 1]:
+                append((word, chunk_start + word_index * WORD_SIZE))
+    return pointers
+
+
+class PointerIndex(object):
+    def __init__(self):
+        self.targets = array("Q")
+        self.referrers = array("Q")
+        self.address_ranges = None
+        self.memory_maps = {}
+
+    def update(self, snapshot):
+        if snapshot.address_ranges != self.address_ranges:
+            self.__rebuild(snapshot)
+            return
+
+        removed = []
+        added = []
+        for address_range, memory_map in zip(snapshot.address_ranges,
+                                             snapshot.ordered_memory_maps):
+            previous_map = self.memory_maps[address_range]
+            if previous_map.memory_bytes is memory_map.memory_bytes:
+                continue
+            if previous_map.is_unreadable() or memory_map.is_unreadable() or \
+                    previous_map.address != memory_map.address or \
+                    len(previous_map.memory_bytes) != len(memory_map.memory_bytes):
+                removed += extract_pointers(previous_map, snapshot.address_index)
+                added += extract_pointers(memory_map, snapshot.address_index)
+                continue
+            changed_ranges = diff_memory_bytes(previous_map.memory_bytes, memory_map.memory_bytes,
+                                               memory_map.address)
+            for changed_start, changed_end in changed_ranges:
+                changed_start = align_to_word_start(changed_start)
+                changed_end = align_to_word_end(changed_end)
+                removed += extract_pointers(previous_map, snapshot.address_index,
+                                            changed_start, changed_end)
+                added += extract_pointers(memory_map, snapshot.address_index,
+                                          changed_start, changed_end)
+        self.memory_maps = dict(snapshot.memory_maps)
+        self.__apply(removed, added)
+
+    def find_referrers(self, address):
+        first = bisect_left(self.targets, address)
+        last = bisect_right(self.targets, address)
+        return self.referrers[first:last].tolist()
+
+    def find_references(self, start, end):
+        first = bisect_left(self.targets, start)
+        last = bisect_left(self.targets, end)
+        return list(zip(self.targets[first:last], self.referrers[first:last]))
+
+    def __len__(self):
+        return len(self.targets)
+
+    def __rebuild(self, snapshot):
+        pointers = []
+        for memory_map in snapshot.ordered_memory_maps:
+            pointers += extract_pointers(memory_map, snapshot.address_index)
+        self.__set_pointers(sorted(pointers))
+        self.address_ranges = snapshot.address_ranges
+        self.memory_maps = dict(snapshot.memory_maps)
+
+    def __apply(self, removed, added):
+        unchanged = set(removed).intersection(added)
+        removed = [pointer for pointer in removed if pointer not in unchanged]
+        added = [pointer for pointer in added if pointer not in unchanged]
+        if len(removed) + len(added) > MAX_SINGLE_UPDATES:
+            removed = set(removed)
+            pointers = [pointer for pointer in zip(self.targets, self.referrers)
+                        if pointer not in removed]
+            self.__set_pointers(sorted(pointers + added))
+            return
+        for target, referrer in removed:
+            position = self.__find_position(target, referrer)
+            if position < len(self.targets) and self.targets[position] == target and \
+                    self.referrers[position] == referrer:
+                del self.targets[position]
+                del self.referrers[position]
+        for target, referrer in added:
+            position = self.__find_position(target, referrer)
+            self.targets.insert(position, target)
+            self.referrers.insert(position, referrer)
+
+    def __find_position(self, target, referrer):
+        first = bisect_left(self.targets, target)
+        last = bisect_right(self.targets, target, first)
+        return bisect_left(self.referrers, referrer, first, last)
+
+    def __set_pointers(self, pointers):
+        self.targets = array("Q", [target for target, _ in pointers])
+        self.referrers = array("Q", [referrer for _, referrer in pointers])
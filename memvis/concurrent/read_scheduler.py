@@ -0,0 +1,89 @@
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ReadScheduler(object):
+    def __init__(self, read_budget=None):
+        self._log = logging.getLogger(self.__class__.__name__)
+        self.read_budget = read_budget
+        self.available_budget = read_budget or 0
+        self.refilled_at = time.monotonic()
+        self.started = False
+        self.tasks = set()
+        self.close_callbacks = []
+        self.thread = threading.Thread(target=self.__run_event_loop)
+        # Memory readers are not thread safe, so every blocking read of every
+        # target goes through a single worker in submission order.
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.loop = asyncio.new_event_loop()
+        self.budget_lock = asyncio.Lock()
+
+    def start(self):
+        if self.started:
+            return
+        self._log.info("Starting read scheduler.")
+        self.started = True
+        self.thread.start()
+
+    def stop(self):
+        self.call_soon_threadsafe(self.loop.stop)
+
+    def join(self):
+        if self.thread.is_alive():
+            self.thread.join()
+
+    def schedule(self, coroutine_function, *args):
+        self.loop.call_soon_threadsafe(self.__create_task, coroutine_function, args)
+
+    def add_close_callback(self, callback):
+        self.close_callbacks.append(callback)
+
+    def call_soon_threadsafe(self, callback, *args):
+        try:
+            self.loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            pass
+
+    async def run(self, function, *args):
+        return await self.loop.run_in_executor(self.executor, function, *args)
+
+    async def acquire(self, read_size):
+        if self.read_budget is None:
+            return
+        # The lock queues waiting targets in arrival order, so a budget
+        # shortage is spread round robin across them.
+        async with self.budget_lock:
+            while True:
+                now = time.monotonic()
+                self.available_budget = min(
+                    self.read_budget,
+                    self.available_budget + (now - self.refilled_at) * self.read_budget)
+                self.refilled_at = now
+                if self.available_budget >= min(read_size, self.read_budget):
+                    self.available_budget -= read_size
+                    return
+                await asyncio.sleep(
+                    (min(read_size, self.read_budget) - self.available_budget) / self.read_budget)
+
+    def __create_task(self, coroutine_function, args):
+        task = self.loop.create_task(coroutine_function(*args))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    def __run_event_loop(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_forever()
+            # Stopped targets finish their current read before exiting.
+            tasks = list(self.tasks)
+            if tasks:
+                self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        finally:
+            self.executor.shutdown(wait=True)
+            for callback in self.close_callbacks:
+                callback()
+            self.loop.close()
+            self._log.info("Stopped read scheduler.")
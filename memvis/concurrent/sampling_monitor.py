@@ -0,0 +1,180 @@
+import time
+import logging
+import threading
+from array import array
+from bisect import bisect_right
+from ..memory import create_range_reader
+from ..memory import diff_memory_bytes
+
+SAMPLE_WORD_SIZE = 8
+DEFAULT_SAMPLE_RATE = 1000
+HEAT_LEVELS = 4
+
+
+def align_to_words(start, end):
+    return start - start % SAMPLE_WORD_SIZE, end + (-end) % SAMPLE_WORD_SIZE
+
+
+class SamplingStatistics(object):
+    __slots__ = ("sample_count", "failed_count", "elapsed_time", "busy_time",
+                 "changed_word_count")
+
+    def __init__(self, sample_count=0, failed_count=0, elapsed_time=0.0, busy_time=0.0,
+                 changed_word_count=0):
+        self.sample_count = sample_count
+        self.failed_count = failed_count
+        self.elapsed_time = elapsed_time
+        self.busy_time = busy_time
+        self.changed_word_count = changed_word_count
+
+    def get_sample_rate(self):
+        if self.elapsed_time <= 0:
+            return 0.0
+        return self.sample_count / self.elapsed_time
+
+    def get_busy_fraction(self):
+        if self.elapsed_time <= 0:
+            return 0.0
+        return self.busy_time / self.elapsed_time
+
+    def get_sample_time(self):
+        if self.sample_count == 0:
+            return 0.0
+        return self.busy_time / self.sample_count
+
+
+class SamplingMonitor(object):
+    def __init__(self, target_pid, ranges, sample_rate=DEFAULT_SAMPLE_RATE, range_reader=None):
+        self._log = logging.getLogger(self.__class__.__name__)
+        self.target_pid = target_pid
+        self.ranges = [align_to_words(start, end) for start, end in sorted(ranges)]
+        self.range_starts = [start for start, _ in self.ranges]
+        self.range_offsets = []
+        offset = 0
+        for start, end in self.ranges:
+            self.range_offsets.append(offset)
+            offset += end - start
+        self.sample_rate = sample_rate
+        self.range_reader = range_reader
+        if range_reader is None:
+            self.range_reader = create_range_reader(
+                target_pid, [(start, end - start) for start, end in self.ranges])
+        word_count = offset // SAMPLE_WORD_SIZE
+        self.change_counts = array("I", bytes(4 * word_count))
+        self.last_changes = array("d", bytes(8 * word_count))
+        self.max_change_count = 0
+        self.previous_bytes = None
+        self.change_generation = 0
+        self.statistics = SamplingStatistics()
+        self.started_at = None
+        self.running = False
+        self.thread = threading.Thread(target=self.__run, daemon=True)
+
+    def start(self):
+        self._log.info("Sampling {} bytes of process : {} at {} Hz.".format(
+            len(self.range_reader.buffer), self.target_pid, self.sample_rate))
+        self.running = True
+        self.started_at = time.monotonic()
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread.is_alive():
+            self.thread.join()
+        self.range_reader.close()
+        statistics = self.get_statistics()
+        self._log.info("Took {} samples at {:.0f} Hz, {:.1f}% busy.".format(
+            statistics.sample_count, statistics.get_sample_rate(),
+            100 * statistics.get_busy_fraction()))
+
+    def sample(self, timestamp=None):
+        sample_start = time.perf_counter()
+        if timestamp is None:
+            timestamp = time.time()
+        try:
+            self.range_reader.read()
+        except OSError as exception:
+            self.statistics.failed_count += 1
+            self._log.debug("Sample failed. Cause : {}".format(str(exception)))
+            return
+        current_bytes = self.range_reader.buffer
+        if self.previous_bytes is None:
+            self.previous_bytes = bytearray(current_bytes)
+        elif current_bytes != self.previous_bytes:
+            self.__count_changes(diff_memory_bytes(self.previous_bytes, current_bytes),
+                                 timestamp)
+            self.previous_bytes[:] = current_bytes
+        self.statistics.sample_count += 1
+        self.statistics.busy_time += time.perf_counter() - sample_start
+
+    def get_statistics(self):
+        statistics = self.statistics
+        elapsed_time = 0.0
+        if self.started_at is not None:
+            elapsed_time = time.monotonic() - self.started_at
+        return SamplingStatistics(statistics.sample_count, statistics.failed_count,
+                                  elapsed_time, statistics.busy_time,
+                                  statistics.changed_word_count)
+
+    def get_change_count(self, address):
+        word_index = self.__get_word_index(address)
+        return 0 if word_index is None else self.change_counts[word_index]
+
+    def get_last_change(self, address):
+        word_index = self.__get_word_index(address)
+        return None if word_index is None or self.change_counts[word_index] == 0 \
+            else self.last_changes[word_index]
+
+    def get_heat(self, start, end):
+        # Levels grow with the order of magnitude of a word's change count
+        # relative to the most changed word, so rare changes stay visible.
+        heat = bytearray(max(end - start, 0))
+        max_bits = self.max_change_count.bit_length()
+        if max_bits == 0:
+            return heat
+        for range_index, (range_start, range_end) in enumerate(self.ranges):
+            overlap_start = max(start, range_start)
+            overlap_end = min(end, range_end)
+            if overlap_start >= overlap_end:
+                continue
+            offset = self.range_offsets[range_index] - range_start
+            for address in range(overlap_start, overlap_end):
+                count = self.change_counts[(offset + address) // SAMPLE_WORD_SIZE]
+                if count:
+                    heat[address - start] = -(-HEAT_LEVELS * count.bit_length() // max_bits)
+        return heat
+
+    def __count_changes(self, changed_ranges, timestamp):
+        changed_words = set()
+        for changed_start, changed_end in changed_ranges:
+            changed_words.update(range(changed_start // SAMPLE_WORD_SIZE,
+                                       (changed_end - 1) // SAMPLE_WORD_SIZE + 1))
+        for word_index in changed_words:
+            count = self.change_counts[word_index] + 1
+            self.change_counts[word_index] = count
+            self.last_changes[word_index] = timestamp
+            if count == 1:
+                self.statistics.changed_word_count += 1
+            if count > self.max_change_count:
+                self.max_change_count = count
+        self.change_generation += 1
+
+    def __get_word_index(self, address):
+        range_index = bisect_right(self.range_starts, address) - 1
+        if range_index < 0 or address >= self.ranges[range_index][1]:
+            return None
+        range_start = self.ranges[range_index][0]
+        return (self.range_offsets[range_index] + address - range_start) // SAMPLE_WORD_SIZE
+
+    def __run(self):
+        period = 1.0 / self.sample_rate
+        deadline = time.monotonic()
+        while self.running:
+            self.sample()
+            deadline += period
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            elif delay < -period:
+                # Samples that fell behind are skipped instead of taken in a burst.
+                deadline = time.monotonic()
@@ -0,0 +1,125 @@
+import time
+import logging
+import threading
+from bisect import bisect_left
+from ..memory import MemoryMap
+from ..memory import PageStore
+from .memory_snapshot import MemorySnapshot
+
+DEFAULT_HISTORY_BUDGET = 64 * 2 ** 20
+PAGE_ID_SIZE = 4
+
+
+class SnapshotHistoryEntry(object):
+    __slots__ = ("generation", "timestamp", "last_used", "memory_maps", "snapshot")
+
+    def __init__(self, generation, timestamp, memory_maps):
+        self.generation = generation
+        self.timestamp = timestamp
+        self.last_used = timestamp
+        self.memory_maps = memory_maps
+        self.snapshot = None
+
+    def get_snapshot(self):
+        if self.snapshot is None:
+            self.snapshot = MemorySnapshot(self.memory_maps, self.generation)
+        return self.snapshot
+
+    def get_page_table_size(self):
+        return sum(len(memory_map.memory_bytes.page_ids) * PAGE_ID_SIZE
+                   for memory_map in self.memory_maps if memory_map.is_paged())
+
+    def release(self):
+        for memory_map in self.memory_maps:
+            if memory_map.is_paged():
+                memory_map.memory_bytes.release()
+
+
+class SnapshotHistory(object):
+    def __init__(self, memory_budget=DEFAULT_HISTORY_BUDGET, page_store=None):
+        self._log = logging.getLogger(self.__class__.__name__)
+        self.__lock = threading.Lock()
+        self.memory_budget = memory_budget
+        self.page_store = page_store if page_store is not None else PageStore()
+        self.entries = []
+        self.page_table_size = 0
+        self.sources = {}
+
+    def record(self, snapshot, timestamp=None):
+        if timestamp is None:
+            timestamp = time.time()
+        with self.__lock:
+            if self.entries and self.entries[-1].generation == snapshot.generation:
+                return
+            entry = SnapshotHistoryEntry(snapshot.generation, timestamp,
+                                         self.__store_memory_maps(snapshot))
+            self.entries.append(entry)
+            self.page_table_size += entry.get_page_table_size()
+            self.__evict()
+
+    def get_snapshot(self, index):
+        with self.__lock:
+            entry = self.entries[index]
+            entry.last_used = time.time()
+            return entry.get_snapshot()
+
+    def get_timestamp(self, index):
+        return self.entries[index].timestamp
+
+    def get_generation(self, index):
+        return self.entries[index].generation
+
+    def find_index(self, generation):
+        with self.__lock:
+            generations = [entry.generation for entry in self.entries]
+        return min(bisect_left(generations, generation), len(generations) - 1)
+
+    def get_memory_size(self):
+        return self.page_store.get_stored_size() + self.page_table_size
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __store_memory_maps(self, snapshot):
+        # Every region is stored as a delta against the region recorded last,
+        # so pages that did not change between snapshots are shared.
+        memory_maps = []
+        sources = {}
+        for address_range, memory_map in zip(snapshot.address_ranges,
+                                             snapshot.ordered_memory_maps):
+            if memory_map.is_unreadable():
+                memory_maps.append(memory_map)
+                continue
+            if memory_map.is_paged():
+                memory_map.memory_bytes.page_store.retain(memory_map.memory_bytes.page_ids)
+                memory_maps.append(memory_map)
+                continue
+            previous_bytes, previous_map = self.sources.get(address_range, (None, None))
+            if previous_map is None or previous_map.address != memory_map.address:
+                previous_bytes, previous_map = None, None
+            if previous_map is not None and previous_bytes is memory_map.memory_bytes:
+                paged_memory = previous_map.memory_bytes
+                self.page_store.retain(paged_memory.page_ids)
+            else:
+                paged_memory = self.page_store.add_memory(
+                    memory_map.memory_bytes,
+                    previous_map.memory_bytes if previous_map is not None else None,
+                    previous_bytes)
+            stored_map = MemoryMap(memory_map.pid, memory_map.metadata, paged_memory,
+                                   memory_map.address, memory_map.changed_ranges)
+            memory_maps.append(stored_map)
+            sources[address_range] = memory_map.memory_bytes, stored_map
+        self.sources = sources
+        return memory_maps
+
+    def __evict(self):
+        while len(self.entries) > 1 and self.get_memory_size() > self.memory_budget:
+            # The newest entry is never evicted. Of the others the least
+            # recently viewed goes first, which for unviewed entries is the
+            # oldest one.
+            index = min(range(len(self.entries) - 1),
+                        key=lambda entry_index: self.entries[entry_index].last_used)
+            entry = self.entries.pop(index)
+            self.page_table_size -= entry.get_page_table_size()
+            entry.release()
+            self._log.debug("Evicted snapshot generation : {}".format(entry.generation))
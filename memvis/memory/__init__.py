@@ -1,2 +1,15 @@
 from .memory_reader import *
 from .stack_pointer_reader import *
+from .dirty_page_tracker import *
+from .read_backend import *
+from .address_range import *
+from .memory_maps_diff import *
+from .snapshot_file import *
+from .memory_diff import *
+from .memory_search import *
+from .shared_mappings import *
+from .process_tree import *
+from .page_store import *
+from .process_session import *
+from .timing_spans import *
+from .elf_symbols import *
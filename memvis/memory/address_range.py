@@ -0,0 +1,38 @@
+def format_address(address):
+    return hex(address)
+
+
+class AddressRange(object):
+    __slots__ = ("start", "end")
+
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+
+    def get_size(self):
+        return self.end - self.start
+
+    def contains(self, address):
+        return self.start <= address < self.end
+
+    def __iter__(self):
+        yield self.start
+        yield self.end
+
+    def __eq__(self, other):
+        if not isinstance(other, AddressRange):
+            return NotImplemented
+        return self.start == other.start and \
+            self.end == other.end
+
+    def __lt__(self, other):
+        return self.start < other.start
+
+    def __hash__(self):
+        return self.start.__hash__()
+
+    def __str__(self):
+        return "{:x}-{:x}".format(self.start, self.end)
+
+    def __repr__(self):
+        return "AddressRange({}, {})".format(format_address(self.start), format_address(self.end))
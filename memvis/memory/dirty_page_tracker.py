@@ -0,0 +1,157 @@
+import mmap
+import array
+import ctypes
+import hashlib
+import logging
+
+
+PAGE_SIZE = mmap.PAGESIZE
+PAGEMAP_ENTRY_SIZE = 8
+SOFT_DIRTY_BIT = 1 << 55
+CLEAR_SOFT_DIRTY = "4"
+PAGE_HASH_SIZE = 8
+
+
+def get_process_pagemap_path(process_id):
+    return "/proc/" + str(process_id) + "/pagemap"
+
+
+def get_process_clear_refs_path(process_id):
+    return "/proc/" + str(process_id) + "/clear_refs"
+
+
+def merge_page_ranges(page_addresses):
+    ranges = []
+    for page_address in page_addresses:
+        if ranges and ranges[-1][1] == page_address:
+            ranges[-1][1] = page_address + PAGE_SIZE
+        else:
+            ranges.append([page_address, page_address + PAGE_SIZE])
+    return [(start, end) for start, end in ranges]
+
+
+def create_page_tracker(target_pid):
+    if SoftDirtyPageTracker.is_supported(target_pid):
+        return SoftDirtyPageTracker(target_pid)
+    return HashPageTracker()
+
+
+class DirtyPageTrackerError(Exception):
+    pass
+
+
+class SoftDirtyPageTracker(object):
+    def __init__(self, target_pid):
+        self._log = logging.getLogger(self.__class__.__name__)
+        self.target_pid = target_pid
+
+    @staticmethod
+    def is_supported(target_pid):
+        try:
+            return SoftDirtyPageTracker.__probe_soft_dirty_bit() and \
+                SoftDirtyPageTracker.__can_clear_soft_dirty(target_pid)
+        except (IOError, OSError, ValueError):
+            return False
+
+    def get_dirty_ranges(self, start, end):
+        pagemap_path = get_process_pagemap_path(self.target_pid)
+        try:
+            with open(pagemap_path, "rb") as pagemap_file:
+                entries = self.__read_pagemap_entries(pagemap_file, start, end)
+        except (IOError, OSError) as exception:
+            message = "Failed to read pagemap file at : {}. Cause : {}"\
+                .format(pagemap_path, str(exception))
+            self._log.error(message)
+            raise DirtyPageTrackerError(message) from exception
+
+        first_page = start - start % PAGE_SIZE
+        dirty_pages = [first_page + index * PAGE_SIZE
+                       for index, entry in enumerate(entries)
+                       if entry & SOFT_DIRTY_BIT]
+        return [(max(page_start, start), min(page_end, end))
+                for page_start, page_end in merge_page_ranges(dirty_pages)]
+
+    def update_pages(self, address, memory_bytes):
+        return [(address, address + len(memory_bytes))]
+
+    def forget_range(self, start, end):
+        pass
+
+    def reset(self):
+        clear_refs_path = get_process_clear_refs_path(self.target_pid)
+        try:
+            with open(clear_refs_path, "w") as clear_refs_file:
+                clear_refs_file.write(CLEAR_SOFT_DIRTY)
+        except (IOError, OSError) as exception:
+            message = "Failed to clear soft-dirty bits at : {}. Cause : {}"\
+                .format(clear_refs_path, str(exception))
+            self._log.error(message)
+            raise DirtyPageTrackerError(message) from exception
+
+    def __read_pagemap_entries(self, pagemap_file, start, end):
+        first_page = start // PAGE_SIZE
+        last_page = (end + PAGE_SIZE - 1) // PAGE_SIZE
+        pagemap_file.seek(first_page * PAGEMAP_ENTRY_SIZE)
+        entries = array.array("Q")
+        entries.frombytes(pagemap_file.read(
+            (last_page - first_page) * PAGEMAP_ENTRY_SIZE))
+        return entries
+
+    @staticmethod
+    def __can_clear_soft_dirty(target_pid):
+        with open(get_process_clear_refs_path(target_pid), "w") as clear_refs_file:
+            clear_refs_file.write(CLEAR_SOFT_DIRTY)
+        with open(get_process_pagemap_path(target_pid), "rb") as pagemap_file:
+            return len(pagemap_file.read(PAGEMAP_ENTRY_SIZE)) == PAGEMAP_ENTRY_SIZE
+
+    @staticmethod
+    def __probe_soft_dirty_bit():
+        # Kernels without CONFIG_MEM_SOFT_DIRTY accept clear_refs but never
+        # set the bit, so check that a write to our own page is reported.
+        probe = mmap.mmap(-1, PAGE_SIZE)
+        try:
+            probe[0:1] = b"\x01"
+            probe_buffer = ctypes.c_char.from_buffer(probe)
+            page_address = ctypes.addressof(probe_buffer)
+            del probe_buffer
+            with open(get_process_clear_refs_path("self"), "w") as clear_refs_file:
+                clear_refs_file.write(CLEAR_SOFT_DIRTY)
+            probe[0:1] = b"\x02"
+            with open(get_process_pagemap_path("self"), "rb") as pagemap_file:
+                pagemap_file.seek(page_address // PAGE_SIZE * PAGEMAP_ENTRY_SIZE)
+                entry = int.from_bytes(
+                    pagemap_file.read(PAGEMAP_ENTRY_SIZE), "little")
+            return bool(entry & SOFT_DIRTY_BIT)
+        finally:
+            probe.close()
+
+
+class HashPageTracker(object):
+    def __init__(self):
+        self.page_hashes = {}
+
+    def get_dirty_ranges(self, start, end):
+        return [(start, end)]
+
+    def update_pages(self, address, memory_bytes):
+        memory_view = memoryview(memory_bytes)
+        changed_pages = []
+        for offset in range(0, len(memory_view), PAGE_SIZE):
+            page_address = address + offset
+            page_hash = hashlib.blake2b(
+                memory_view[offset:offset + PAGE_SIZE],
+                digest_size=PAGE_HASH_SIZE).digest()
+            if self.page_hashes.get(page_address) != page_hash:
+                self.page_hashes[page_address] = page_hash
+                changed_pages.append(page_address)
+
+        end = address + len(memory_view)
+        return [(start, min(page_end, end))
+                for start, page_end in merge_page_ranges(changed_pages)]
+
+    def forget_range(self, start, end):
+        for page_address in range(start, end, PAGE_SIZE):
+            self.page_hashes.pop(page_address, None)
+
+    def reset(self):
+        pass
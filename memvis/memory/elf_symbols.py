@@ -0,0 +1,203 @@
+import mmap
+import struct
+import logging
+import threading
+from array import array
+from bisect import bisect_right
+
+
+ELF_MAGIC = b"\x7fELF"
+ELF_CLASS_32 = 1
+ELF_CLASS_64 = 2
+ELF_DATA_LITTLE = 1
+ELF_DATA_BIG = 2
+PT_LOAD = 1
+SHT_SYMTAB = 2
+SHT_DYNSYM = 11
+SHN_UNDEF = 0
+STT_OBJECT = 1
+STT_FUNC = 2
+# Field order differs between the classes, so every layout lists the
+# names of the fields it unpacks into.
+ELF_LAYOUTS = {
+    ELF_CLASS_64: {
+        "header": ("16sHHIQQQIHHHHHH", ("ident", "type", "machine", "version", "entry",
+                                      "phoff", "shoff", "flags", "ehsize", "phentsize",
+                                      "phnum", "shentsize", "shnum", "shstrndx")),
+        "segment": ("IIQQQQQQ", ("type", "flags", "offset", "vaddr", "paddr", "filesz",
+                                 "memsz", "align")),
+        "section": ("IIQQQQIIQQ", ("name", "type", "flags", "addr", "offset", "size",
+                                   "link", "info", "addralign", "entsize")),
+        "symbol": ("IBBHQQ", ("name", "info", "other", "shndx", "value", "size")),
+    },
+    ELF_CLASS_32: {
+        "header": ("16sHHIIIIIHHHHHH", ("ident", "type", "machine", "version", "entry",
+                                      "phoff", "shoff", "flags", "ehsize", "phentsize",
+                                      "phnum", "shentsize", "shnum", "shstrndx")),
+        "segment": ("IIIIIIII", ("type", "offset", "vaddr", "paddr", "filesz", "memsz",
+                                 "flags", "align")),
+        "section": ("IIIIIIIIII", ("name", "type", "flags", "addr", "offset", "size",
+                                   "link", "info", "addralign", "entsize")),
+        "symbol": ("IIIBBH", ("name", "value", "size", "info", "other", "shndx")),
+    },
+}
+
+
+def get_symbol_type(info):
+    return info & 0xf
+
+
+def format_symbol(name, offset):
+    if offset == 0:
+        return name
+    return "{}+{:#x}".format(name, offset)
+
+
+class ElfSymbolError(Exception):
+    pass
+
+
+class ElfFile(object):
+    def __init__(self, elf_bytes):
+        if elf_bytes[:4] != ELF_MAGIC:
+            raise ElfSymbolError("Not an ELF file.")
+        elf_class = elf_bytes[4]
+        if elf_class not in ELF_LAYOUTS or elf_bytes[5] not in (ELF_DATA_LITTLE, ELF_DATA_BIG):
+            raise ElfSymbolError("Unsupported ELF class : {} or data encoding : {}."
+                                 .format(elf_class, elf_bytes[5]))
+        self.elf_bytes = elf_bytes
+        self.byte_order = "<" if elf_bytes[5] == ELF_DATA_LITTLE else ">"
+        self.layouts = ELF_LAYOUTS[elf_class]
+        self.header = self.__unpack("header", 0)
+
+    def get_load_segments(self):
+        segments = [self.__unpack("segment", self.header["phoff"] + index *
+                                  self.header["phentsize"])
+                    for index in range(self.header["phnum"])]
+        return [(segment["offset"], segment["vaddr"], segment["filesz"])
+                for segment in segments if segment["type"] == PT_LOAD]
+
+    def get_sections(self):
+        return [self.__unpack("section", self.header["shoff"] + index * self.header["shentsize"])
+                for index in range(self.header["shnum"])]
+
+    def get_symbols(self):
+        # Functions and objects of the static and dynamic symbol tables,
+        # unpacked in one pass per table.
+        sections = self.get_sections()
+        symbol_format, field_names = self.layouts["symbol"]
+        symbol_format = self.byte_order + symbol_format
+        name_index, info_index, section_index, value_index, size_index = (
+            field_names.index(field_name)
+            for field_name in ("name", "info", "shndx", "value", "size"))
+        symbols = []
+        for section in sections:
+            if section["type"] not in (SHT_SYMTAB, SHT_DYNSYM) or section["link"] >= len(sections):
+                continue
+            string_section = sections[section["link"]]
+            strings = self.elf_bytes[string_section["offset"]:
+                                     string_section["offset"] + string_section["size"]]
+            table_size = section["size"] - section["size"] % struct.calcsize(symbol_format)
+            table = self.elf_bytes[section["offset"]:section["offset"] + table_size]
+            for symbol in struct.iter_unpack(symbol_format, table):
+                if get_symbol_type(symbol[info_index]) not in (STT_FUNC, STT_OBJECT) or \
+                        symbol[section_index] == SHN_UNDEF or symbol[value_index] == 0:
+                    continue
+                name_start = symbol[name_index]
+                name_end = strings.find(b"\0", name_start)
+                name = strings[name_start:name_end if name_end >= 0 else len(strings)]
+                symbols.append((symbol[value_index], symbol[size_index],
+                                name.decode("utf-8", "replace")))
+        return symbols
+
+    def __unpack(self, layout_name, offset):
+        layout_format, field_names = self.layouts[layout_name]
+        layout_format = self.byte_order + layout_format
+        try:
+            values = struct.unpack_from(layout_format, self.elf_bytes, offset)
+        except struct.error as exception:
+            raise ElfSymbolError("Truncated ELF {} at : {}.".format(layout_name, offset)) \
+                from exception
+        return dict(zip(field_names, values))
+
+
+class ElfSymbolTable(object):
+    def __init__(self, symbols=(), load_segments=()):
+        values = {}
+        # Of aliases sharing an address a public name, one without a leading
+        # underscore, is kept.
+        for value, size, name in sorted(symbols, key=lambda symbol: (
+                symbol[0], symbol[2].startswith("_"), symbol[2])):
+            values.setdefault(value, (size, name))
+        self.values = array("Q", sorted(values))
+        self.sizes = array("Q", [values[value][0] for value in self.values])
+        self.names = [values[value][1] for value in self.values]
+        self.load_segments = list(load_segments)
+
+    def get_virtual_address(self, file_offset):
+        for segment_offset, virtual_address, file_size in self.load_segments:
+            if segment_offset <= file_offset < segment_offset + file_size:
+                return file_offset - segment_offset + virtual_address
+        return None
+
+    def find_symbol(self, virtual_address):
+        index = bisect_right(self.values, virtual_address) - 1
+        if index < 0:
+            return None
+        offset = virtual_address - self.values[index]
+        if offset < self.sizes[index] or offset == 0:
+            return self.names[index], offset
+        return None
+
+    def __len__(self):
+        return len(self.values)
+
+
+def read_elf_symbols(path):
+    try:
+        with open(path, "rb") as elf_file:
+            with mmap.mmap(elf_file.fileno(), 0, access=mmap.ACCESS_READ) as elf_bytes:
+                elf = ElfFile(elf_bytes)
+                return ElfSymbolTable(elf.get_symbols(), elf.get_load_segments())
+    except (IOError, OSError, ValueError) as exception:
+        raise ElfSymbolError("Failed to read ELF symbols of : {}. Cause : {}"
+                             .format(path, str(exception))) from exception
+
+
+class ElfSymbolCache(object):
+    def __init__(self):
+        self._log = logging.getLogger(self.__class__.__name__)
+        self.__lock = threading.Lock()
+        self.symbol_tables = {}
+
+    def get_symbol_table(self, metadata):
+        # Files are parsed once per device and inode, a file that can not be
+        # parsed is remembered as an empty table.
+        key = metadata.device, metadata.inode
+        with self.__lock:
+            symbol_table = self.symbol_tables.get(key)
+        if symbol_table is not None:
+            return symbol_table
+        try:
+            symbol_table = read_elf_symbols(metadata.path_name)
+        except ElfSymbolError as exception:
+            self._log.info(str(exception))
+            symbol_table = ElfSymbolTable()
+        with self.__lock:
+            return self.symbol_tables.setdefault(key, symbol_table)
+
+    def symbolize(self, metadata, address):
+        if metadata.inode == "0" or not metadata.path_name.startswith("/"):
+            return None
+        symbol_table = self.get_symbol_table(metadata)
+        virtual_address = symbol_table.get_virtual_address(
+            address - metadata.address_range.start + metadata.offset)
+        if virtual_address is None:
+            return None
+        symbol = symbol_table.find_symbol(virtual_address)
+        if symbol is None:
+            return None
+        return format_symbol(*symbol)
+
+    def __len__(self):
+        return len(self.symbol_tables)
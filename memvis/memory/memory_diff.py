@@ -0,0 +1,91 @@
+import re
+import mmap
+from .page_store import PagedMemory
+
+
+PAGE_SIZE = mmap.PAGESIZE
+DIFF_BLOCK_SIZE = 64 * PAGE_SIZE
+CHANGED_BYTES_REGEX = re.compile(b"[^\x00]+")
+
+
+def merge_changed_range(changed_ranges, start, end):
+    if changed_ranges and changed_ranges[-1][1] == start:
+        changed_ranges[-1] = (changed_ranges[-1][0], end)
+    else:
+        changed_ranges.append((start, end))
+
+
+def diff_memory_bytes(old_bytes, new_bytes, address=0, candidate_ranges=None):
+    if isinstance(old_bytes, PagedMemory) or isinstance(new_bytes, PagedMemory):
+        return diff_paged_memory(old_bytes, new_bytes, address, candidate_ranges)
+    size = min(len(old_bytes), len(new_bytes))
+    if candidate_ranges is None:
+        candidate_ranges = [(address, address + size)]
+
+    old_view = memoryview(old_bytes)
+    new_view = memoryview(new_bytes)
+    changed_ranges = []
+    for range_start, range_end in candidate_ranges:
+        start = max(range_start - address, 0)
+        end = min(range_end - address, size)
+        for block_start in range(start, end, DIFF_BLOCK_SIZE):
+            block_end = min(block_start + DIFF_BLOCK_SIZE, end)
+            if not are_equal(new_bytes, new_view, old_view, block_start, block_end):
+                diff_block(old_view, new_view, new_bytes, address,
+                           block_start, block_end, changed_ranges)
+    return changed_ranges
+
+
+def diff_paged_memory(old_bytes, new_bytes, address=0, candidate_ranges=None):
+    changed_pages = None
+    if isinstance(new_bytes, PagedMemory):
+        changed_pages = new_bytes.get_changed_pages(old_bytes)
+    if changed_pages is None:
+        # Paged memory from different stores can only be compared byte by byte.
+        return diff_memory_bytes(to_bytes(old_bytes), to_bytes(new_bytes), address,
+                                 candidate_ranges)
+    changed_ranges = []
+    for index in changed_pages:
+        page_address = address + index * PAGE_SIZE
+        for changed_start, changed_end in diff_memory_bytes(
+                old_bytes.get_page(index), new_bytes.get_page(index), page_address):
+            merge_changed_range(changed_ranges, changed_start, changed_end)
+    return changed_ranges
+
+
+def to_bytes(memory_bytes):
+    if isinstance(memory_bytes, PagedMemory):
+        return memory_bytes.tobytes()
+    return memory_bytes
+
+
+def diff_block(old_view, new_view, new_bytes, address, block_start, block_end, changed_ranges):
+    for page_start in range(block_start, block_end, PAGE_SIZE):
+        page_end = min(page_start + PAGE_SIZE, block_end)
+        if are_equal(new_bytes, new_view, old_view, page_start, page_end):
+            continue
+        # The XOR of both pages is zero exactly where the bytes are equal, so
+        # the changed bytes are the runs of non-zero bytes in it.
+        difference = int.from_bytes(old_view[page_start:page_end], "little") ^ \
+            int.from_bytes(new_view[page_start:page_end], "little")
+        difference_bytes = difference.to_bytes(page_end - page_start, "little")
+        for match in CHANGED_BYTES_REGEX.finditer(difference_bytes):
+            merge_changed_range(changed_ranges, address + page_start + match.start(),
+                                address + page_start + match.end())
+
+
+def are_equal(new_bytes, new_view, old_view, start, end):
+    if isinstance(new_bytes, (bytes, bytearray)):
+        return new_bytes.startswith(old_view[start:end], start)
+    return new_view[start:end].tobytes() == old_view[start:end].tobytes()
+
+
+def diff_memory_map(previous_map, memory_map):
+    if previous_map is None or previous_map.is_unreadable() or memory_map.is_unreadable() or \
+            previous_map.address != memory_map.address or \
+            len(previous_map.memory_bytes) != len(memory_map.memory_bytes):
+        return memory_map.changed_ranges
+    if previous_map.memory_bytes is memory_map.memory_bytes:
+        return []
+    return diff_memory_bytes(previous_map.memory_bytes, memory_map.memory_bytes,
+                             memory_map.address, memory_map.changed_ranges)
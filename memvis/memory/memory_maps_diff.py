@@ -0,0 +1,31 @@
+class MemoryMapsDiff(object):
+    def __init__(self, added, removed, changed, unchanged):
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+        self.unchanged = unchanged
+
+    def has_changes(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def __str__(self):
+        return "added : {}, removed : {}, changed : {}, unchanged : {}".format(
+            len(self.added), len(self.removed), len(self.changed), len(self.unchanged))
+
+
+def diff_memory_maps(old_maps_metadata, new_maps_metadata):
+    old_by_start = {metadata.address_range.start: metadata
+                    for metadata in old_maps_metadata}
+    added = []
+    changed = []
+    unchanged = []
+    for metadata in new_maps_metadata:
+        old_metadata = old_by_start.pop(metadata.address_range.start, None)
+        if old_metadata is None:
+            added.append(metadata)
+        elif old_metadata == metadata:
+            unchanged.append(metadata)
+        else:
+            changed.append((old_metadata, metadata))
+
+    return MemoryMapsDiff(added, list(old_by_start.values()), changed, unchanged)
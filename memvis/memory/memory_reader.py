@@ -1,39 +1,88 @@
+import sys
+import copy
+import mmap
 import logging
-import re as regex
-from ptrace import debugger
 from .stack_pointer_reader import StackPointerReaderError
 from .stack_pointer_reader import PtraceStackPointerReader
 from .stack_pointer_reader import SyscallFileStackPointerReader
-
-
-MEMORY_MAP_LINE_REGEX = debugger.memory_mapping.PROC_MAP_REGEX
+from .dirty_page_tracker import DirtyPageTrackerError
+from .dirty_page_tracker import create_page_tracker
+from .read_backend import MEM_FILE_BACKEND
+from .read_backend import DEFAULT_READ_WORKERS
+from .read_backend import create_read_backend
+from .read_backend import get_process_mem_path
+from .address_range import AddressRange
+from .address_range import format_address
+from .memory_maps_diff import diff_memory_maps
+from .memory_diff import diff_memory_map
+from .shared_mappings import read_anonymous_sizes
+from .page_store import PagedMemory
+from .timing_spans import TIMING_SPANS
+from .timing_spans import MAPS_SPAN
+from .timing_spans import READ_SPAN
+
+
+MEMORY_MAP_FIELD_COUNT = 6
+PAGE_SIZE = mmap.PAGESIZE
+DEFAULT_PREFETCH_SIZE = 16 * PAGE_SIZE
+UNREADABLE_MEMORY = memoryview(b"")
 
 
 def get_process_maps_path(process_id):
     return "/proc/" + str(process_id) + "/maps"
 
 
-def get_process_mem_path(process_id):
-    return "/proc/" + str(process_id) + "/mem"
-
-
 def convert_hex_to_int(hex_string):
     if not hex_string.startswith("0x"):
         hex_string = "0x" + hex_string
     return int(hex_string, 16)
 
 
+def is_immutable_mapping(metadata):
+    # Private read-only file mappings (library text and constants) only
+    # change together with their metadata, so their bytes can be reused.
+    return metadata.is_private() and not metadata.is_writable() and metadata.inode != "0"
+
+
+def parse_memory_maps(memory_map_lines):
+    return [AddressSpaceMetadata(line) for line in memory_map_lines]
+
+
+def align_to_page_start(address):
+    return address - address % PAGE_SIZE
+
+
+def align_to_page_end(address):
+    return align_to_page_start(address + PAGE_SIZE - 1)
+
+
+def get_window_bounds(start_address, end_address, prefetch_size=0):
+    start = start_address - prefetch_size
+    end = end_address + prefetch_size
+    return align_to_page_start(max(start, 0)), align_to_page_end(end)
+
+
 class AddressSpaceMetadata(object):
+    __slots__ = ("address_range", "memory_size", "permissions", "offset",
+                 "device", "inode", "path_name")
+
     def __init__(self, memory_map_line):
-        self.log = logging.getLogger(self.__class__.__name__)
-        line_groups = self.__match_line(memory_map_line)
-        self.address_range = line_groups.group(1), line_groups.group(2)
+        fields = memory_map_line.split(None, MEMORY_MAP_FIELD_COUNT - 1)
+        try:
+            start, _, end = fields[0].partition("-")
+            self.address_range = AddressRange(int(start, 16), int(end, 16))
+            self.permissions = sys.intern(fields[1])
+            self.offset = int(fields[2], 16)
+            self.device = sys.intern(fields[3])
+            self.inode = sys.intern(fields[4])
+        except (IndexError, ValueError) as exception:
+            raise ValueError(self.__get_error_message(memory_map_line)) from exception
+        if len(self.permissions) != 4 or ":" not in self.device or not self.inode.isdigit():
+            raise ValueError(self.__get_error_message(memory_map_line))
         self.update_memory_size()
-        self.permissions = line_groups.group(3)
-        self.offset = convert_hex_to_int(line_groups.group(4))
-        self.device = line_groups.group(5) + ":" + line_groups.group(6)
-        self.inode = line_groups.group(7)
-        self.path_name = line_groups.group(8)
+        self.path_name = ""
+        if len(fields) == MEMORY_MAP_FIELD_COUNT:
+            self.path_name = sys.intern(fields[-1].rstrip("\n"))
 
     def is_readable(self):
         return "r" in self.permissions
@@ -51,26 +100,21 @@ class AddressSpaceMetadata(object):
         return "p" in self.permissions
 
     def get_address_range_ints(self):
-        start, end = self.address_range
-        return convert_hex_to_int(start), convert_hex_to_int(end)
-
-    def __match_line(self, memory_map_line):
-        matcher = regex.compile(MEMORY_MAP_LINE_REGEX)
-        matches = matcher.match(memory_map_line)
-        if matches is None:
-            message = "Failed to match memory map line : {} with pattern : {}."\
-                .format(memory_map_line, MEMORY_MAP_LINE_REGEX)
-            self.log.error(message)
-            raise ValueError(message)
-        return matches
+        return self.address_range.start, self.address_range.end
+
+    def to_maps_line(self):
+        return "{:x}-{:x} {} {:08x} {} {} {}".format(
+            self.address_range.start, self.address_range.end, self.permissions,
+            self.offset, self.device, self.inode, self.path_name).rstrip()
+
+    def __get_error_message(self, memory_map_line):
+        return "Failed to parse memory map line : {}.".format(memory_map_line)
 
     def update_memory_size(self):
-        start_address = convert_hex_to_int(self.address_range[0])
-        end_address = convert_hex_to_int(self.address_range[1])
-        self.memory_size = end_address - start_address
+        self.memory_size = self.address_range.get_size()
 
     def __str__(self):
-        return "({}, {}, {}, {}, {}, {}, {})".format(self.address_range[0], self.address_range[1],
+        return "({:x}, {:x}, {}, {}, {}, {}, {})".format(self.address_range.start, self.address_range.end,
                                                      self.permissions, self.offset, self.device, self.inode, self.path_name)
 
     def __eq__(self, other):
@@ -89,42 +133,336 @@ class AddressSpaceMetadata(object):
 
 class MemoryMap(object):
 
-    def __init__(self, pid, metadata, memory_bytes):
+    def __init__(self, pid, metadata, memory_bytes, address=None, changed_ranges=None):
         self.pid = pid
         self.metadata = metadata
         self.memory_bytes = memory_bytes
+        self.address = address
+        self.changed_ranges = changed_ranges
+        if address is None:
+            self.address = metadata.address_range.start
+
+    def is_unreadable(self):
+        return self.memory_bytes is UNREADABLE_MEMORY
+
+    def is_paged(self):
+        return isinstance(self.memory_bytes, PagedMemory)
+
+    def store_pages(self, page_store):
+        if self.is_unreadable() or self.is_paged():
+            return self
+        return MemoryMap(self.pid, self.metadata, page_store.add_memory(self.memory_bytes),
+                         self.address, self.changed_ranges)
+
+    def get_range(self, start, end):
+        loaded_end = self.address + len(self.memory_bytes)
+        if self.address <= start and end <= loaded_end:
+            if self.is_paged():
+                return self.memory_bytes[start - self.address:end - self.address]
+            return memoryview(self.memory_bytes)[start - self.address:end - self.address]
+        memory_slice = bytearray(end - start)
+        self.copy_range(memory_slice, 0, start, end)
+        return memory_slice
+
+    def copy_range(self, buffer, buffer_offset, start, end):
+        loaded_start = max(start, self.address)
+        loaded_end = min(end, self.address + len(self.memory_bytes))
+        if loaded_start >= loaded_end:
+            return
+        destination = buffer_offset + loaded_start - start
+        if self.is_paged():
+            self.memory_bytes.copy_range(buffer, destination, loaded_start - self.address,
+                                         loaded_end - self.address)
+            return
+        buffer[destination:destination + loaded_end - loaded_start] = \
+            memoryview(self.memory_bytes)[loaded_start -
+                                          self.address:loaded_end - self.address]
 
 
 class MemoryReaderError(Exception):
     pass
 
 
+class MemoryReadPass(object):
+    def __init__(self, target_pid, read_backend, page_tracker, regions,
+                 previous_memory_maps=None, stale_regions=None, shared_mappings=None,
+                 shareable_regions=()):
+        self._log = logging.getLogger(self.__class__.__name__)
+        self.target_pid = target_pid
+        self.read_backend = read_backend
+        self.page_tracker = page_tracker
+        self.regions = regions
+        self.stale_regions = stale_regions if stale_regions is not None else set()
+        self.previous_maps = {}
+        if previous_memory_maps is not None:
+            self.previous_maps = {memory_map.address: memory_map
+                                  for memory_map in previous_memory_maps}
+        self.shared_mappings = shared_mappings
+        self.shareable_regions = shareable_regions
+
+        self.dirty_ranges = [self.__get_dirty_ranges(metadata, self.previous_maps.get(start), start, end)
+                             for metadata, start, end in regions]
+        self.__reset_page_tracker()
+        self.memory_maps = [None] * len(regions)
+        self.pending = list(range(len(regions)))
+
+    def is_done(self):
+        return not self.pending
+
+    def read_all(self):
+        return self.__read_indices(self.pending)
+
+    def read_next(self, batch_size):
+        indices = []
+        read_size = 0
+        for index in self.pending:
+            if indices and read_size >= batch_size:
+                break
+            indices.append(index)
+            read_size += self.__get_read_size(index)
+        return self.__read_indices(indices)
+
+    def read_overlapping(self, start, end):
+        return self.__read_indices([index for index in self.pending
+                                    if self.regions[index][1] < end and
+                                    start < self.regions[index][2]])
+
+    def cancel(self):
+        for index in self.pending:
+            if self.page_tracker is not None and self.dirty_ranges[index]:
+                self.stale_regions.add(self.regions[index][1])
+        self.pending = []
+
+    def get_memory_maps(self):
+        return [memory_map if memory_map is not None else self.__get_unread_memory_map(index)
+                for index, memory_map in enumerate(self.memory_maps)]
+
+    def __read_indices(self, indices):
+        indices = list(indices)
+        if self.shared_mappings is not None:
+            self.__load_shared_mappings(indices)
+        read_ranges = []
+        for index in indices:
+            for range_start, range_end in self.__get_ranges_to_read(index):
+                read_ranges.append((range_start, range_end - range_start))
+        started_at = TIMING_SPANS.start()
+        read_results = self.read_backend.read_ranges(read_ranges)
+        if started_at is not None:
+            TIMING_SPANS.stop(READ_SPAN, started_at,
+                              sum(len(result.memory_bytes) for result in read_results))
+        read_results = iter(read_results)
+
+        for index in indices:
+            metadata, start, end = self.regions[index]
+            dirty = self.dirty_ranges[index]
+            if start >= end:
+                memory_map = MemoryMap(self.target_pid, metadata, b"")
+            elif dirty is None:
+                memory_map = self.__create_memory_map(
+                    metadata, start, next(read_results))
+            else:
+                results = [next(read_results) for _ in dirty]
+                memory_map = self.__refresh_memory_map(
+                    metadata, self.previous_maps[start], results)
+            memory_map.changed_ranges = diff_memory_map(
+                self.previous_maps.get(start), memory_map)
+            self.memory_maps[index] = memory_map
+            self.__store_shared_mapping(memory_map, start, end)
+
+        read_indices = set(indices)
+        self.pending = [index for index in self.pending if index not in read_indices]
+        return not self.is_done()
+
+    def __load_shared_mappings(self, indices):
+        # Shared mappings are looked up when a region is about to be read, so
+        # that regions read by other targets in the meantime are reused.
+        for index in indices:
+            metadata, start, end = self.regions[index]
+            if self.dirty_ranges[index] is not None or start >= end or \
+                    metadata.address_range.start not in self.shareable_regions:
+                continue
+            memory_bytes = self.shared_mappings.get(metadata)
+            if memory_bytes is not None:
+                offset = start - metadata.address_range.start
+                self.previous_maps[start] = MemoryMap(
+                    self.target_pid, metadata,
+                    memoryview(memory_bytes)[offset:offset + end - start], start, [])
+                self.dirty_ranges[index] = []
+
+    def __store_shared_mapping(self, memory_map, start, end):
+        metadata = memory_map.metadata
+        if self.shared_mappings is None or start not in self.shareable_regions or \
+                memory_map.is_unreadable() or \
+                (start, end) != metadata.get_address_range_ints():
+            return
+        memory_bytes = self.shared_mappings.put(metadata, memory_map.memory_bytes)
+        if memory_bytes is not memory_map.memory_bytes and memory_bytes == memory_map.memory_bytes:
+            memory_map.memory_bytes = memory_bytes
+
+    def __get_ranges_to_read(self, index):
+        _, start, end = self.regions[index]
+        if start >= end:
+            return []
+        dirty = self.dirty_ranges[index]
+        return [(start, end)] if dirty is None else dirty
+
+    def __get_read_size(self, index):
+        return sum(range_end - range_start
+                   for range_start, range_end in self.__get_ranges_to_read(index))
+
+    def __get_unread_memory_map(self, index):
+        metadata, start, _ = self.regions[index]
+        if self.dirty_ranges[index] is None:
+            return MemoryMap(self.target_pid, metadata, b"", start)
+        previous_map = self.previous_maps[start]
+        return MemoryMap(self.target_pid, metadata, previous_map.memory_bytes, previous_map.address, [])
+
+    def __get_dirty_ranges(self, metadata, previous_map, start, end):
+        if previous_map is None or previous_map.is_unreadable() or \
+                len(previous_map.memory_bytes) != end - start or \
+                previous_map.metadata != metadata:
+            return None
+        if start in self.stale_regions:
+            self.stale_regions.discard(start)
+            return None
+        if is_immutable_mapping(metadata):
+            return []
+        if self.page_tracker is None:
+            return None
+        try:
+            return self.page_tracker.get_dirty_ranges(start, end)
+        except DirtyPageTrackerError:
+            return None
+
+    def __reset_page_tracker(self):
+        if self.page_tracker is None:
+            return
+        try:
+            self.page_tracker.reset()
+        except DirtyPageTrackerError:
+            pass
+
+    def __create_memory_map(self, metadata, start, read_result):
+        if not read_result.is_successful():
+            self.__log_memory_read_error(read_result.error, metadata)
+            return MemoryMap(self.target_pid, metadata, UNREADABLE_MEMORY, start)
+        changed_ranges = self.__update_pages(start, read_result.memory_bytes)
+        return MemoryMap(self.target_pid, metadata, read_result.memory_bytes, start, changed_ranges)
+
+    def __refresh_memory_map(self, metadata, previous_map, read_results):
+        if not read_results:
+            return MemoryMap(self.target_pid, metadata, previous_map.memory_bytes, previous_map.address, [])
+        memory_bytes = bytearray(previous_map.memory_bytes)
+        changed_ranges = []
+        for read_result in read_results:
+            if not read_result.is_successful():
+                self.__log_memory_read_error(read_result.error, metadata)
+                return MemoryMap(self.target_pid, metadata, UNREADABLE_MEMORY, previous_map.address)
+            start = read_result.address
+            page_bytes = memoryview(read_result.memory_bytes)
+            for changed_start, changed_end in self.page_tracker.update_pages(start, page_bytes):
+                offset = changed_start - previous_map.address
+                memory_bytes[offset:offset + changed_end - changed_start] = \
+                    page_bytes[changed_start - start:changed_end - start]
+                changed_ranges.append((changed_start, changed_end))
+        return MemoryMap(self.target_pid, metadata, memory_bytes, previous_map.address, changed_ranges)
+
+    def __update_pages(self, start, raw_data):
+        if self.page_tracker is None:
+            return None
+        return self.page_tracker.update_pages(start, raw_data)
+
+    def __log_memory_read_error(self, error, metadata):
+        message = 'Failed to read memory mapping : {} from mems file at : {}. Cause : {}'\
+            .format(metadata, get_process_mem_path(self.target_pid), str(error))
+        self._log.info(message)
+
+
 class MemoryReader(object):
-    def __init__(self, target_pid, use_ptrace=True):
+    def __init__(self, target_pid, use_ptrace=True, stack_pointer_reader=None, incremental=False,
+                 read_backend=MEM_FILE_BACKEND, read_workers=DEFAULT_READ_WORKERS,
+                 shared_mappings=None):
         self._log = logging.getLogger(self.__class__.__name__)
         self.target_pid = target_pid
+        self.maps_metadata = []
+        self.page_tracker = None
+        self.stale_regions = set()
+        self.shared_mappings = shared_mappings
+        self.shareable_regions = frozenset()
         self.refresh_memory_map_metadata()
-        if use_ptrace:
+        self.read_backend = read_backend
+        if isinstance(read_backend, str):
+            self.read_backend = create_read_backend(read_backend, target_pid, read_workers)
+        if incremental:
+            self.page_tracker = create_page_tracker(target_pid)
+        if stack_pointer_reader is not None:
+            self.stack_pointer_reader = stack_pointer_reader
+        elif use_ptrace:
             self.stack_pointer_reader = PtraceStackPointerReader()
         else:
             self.stack_pointer_reader = SyscallFileStackPointerReader()
 
-    def read_memory(self):
-        memory_maps = []
+    def read_memory(self, previous_memory_maps=None):
+        read_pass = self.create_read_pass(previous_memory_maps)
+        read_pass.read_all()
+        return read_pass.get_memory_maps()
+
+    def read_memory_window(self, start_address, end_address, prefetch_size=0,
+                           previous_memory_maps=None):
+        read_pass = self.create_window_read_pass(
+            start_address, end_address, prefetch_size, previous_memory_maps)
+        read_pass.read_all()
+        return read_pass.get_memory_maps()
+
+    def read_memory_regions(self, maps_metadata):
+        regions = [(metadata, metadata.address_range.start, metadata.address_range.end)
+                   for metadata in maps_metadata]
+        read_pass = self.__create_read_pass(regions, None)
+        read_pass.read_all()
+        return read_pass.get_memory_maps()
+
+    def create_read_pass(self, previous_memory_maps=None):
+        regions = []
 
         for metadata in self.maps_metadata:
             if metadata.is_readable():
                 if(metadata.path_name == "[stack]"):
-                    _, memory_map = self.__read_stack_address_range(metadata)
-                else:
-                    raw_data = self.__read_memory_snapshot(metadata)
-                    memory_map = MemoryMap(self.target_pid, metadata, raw_data)
-                memory_maps.append(memory_map)
+                    _, metadata = self.__get_current_stack_metadata(metadata)
+                address_range = metadata.address_range
+                regions.append(
+                    (metadata, address_range.start, address_range.end))
+
+        return self.__create_read_pass(regions, previous_memory_maps)
+
+    def create_window_read_pass(self, start_address, end_address, prefetch_size=0,
+                                previous_memory_maps=None):
+        window_start, window_end = get_window_bounds(
+            start_address, end_address, prefetch_size)
+        regions = []
 
-        return memory_maps
+        for metadata in self.maps_metadata:
+            if metadata.is_readable():
+                address_range = metadata.address_range
+                regions.append((metadata, max(address_range.start, window_start),
+                                min(address_range.end, window_end)))
+
+        return self.__create_read_pass(regions, previous_memory_maps)
 
     def refresh_memory_map_metadata(self):
-        self.maps_metadata = self.__read_memory_mappings()
+        maps_metadata = self.__read_memory_mappings()
+        maps_diff = diff_memory_maps(self.maps_metadata, maps_metadata)
+        self.maps_metadata = maps_metadata
+        for metadata in maps_diff.removed:
+            self.stale_regions.discard(metadata.address_range.start)
+            if self.page_tracker is not None:
+                self.page_tracker.forget_range(metadata.address_range.start,
+                                               metadata.address_range.end)
+        if self.shared_mappings is not None and maps_diff.has_changes():
+            self.shareable_regions = self.__get_shareable_regions()
+        return maps_diff
+
+    def close(self):
+        self.read_backend.close()
 
     def get_stack_pointer(self):
         return self.__get_stack_pointer()
@@ -134,17 +472,20 @@ class MemoryReader(object):
         return self.__read_stack_address_range(metadata)
 
     def __read_stack_address_range(self, metadata):
-        stack_pointer = self.__get_stack_pointer()
-        _, end_address = metadata.address_range
-        metadata.address_range = stack_pointer, end_address
-        metadata.update_memory_size()
-
-        memory_length = convert_hex_to_int(end_address) -\
-            convert_hex_to_int(stack_pointer)
-        stack_data = self.__read_stack_data(stack_pointer, memory_length)
+        stack_pointer, metadata = self.__get_current_stack_metadata(metadata)
+        stack_data = self.__read_stack_data(
+            stack_pointer, metadata.memory_size)
 
         return stack_pointer, MemoryMap(self.target_pid, metadata, stack_data)
 
+    def __get_current_stack_metadata(self, metadata):
+        stack_pointer = self.__get_stack_pointer()
+        metadata = copy.copy(metadata)
+        metadata.address_range = AddressRange(
+            stack_pointer, metadata.address_range.end)
+        metadata.update_memory_size()
+        return stack_pointer, metadata
+
     def __get_stack_pointer(self):
         try:
             return self.stack_pointer_reader.read_stack_pointer(
@@ -152,17 +493,17 @@ class MemoryReader(object):
         except StackPointerReaderError as exception:
             message = 'Failed to read stack pointer for process: {}'\
                 .format(self.target_pid)
-            self._log.error(message, exception)
+            self._log.error(message)
             raise MemoryReaderError(message) from exception
 
     def __read_stack_data(self, stack_pointer, memory_size):
         try:
-            return self.__read_mems_file(stack_pointer, memory_size)
-        except IOError as exception:
-            message = 'Failed to read stack with size : {} from mem file at : {}.' + \
-                ' Stack pointer position : {}' \
-                .format(get_process_mem_path(self.target_pid))
-            self._log.error(message, exception)
+            return self.read_backend.read(stack_pointer, memory_size)
+        except (IOError, OSError, ValueError) as exception:
+            message = ('Failed to read stack with size : {} from mem file at : {}.' +
+                       ' Stack pointer position : {}') \
+                .format(memory_size, get_process_mem_path(self.target_pid), format_address(stack_pointer))
+            self._log.error(message)
             raise MemoryReaderError(message) from exception
 
     def __get_stack_metadata(self):
@@ -172,44 +513,35 @@ class MemoryReader(object):
 
         raise MemoryError("No stack memory map found.")
 
-    def __read_memory_snapshot(self, metadata):
+    def __create_read_pass(self, regions, previous_memory_maps):
+        return MemoryReadPass(self.target_pid, self.read_backend, self.page_tracker,
+                              regions, previous_memory_maps, self.stale_regions,
+                              self.shared_mappings, self.shareable_regions)
+
+    def __get_shareable_regions(self):
+        # Only read-only file mappings without private (anonymous) pages hold
+        # the same bytes in every process that maps the file. Relocated
+        # RELRO segments are read-only too, but their pages are anonymous.
         try:
-            start_address, _ = metadata.address_range
-            return self.__read_mems_file(start_address, metadata.memory_size)
-        except IOError as error:
-            return self.__handle_memory_read_error(error, metadata)
-        except OSError as error:
-            return self.__handle_memory_read_error(error, metadata)
-        except ValueError as error:
-            return self.__handle_memory_read_error(error, metadata)
-
-    def __handle_memory_read_error(self, error, metadata):
-        message = 'Failed to read memory mapping : {} from mems file at : {}'\
-            .format(metadata, get_process_mem_path(self.target_pid))
-        self._log.info(message, error)
-        return [0] * metadata.memory_size
-
-    def __read_mems_file(self, start_address, memory_size):
-        mems_path = get_process_mem_path(self.target_pid)
-        with open(mems_path, "rb") as mems_file:
-            offset = convert_hex_to_int(start_address)
-            mems_file.seek(offset)
-            return list(mems_file.read(memory_size))
+            anonymous_sizes = read_anonymous_sizes(self.target_pid)
+        except (IOError, OSError, ValueError) as exception:
+            self._log.info("Not sharing mappings of process : {}. Cause : {}"
+                           .format(self.target_pid, str(exception)))
+            return frozenset()
+        return frozenset(metadata.address_range.start for metadata in self.maps_metadata
+                         if is_immutable_mapping(metadata) and
+                         anonymous_sizes.get(metadata.address_range.start) == 0)
 
     def __read_memory_mappings(self):
+        started_at = TIMING_SPANS.start()
         memory_space_lines = self.__read_process_maps_file()
-        map_metadata = []
-
-        for line in memory_space_lines:
-            map_metadata.append(self.__convert_to_metadata(line))
-
-        return map_metadata
-
-    def __convert_to_metadata(self, line):
         try:
-            return AddressSpaceMetadata(line)
+            maps_metadata = parse_memory_maps(memory_space_lines)
+            TIMING_SPANS.stop(MAPS_SPAN, started_at)
+            return maps_metadata
         except ValueError as exception:
-            message = "Failed to create AddressSpaceMetadata"
+            message = "Failed to create AddressSpaceMetadata. Cause : {}"\
+                .format(str(exception))
             self._log.error(message)
             raise MemoryReaderError(message) from exception
 
@@ -220,7 +552,7 @@ class MemoryReader(object):
         except IOError as exception:
             message = "Failed to read maps file at : {}. Cause : {}"\
                 .format(maps_path, str(exception))
-            self._log.error(message, exception)
+            self._log.error(message)
             raise MemoryReaderError(message) from exception
 
     def __read_maps_file(self, maps_path):
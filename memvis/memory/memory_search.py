@@ -0,0 +1,142 @@
+import os
+import re
+import struct
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .memory_reader import convert_hex_to_int
+from .read_backend import DEFAULT_READ_WORKERS
+from .read_backend import get_process_mem_path
+
+
+SEARCH_CHUNK_SIZE = 4 * 2 ** 20
+DEFAULT_MAX_MATCHES = 10000
+HEX_QUERY_PREFIX = "x:"
+POINTER_QUERY_PREFIX = "p:"
+STRING_QUERY_PREFIX = "s:"
+
+
+def parse_search_query(query):
+    if query.startswith(HEX_QUERY_PREFIX):
+        return [bytes.fromhex(query[len(HEX_QUERY_PREFIX):])]
+    if query.startswith(POINTER_QUERY_PREFIX):
+        pointer = convert_hex_to_int(query[len(POINTER_QUERY_PREFIX):].strip())
+        return [struct.pack("<Q", pointer)]
+    if query.startswith(STRING_QUERY_PREFIX):
+        query = query[len(STRING_QUERY_PREFIX):]
+    if query == "":
+        raise ValueError("Empty search query.")
+    return [query.encode("utf-8"), query.encode("utf-16-le")]
+
+
+def compile_patterns(patterns):
+    patterns = sorted(set(pattern for pattern in patterns if pattern), key=len, reverse=True)
+    if not patterns:
+        raise ValueError("No search patterns given.")
+    # The alternation of escaped literals is matched by the re engine in a
+    # single pass, which serves as the multi-pattern automaton.
+    return re.compile(b"|".join(re.escape(pattern) for pattern in patterns)), len(patterns[0])
+
+
+def get_search_chunks(regions, chunk_size, overlap):
+    chunks = []
+    for start, end in regions:
+        for chunk_start in range(start, end, chunk_size):
+            accept_end = min(chunk_start + chunk_size, end)
+            chunks.append((chunk_start, min(accept_end + overlap, end), accept_end))
+    return chunks
+
+
+class SearchMatch(object):
+    __slots__ = ("address", "size")
+
+    def __init__(self, address, size):
+        self.address = address
+        self.size = size
+
+    def __eq__(self, other):
+        if not isinstance(other, SearchMatch):
+            return NotImplemented
+        return self.address == other.address and self.size == other.size
+
+    def __repr__(self):
+        return "SearchMatch({}, {})".format(hex(self.address), self.size)
+
+
+class MemorySearch(object):
+    def __init__(self, workers=DEFAULT_READ_WORKERS, chunk_size=SEARCH_CHUNK_SIZE,
+                 max_matches=DEFAULT_MAX_MATCHES):
+        self._log = logging.getLogger(self.__class__.__name__)
+        self.workers = max(1, workers)
+        self.chunk_size = chunk_size
+        self.max_matches = max_matches
+        self.__lock = threading.Lock()
+
+    def search_regions(self, regions, read_memory, patterns):
+        pattern_regex, pattern_size = compile_patterns(patterns)
+        chunks = get_search_chunks(regions, self.chunk_size, pattern_size - 1)
+        matches = []
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for chunk in chunks:
+                executor.submit(self.__search_chunk, chunk, read_memory,
+                                pattern_regex, matches)
+        matches.sort(key=lambda match: match.address)
+        return matches[:self.max_matches]
+
+    def __search_chunk(self, chunk, read_memory, pattern_regex, matches):
+        if len(matches) >= self.max_matches:
+            return
+        chunk_start, chunk_end, accept_end = chunk
+        try:
+            memory_bytes = read_memory(chunk_start, chunk_end - chunk_start)
+        except (IOError, OSError) as exception:
+            self._log.debug("Skipping unreadable memory at : {}. Cause : {}"
+                            .format(hex(chunk_start), str(exception)))
+            return
+        chunk_matches = []
+        for match in pattern_regex.finditer(memory_bytes):
+            address = chunk_start + match.start()
+            if address >= accept_end:
+                break
+            chunk_matches.append(SearchMatch(address, match.end() - match.start()))
+            if len(chunk_matches) >= self.max_matches:
+                break
+        with self.__lock:
+            matches.extend(chunk_matches)
+
+
+class ProcessMemorySearch(MemorySearch):
+    def __init__(self, target_pid, get_maps_metadata, workers=DEFAULT_READ_WORKERS,
+                 chunk_size=SEARCH_CHUNK_SIZE, max_matches=DEFAULT_MAX_MATCHES):
+        super(ProcessMemorySearch, self).__init__(workers, chunk_size, max_matches)
+        self.target_pid = target_pid
+        self.get_maps_metadata = get_maps_metadata
+
+    def search(self, patterns):
+        regions = [metadata.get_address_range_ints() for metadata in self.get_maps_metadata()
+                   if metadata.is_readable()]
+        mems_fd = os.open(get_process_mem_path(self.target_pid), os.O_RDONLY)
+        try:
+            return self.search_regions(
+                regions, lambda address, size: os.pread(mems_fd, size, address), patterns)
+        finally:
+            os.close(mems_fd)
+
+
+class SnapshotMemorySearch(MemorySearch):
+    def __init__(self, memory_maps, workers=DEFAULT_READ_WORKERS,
+                 chunk_size=SEARCH_CHUNK_SIZE, max_matches=DEFAULT_MAX_MATCHES):
+        super(SnapshotMemorySearch, self).__init__(workers, chunk_size, max_matches)
+        self.memory_maps = [memory_map for memory_map in memory_maps
+                            if not memory_map.is_unreadable()]
+
+    def search(self, patterns):
+        regions = [(memory_map.address, memory_map.address + len(memory_map.memory_bytes))
+                   for memory_map in self.memory_maps]
+        return self.search_regions(regions, self.__read_memory, patterns)
+
+    def __read_memory(self, address, size):
+        for memory_map in self.memory_maps:
+            if memory_map.address <= address < memory_map.address + len(memory_map.memory_bytes):
+                return memory_map.get_range(address, address + size)
+        return b""
@@ -0,0 +1,157 @@
+import mmap
+import threading
+from array import array
+
+
+PAGE_SIZE = mmap.PAGESIZE
+ZERO_PAGE = bytes(PAGE_SIZE)
+ZERO_PAGE_ID = 0
+
+
+class PageStore(object):
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.pages = [ZERO_PAGE]
+        self.page_ids = {}
+        self.reference_counts = array("Q", [0])
+        self.free_ids = []
+
+    def add_memory(self, memory_bytes, previous_memory=None, previous_bytes=None):
+        # When the bytes that previous_memory was stored from are given, only
+        # pages that differ from them are hashed, the rest share their ids.
+        memory_view = memoryview(memory_bytes)
+        size = len(memory_bytes)
+        is_bytes = isinstance(memory_bytes, (bytes, bytearray))
+        page_ids = array("I", bytes(4 * ((size + PAGE_SIZE - 1) // PAGE_SIZE)))
+        if previous_memory is None or previous_bytes is None or \
+                previous_memory.page_store is not self or len(previous_memory) != size or \
+                len(previous_bytes) != size:
+            previous_memory = None
+        else:
+            previous_view = memoryview(previous_bytes)
+            previous_is_bytes = isinstance(previous_bytes, (bytes, bytearray))
+        with self.__lock:
+            for index, offset in enumerate(range(0, size, PAGE_SIZE)):
+                page_size = min(PAGE_SIZE, size - offset)
+                if previous_memory is not None:
+                    page_view = memory_view[offset:offset + page_size]
+                    if previous_bytes.startswith(page_view, offset) if previous_is_bytes \
+                            else previous_view[offset:offset + page_size] == page_view:
+                        page_id = previous_memory.page_ids[index]
+                        if page_id != ZERO_PAGE_ID:
+                            self.reference_counts[page_id] += 1
+                        page_ids[index] = page_id
+                        continue
+                if is_bytes and memory_bytes.startswith(ZERO_PAGE[:page_size], offset):
+                    continue
+                page = memory_view[offset:offset + page_size].tobytes()
+                if is_bytes or page != ZERO_PAGE[:page_size]:
+                    page_ids[index] = self.__add_page(page)
+        return PagedMemory(self, page_ids, size)
+
+    def get_page(self, page_id):
+        return self.pages[page_id]
+
+    def retain(self, page_ids):
+        with self.__lock:
+            for page_id in page_ids:
+                if page_id != ZERO_PAGE_ID:
+                    self.reference_counts[page_id] += 1
+
+    def release(self, page_ids):
+        with self.__lock:
+            for page_id in page_ids:
+                if page_id == ZERO_PAGE_ID:
+                    continue
+                self.reference_counts[page_id] -= 1
+                if self.reference_counts[page_id] == 0:
+                    del self.page_ids[self.pages[page_id]]
+                    self.pages[page_id] = None
+                    self.free_ids.append(page_id)
+
+    def get_stored_size(self):
+        return len(self.page_ids) * PAGE_SIZE
+
+    def __add_page(self, page):
+        page_id = self.page_ids.get(page)
+        if page_id is None:
+            if self.free_ids:
+                page_id = self.free_ids.pop()
+                self.pages[page_id] = page
+            else:
+                page_id = len(self.pages)
+                self.pages.append(page)
+                self.reference_counts.append(0)
+            self.page_ids[page] = page_id
+        self.reference_counts[page_id] += 1
+        return page_id
+
+    def __len__(self):
+        return len(self.page_ids)
+
+
+class PagedMemory(object):
+    __slots__ = ("page_store", "page_ids", "size")
+
+    def __init__(self, page_store, page_ids, size):
+        self.page_store = page_store
+        self.page_ids = page_ids
+        self.size = size
+
+    def get_page(self, index):
+        page = self.page_store.get_page(self.page_ids[index])
+        page_size = min(PAGE_SIZE, self.size - index * PAGE_SIZE)
+        if len(page) != page_size:
+            # The shared zero page is a full page, so a trailing partial
+            # zero page is cut to size.
+            return page[:page_size]
+        return page
+
+    def copy_range(self, buffer, buffer_offset, start, end):
+        start = max(start, 0)
+        end = min(end, self.size)
+        for index in range(start // PAGE_SIZE, (end + PAGE_SIZE - 1) // PAGE_SIZE):
+            page_start = index * PAGE_SIZE
+            copy_start = max(start, page_start)
+            copy_end = min(end, page_start + PAGE_SIZE)
+            destination = buffer_offset + copy_start - start
+            buffer[destination:destination + copy_end - copy_start] = \
+                memoryview(self.get_page(index))[copy_start - page_start:copy_end - page_start]
+
+    def get_changed_pages(self, other):
+        if not isinstance(other, PagedMemory) or other.page_store is not self.page_store or \
+                other.size != self.size:
+            return None
+        return [index for index, (page_id, other_page_id)
+                in enumerate(zip(self.page_ids, other.page_ids))
+                if page_id != other_page_id]
+
+    def tobytes(self):
+        return self[0:self.size]
+
+    def release(self):
+        self.page_store.release(self.page_ids)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, end, step = key.indices(self.size)
+            buffer = bytearray(max(end - start, 0))
+            self.copy_range(buffer, 0, start, end)
+            return bytes(buffer) if step == 1 else bytes(buffer[::step])
+        if key < 0:
+            key += self.size
+        if not 0 <= key < self.size:
+            raise IndexError("Paged memory index out of range.")
+        return self.get_page(key // PAGE_SIZE)[key % PAGE_SIZE]
+
+    def __len__(self):
+        return self.size
+
+    def __eq__(self, other):
+        if isinstance(other, PagedMemory) and other.page_store is self.page_store:
+            return self.size == other.size and self.page_ids == other.page_ids
+        if isinstance(other, (bytes, bytearray, memoryview)):
+            return len(other) == self.size and self.tobytes() == other
+        return NotImplemented
+
+    __hash__ = None
@@ -0,0 +1,111 @@
+import logging
+from .memory_reader import MemoryReader
+from .memory_reader import MemoryReaderError
+from .read_backend import MEM_FILE_BACKEND
+from .read_backend import DEFAULT_READ_WORKERS
+from .memory_search import ProcessMemorySearch
+from .memory_search import DEFAULT_MAX_MATCHES
+from .memory_search import parse_search_query
+
+
+STREAM_CHUNK_SIZE = 4 * 1024 * 1024
+HEXDUMP_WIDTH = 16
+PRINTABLE_BYTES = bytes(byte_value if 31 < byte_value < 127 else ord(".")
+                        for byte_value in range(256))
+
+
+def open_process(target_pid, read_backend=MEM_FILE_BACKEND, read_workers=DEFAULT_READ_WORKERS):
+    return ProcessSession(target_pid, read_backend, read_workers)
+
+
+def format_hexdump_line(address, line_bytes, width=HEXDUMP_WIDTH):
+    return "{:016x}  {:<{}}  |{}|".format(
+        address, line_bytes.hex(" "), width * 3 - 1,
+        line_bytes.translate(PRINTABLE_BYTES).decode("ascii"))
+
+
+class ProcessSessionError(Exception):
+    pass
+
+
+class ProcessSession(object):
+    def __init__(self, target_pid, read_backend=MEM_FILE_BACKEND,
+                 read_workers=DEFAULT_READ_WORKERS, memory_reader=None):
+        self._log = logging.getLogger(self.__class__.__name__)
+        self.target_pid = target_pid
+        self.read_workers = max(1, read_workers)
+        try:
+            self.memory_reader = memory_reader or MemoryReader(
+                target_pid, use_ptrace=False, read_backend=read_backend,
+                read_workers=read_workers)
+        except MemoryReaderError as exception:
+            raise ProcessSessionError("Failed to open process : {}. Cause : {}".format(
+                target_pid, str(exception))) from exception
+        self.memory_search = ProcessMemorySearch(target_pid, self.regions, read_workers)
+
+    def regions(self):
+        try:
+            self.memory_reader.refresh_memory_map_metadata()
+        except MemoryReaderError as exception:
+            raise ProcessSessionError(str(exception)) from exception
+        return list(self.memory_reader.maps_metadata)
+
+    def read(self, address, size):
+        return b"".join(bytes(chunk) for chunk in self.iter_read(address, size))
+
+    def iter_read(self, address, size, chunk_size=STREAM_CHUNK_SIZE):
+        # A batch of chunks is requested at once so that the parallel backend
+        # reads them concurrently. Reading stops at the first short chunk.
+        start = address
+        end = address + size
+        while address < end:
+            ranges = [(chunk_start, min(chunk_size, end - chunk_start))
+                      for chunk_start in range(address, end, chunk_size)][:self.read_workers]
+            for (chunk_start, chunk_size_read), result in zip(
+                    ranges, self.memory_reader.read_backend.read_ranges(ranges)):
+                if not result.is_successful() and chunk_start == start:
+                    raise ProcessSessionError("Failed to read {} bytes at {:#x}. Cause : {}"
+                                              .format(chunk_size_read, chunk_start,
+                                                      str(result.error)))
+                if len(result.memory_bytes) > 0:
+                    yield result.memory_bytes
+                address = chunk_start + len(result.memory_bytes)
+                if address < chunk_start + chunk_size_read:
+                    return
+
+    def write_range(self, output, address, size):
+        written = 0
+        for chunk in self.iter_read(address, size):
+            output.write(chunk)
+            written += len(chunk)
+        return written
+
+    def write_hexdump(self, output, address, size, width=HEXDUMP_WIDTH):
+        line_start = address
+        remainder = b""
+        for chunk in self.iter_read(address, size):
+            chunk = remainder + bytes(chunk)
+            line_count = len(chunk) // width
+            output.write("".join(
+                format_hexdump_line(line_start + index * width,
+                                    chunk[index * width:(index + 1) * width], width) + "\n"
+                for index in range(line_count)))
+            line_start += line_count * width
+            remainder = chunk[line_count * width:]
+        if remainder:
+            output.write(format_hexdump_line(line_start, remainder, width) + "\n")
+        return line_start + len(remainder) - address
+
+    def search(self, query, max_matches=DEFAULT_MAX_MATCHES):
+        patterns = parse_search_query(query) if isinstance(query, str) else query
+        self.memory_search.max_matches = max_matches
+        return self.memory_search.search(patterns)
+
+    def close(self):
+        self.memory_reader.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.close()
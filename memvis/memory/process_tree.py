@@ -0,0 +1,45 @@
+import os
+import logging
+
+
+PROC_PATH = "/proc"
+
+
+def get_process_stat_path(process_id):
+    return PROC_PATH + "/" + str(process_id) + "/stat"
+
+
+def parse_parent_pid(stat_line):
+    # The command name is in parentheses and may itself contain spaces and
+    # parentheses, so the fields are counted from the last closing one.
+    return int(stat_line.rpartition(")")[2].split()[1])
+
+
+def read_parent_pids():
+    parent_pids = {}
+    for entry in os.listdir(PROC_PATH):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(get_process_stat_path(entry)) as stat_file:
+                parent_pids[int(entry)] = parse_parent_pid(stat_file.readline())
+        except (IOError, OSError, ValueError, IndexError) as exception:
+            logging.getLogger(__name__).debug(
+                "Skipping process : {}. Cause : {}".format(entry, str(exception)))
+    return parent_pids
+
+
+def get_process_tree(root_pid, parent_pids=None):
+    if parent_pids is None:
+        parent_pids = read_parent_pids()
+    children = {}
+    for pid, parent_pid in parent_pids.items():
+        children.setdefault(parent_pid, []).append(pid)
+
+    process_tree = []
+    pending = [root_pid]
+    while pending:
+        pid = pending.pop(0)
+        process_tree.append(pid)
+        pending += sorted(children.get(pid, ()))
+    return process_tree
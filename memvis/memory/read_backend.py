@@ -0,0 +1,375 @@
+import os
+import heapq
+import errno
+import ctypes
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+MEM_FILE_BACKEND = "mem"
+PROCESS_VM_BACKEND = "vm"
+PARALLEL_MEM_FILE_BACKEND = "parallel"
+READ_BACKENDS = [MEM_FILE_BACKEND, PROCESS_VM_BACKEND, PARALLEL_MEM_FILE_BACKEND]
+IOV_MAX = 1024
+DEFAULT_READ_WORKERS = os.cpu_count() or 1
+READ_CHUNK_SIZE = 16 * 1024 * 1024
+# Linux transfers at most this many bytes with one read or process_vm_readv
+# call, larger requests come back short.
+MAX_READ_SIZE = 0x7ffff000
+
+
+def get_process_mem_path(process_id):
+    return "/proc/" + str(process_id) + "/mem"
+
+
+def create_read_backend(backend_name, target_pid, workers=DEFAULT_READ_WORKERS):
+    if backend_name == MEM_FILE_BACKEND:
+        return MemFileReadBackend(target_pid)
+    if backend_name == PROCESS_VM_BACKEND:
+        return ProcessVmReadBackend(target_pid)
+    if backend_name == PARALLEL_MEM_FILE_BACKEND:
+        return ParallelMemFileReadBackend(target_pid, workers)
+    raise ValueError("Unknown read backend : {}. Expected one of : {}."
+                     .format(backend_name, ", ".join(READ_BACKENDS)))
+
+
+def load_process_vm_readv():
+    libc = ctypes.CDLL(None, use_errno=True)
+    try:
+        process_vm_readv = libc.process_vm_readv
+    except AttributeError as exception:
+        message = "process_vm_readv is not available on this system."
+        logging.getLogger(__name__).error(message)
+        raise ReadBackendError(message) from exception
+    process_vm_readv.restype = ctypes.c_ssize_t
+    process_vm_readv.argtypes = [ctypes.c_int, ctypes.POINTER(IoVec), ctypes.c_ulong,
+                                 ctypes.POINTER(IoVec), ctypes.c_ulong, ctypes.c_ulong]
+    return process_vm_readv
+
+
+def create_range_reader(target_pid, ranges):
+    # process_vm_readv reads all ranges with one system call, but it may be
+    # missing or not permitted, in which case /proc/[pid]/mem is used.
+    try:
+        range_reader = ProcessVmRangeReader(target_pid, ranges)
+        range_reader.read()
+        return range_reader
+    except (ReadBackendError, OSError) as exception:
+        logging.getLogger(__name__).info(
+            "Reading ranges from the mem file instead of process_vm_readv. Cause : {}"
+            .format(str(exception)))
+    return MemFileRangeReader(target_pid, ranges)
+
+
+class ReadBackendError(Exception):
+    pass
+
+
+class ReadResult(object):
+    def __init__(self, address, memory_bytes, error=None):
+        self.address = address
+        self.memory_bytes = memory_bytes
+        self.error = error
+
+    def is_successful(self):
+        return self.error is None
+
+
+class MemFileReadBackend(object):
+    def __init__(self, target_pid):
+        self.target_pid = target_pid
+        self.mems_file = None
+
+    def read(self, address, size):
+        mems_file = self.__get_mems_file()
+        mems_file.seek(address)
+        chunks = []
+        bytes_read = 0
+        while bytes_read < size:
+            try:
+                chunk = mems_file.read(size - bytes_read)
+            except (IOError, OSError):
+                if not chunks:
+                    raise
+                break
+            if not chunk:
+                break
+            chunks.append(chunk)
+            bytes_read += len(chunk)
+        if len(chunks) == 1:
+            return chunks[0]
+        return b"".join(chunks)
+
+    def read_ranges(self, ranges):
+        results = []
+        for address, size in ranges:
+            try:
+                results.append(ReadResult(address, self.read(address, size)))
+            except (IOError, OSError, ValueError) as error:
+                results.append(ReadResult(address, b"", error))
+        return results
+
+    def close(self):
+        if self.mems_file is not None:
+            self.mems_file.close()
+            self.mems_file = None
+
+    def __get_mems_file(self):
+        if self.mems_file is None:
+            self.mems_file = open(get_process_mem_path(
+                self.target_pid), "rb", buffering=0)
+        return self.mems_file
+
+
+def shard_read_pieces(pieces, shard_count):
+    shards = [[] for _ in range(max(1, min(shard_count, len(pieces))))]
+    loads = [(0, index) for index in range(len(shards))]
+    for piece in sorted(pieces, key=lambda piece: piece[3], reverse=True):
+        load, index = heapq.heappop(loads)
+        shards[index].append(piece)
+        heapq.heappush(loads, (load + piece[3], index))
+    return shards
+
+
+class ParallelMemFileReadBackend(object):
+    def __init__(self, target_pid, workers=DEFAULT_READ_WORKERS, chunk_size=READ_CHUNK_SIZE):
+        self._log = logging.getLogger(self.__class__.__name__)
+        self.target_pid = target_pid
+        self.workers = max(1, workers)
+        self.chunk_size = chunk_size
+        self.mems_fd = None
+        self.executor = ThreadPoolExecutor(max_workers=self.workers)
+        self.__lock = threading.Lock()
+
+    def read(self, address, size):
+        result = self.read_ranges([(address, size)])[0]
+        if not result.is_successful():
+            raise result.error
+        return result.memory_bytes
+
+    def read_ranges(self, ranges):
+        try:
+            mems_fd = self.__get_mems_fd()
+        except (IOError, OSError) as error:
+            return [ReadResult(address, b"", error) for address, _ in ranges]
+
+        buffers = [bytearray(size) for _, size in ranges]
+        lengths = [size for _, size in ranges]
+        errors = [None] * len(ranges)
+        pieces = []
+        for index, (address, size) in enumerate(ranges):
+            for offset in range(0, size, self.chunk_size):
+                pieces.append((index, address, offset, min(self.chunk_size, size - offset)))
+
+        shards = shard_read_pieces(pieces, self.workers)
+        futures = [self.executor.submit(self.__read_shard, mems_fd, shard, buffers, lengths, errors)
+                   for shard in shards]
+        for future in futures:
+            future.result()
+
+        results = []
+        for index, (address, _) in enumerate(ranges):
+            if lengths[index] == 0 and errors[index] is not None:
+                results.append(ReadResult(address, b"", errors[index]))
+            elif lengths[index] < len(buffers[index]):
+                results.append(ReadResult(address, memoryview(buffers[index])[:lengths[index]]))
+            else:
+                results.append(ReadResult(address, buffers[index]))
+        return results
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        if self.mems_fd is not None:
+            os.close(self.mems_fd)
+            self.mems_fd = None
+
+    def __read_shard(self, mems_fd, shard, buffers, lengths, errors):
+        for index, address, offset, size in shard:
+            piece_buffer = memoryview(buffers[index])[offset:offset + size]
+            bytes_read = 0
+            error = None
+            while bytes_read < size:
+                try:
+                    count = os.preadv(mems_fd, [piece_buffer[bytes_read:]],
+                                      address + offset + bytes_read)
+                except OSError as exception:
+                    error = exception
+                    break
+                if count == 0:
+                    break
+                bytes_read += count
+            if bytes_read < size:
+                # /proc/[pid]/mem stops at the first unreadable page, so the
+                # range is only valid up to the end of this piece's data.
+                with self.__lock:
+                    lengths[index] = min(lengths[index], offset + bytes_read)
+                    if error is not None and errors[index] is None:
+                        errors[index] = error
+
+    def __get_mems_fd(self):
+        if self.mems_fd is None:
+            self.mems_fd = os.open(get_process_mem_path(self.target_pid), os.O_RDONLY)
+        return self.mems_fd
+
+
+class IoVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p),
+                ("iov_len", ctypes.c_size_t)]
+
+
+class ProcessVmReadBackend(object):
+    def __init__(self, target_pid):
+        self._log = logging.getLogger(self.__class__.__name__)
+        self.target_pid = target_pid
+        self.process_vm_readv = load_process_vm_readv()
+
+    def read(self, address, size):
+        result = self.read_ranges([(address, size)])[0]
+        if not result.is_successful():
+            raise result.error
+        return result.memory_bytes
+
+    def read_ranges(self, ranges):
+        buffers = [bytearray(size) for _, size in ranges]
+        lengths = [size for _, size in ranges]
+        errors = [None] * len(ranges)
+        pieces = []
+        for index, (address, size) in enumerate(ranges):
+            for offset in range(0, size, MAX_READ_SIZE):
+                pieces.append((index, address + offset, offset,
+                               min(MAX_READ_SIZE, size - offset)))
+        position = 0
+        while position < len(pieces):
+            position = self.__read_batch(pieces, buffers, lengths, errors, position)
+
+        results = []
+        for index, (address, _) in enumerate(ranges):
+            if lengths[index] == 0 and errors[index] is not None:
+                results.append(ReadResult(address, b"", errors[index]))
+            elif lengths[index] < len(buffers[index]):
+                results.append(ReadResult(address, memoryview(buffers[index])[:lengths[index]]))
+            else:
+                results.append(ReadResult(address, buffers[index]))
+        return results
+
+    def close(self):
+        pass
+
+    def __read_batch(self, pieces, buffers, lengths, errors, first_position):
+        batch_end = first_position
+        batch_size = 0
+        while batch_end < len(pieces) and batch_end - first_position < IOV_MAX and \
+                batch_size + pieces[batch_end][3] <= MAX_READ_SIZE:
+            batch_size += pieces[batch_end][3]
+            batch_end += 1
+        count = batch_end - first_position
+        local_iovecs = (IoVec * count)()
+        remote_iovecs = (IoVec * count)()
+        local_buffers = []
+        for iovec_index, (index, address, offset, size) in enumerate(
+                pieces[first_position:batch_end]):
+            local_buffer = (ctypes.c_char * size).from_buffer(buffers[index], offset)
+            local_buffers.append(local_buffer)
+            local_iovecs[iovec_index] = IoVec(ctypes.addressof(local_buffer), size)
+            remote_iovecs[iovec_index] = IoVec(address, size)
+
+        bytes_read = self.process_vm_readv(self.target_pid, local_iovecs, count,
+                                           remote_iovecs, count, 0)
+        del local_buffers
+        if bytes_read < 0:
+            return self.__handle_read_error(pieces, lengths, errors, first_position)
+
+        for position in range(first_position, batch_end):
+            index, _, offset, size = pieces[position]
+            if bytes_read < size:
+                # The kernel stops at the first page it cannot read, so the
+                # range is valid up to there and the read resumes with the
+                # next range.
+                self.__truncate(lengths, errors, index, offset + bytes_read,
+                                OSError(errno.EFAULT, os.strerror(errno.EFAULT)))
+                return self.__skip_range(pieces, position)
+            bytes_read -= size
+        return batch_end
+
+    def __handle_read_error(self, pieces, lengths, errors, first_position):
+        error_number = ctypes.get_errno()
+        error = OSError(error_number, os.strerror(error_number))
+        if error_number == errno.EFAULT:
+            index, _, offset, _ = pieces[first_position]
+            self.__truncate(lengths, errors, index, offset, error)
+            return self.__skip_range(pieces, first_position)
+
+        self._log.error("process_vm_readv failed for process : {}. Cause : {}"
+                        .format(self.target_pid, str(error)))
+        for index, _, offset, _ in pieces[first_position:]:
+            self.__truncate(lengths, errors, index, offset, error)
+        return len(pieces)
+
+    def __truncate(self, lengths, errors, index, length, error):
+        lengths[index] = min(lengths[index], length)
+        if errors[index] is None:
+            errors[index] = error
+
+    def __skip_range(self, pieces, position):
+        index = pieces[position][0]
+        position += 1
+        while position < len(pieces) and pieces[position][0] == index:
+            position += 1
+        return position
+
+
+class ProcessVmRangeReader(object):
+    def __init__(self, target_pid, ranges):
+        self.target_pid = target_pid
+        self.ranges = list(ranges)
+        if len(self.ranges) > IOV_MAX:
+            raise ReadBackendError("At most {} ranges can be read at once, got : {}."
+                                   .format(IOV_MAX, len(self.ranges)))
+        self.buffer = bytearray(sum(size for _, size in self.ranges))
+        self.process_vm_readv = load_process_vm_readv()
+        self.count = len(self.ranges)
+        self.local_iovecs = (IoVec * self.count)()
+        self.remote_iovecs = (IoVec * self.count)()
+        self.local_buffer = (ctypes.c_char * len(self.buffer)).from_buffer(self.buffer)
+        offset = 0
+        for position, (address, size) in enumerate(self.ranges):
+            self.local_iovecs[position] = IoVec(ctypes.addressof(self.local_buffer) + offset, size)
+            self.remote_iovecs[position] = IoVec(address, size)
+            offset += size
+
+    def read(self):
+        bytes_read = self.process_vm_readv(self.target_pid, self.local_iovecs, self.count,
+                                           self.remote_iovecs, self.count, 0)
+        if bytes_read < 0:
+            error_number = ctypes.get_errno()
+            raise OSError(error_number, os.strerror(error_number))
+        return bytes_read
+
+    def close(self):
+        pass
+
+
+class MemFileRangeReader(object):
+    def __init__(self, target_pid, ranges):
+        self.target_pid = target_pid
+        self.ranges = list(ranges)
+        self.buffer = bytearray(sum(size for _, size in self.ranges))
+        self.views = []
+        offset = 0
+        buffer_view = memoryview(self.buffer)
+        for address, size in self.ranges:
+            self.views.append((address, [buffer_view[offset:offset + size]]))
+            offset += size
+        self.mems_fd = os.open(get_process_mem_path(target_pid), os.O_RDONLY)
+
+    def read(self):
+        bytes_read = 0
+        for address, views in self.views:
+            bytes_read += os.preadv(self.mems_fd, views, address)
+        return bytes_read
+
+    def close(self):
+        if self.mems_fd is not None:
+            os.close(self.mems_fd)
+            self.mems_fd = None
@@ -0,0 +1,64 @@
+import logging
+import threading
+
+
+ANONYMOUS_FIELD = "Anonymous:"
+
+
+def get_process_smaps_path(process_id):
+    return "/proc/" + str(process_id) + "/smaps"
+
+
+def get_mapping_key(metadata):
+    return metadata.device, metadata.inode, metadata.offset, metadata.memory_size
+
+
+def parse_anonymous_sizes(smaps_lines):
+    anonymous_sizes = {}
+    start = None
+    for line in smaps_lines:
+        field, _, value = line.partition(" ")
+        if not field.endswith(":"):
+            start = int(field.partition("-")[0], 16)
+        elif field == ANONYMOUS_FIELD and start is not None:
+            anonymous_sizes[start] = int(value.split()[0])
+    return anonymous_sizes
+
+
+def read_anonymous_sizes(process_id):
+    with open(get_process_smaps_path(process_id)) as smaps_file:
+        return parse_anonymous_sizes(smaps_file)
+
+
+class SharedMappingCache(object):
+    def __init__(self):
+        self._log = logging.getLogger(self.__class__.__name__)
+        self.__lock = threading.Lock()
+        self.mappings = {}
+        self.hits = 0
+        self.saved_size = 0
+
+    def get(self, metadata):
+        with self.__lock:
+            memory_bytes = self.mappings.get(get_mapping_key(metadata))
+            if memory_bytes is not None:
+                self.hits += 1
+                self.saved_size += len(memory_bytes)
+            return memory_bytes
+
+    def put(self, metadata, memory_bytes):
+        with self.__lock:
+            return self.mappings.setdefault(get_mapping_key(metadata), memory_bytes)
+
+    def retain(self, maps_metadata):
+        keys = set(get_mapping_key(metadata) for metadata in maps_metadata)
+        with self.__lock:
+            self.mappings = {key: memory_bytes for key, memory_bytes in self.mappings.items()
+                             if key in keys}
+
+    def get_stored_size(self):
+        with self.__lock:
+            return sum(len(memory_bytes) for memory_bytes in self.mappings.values())
+
+    def __len__(self):
+        return len(self.mappings)
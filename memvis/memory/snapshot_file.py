@@ -0,0 +1,208 @@
+import mmap
+import zlib
+import struct
+import logging
+from .memory_reader import PAGE_SIZE
+from .memory_reader import UNREADABLE_MEMORY
+from .memory_reader import MemoryMap
+from .memory_reader import MemoryReaderError
+from .memory_reader import align_to_page_end
+from .memory_reader import parse_memory_maps
+from .page_store import PageStore
+from .page_store import PagedMemory
+
+
+SNAPSHOT_MAGIC = b"MEMVISSF"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct("<8sIIQQQ")
+SNAPSHOT_ENTRY = struct.Struct("<QQQQI")
+RAW_ENCODING = 0
+ZLIB_ENCODING = 1
+UNREADABLE_ENCODING = 2
+ZERO_PAGE = bytes(PAGE_SIZE)
+COMPRESSION_CHUNK_SIZE = 256 * PAGE_SIZE
+DUMP_BATCH_SIZE = 64 * 2 ** 20
+
+
+def get_dump_batches(maps_metadata, batch_size):
+    batch = []
+    batch_bytes = 0
+    for metadata in maps_metadata:
+        batch.append(metadata)
+        batch_bytes += metadata.memory_size
+        if batch_bytes >= batch_size:
+            yield batch
+            batch = []
+            batch_bytes = 0
+    if batch:
+        yield batch
+
+
+def dump_memory(memory_reader, snapshot_path, compress=False, batch_size=DUMP_BATCH_SIZE):
+    maps_metadata = [metadata for metadata in memory_reader.maps_metadata
+                     if metadata.is_readable()]
+    try:
+        start_address = memory_reader.get_stack_pointer()
+    except MemoryReaderError:
+        start_address = 0
+
+    snapshot_writer = SnapshotFileWriter(snapshot_path, memory_reader.target_pid,
+                                         maps_metadata, start_address, compress)
+    try:
+        for batch in get_dump_batches(maps_metadata, batch_size):
+            for memory_map in memory_reader.read_memory_regions(batch):
+                snapshot_writer.write_memory_map(memory_map)
+    finally:
+        snapshot_writer.close()
+    return snapshot_writer
+
+
+class SnapshotFileError(Exception):
+    pass
+
+
+class SnapshotFileWriter(object):
+    def __init__(self, snapshot_path, pid, maps_metadata, start_address=0, compress=False):
+        self._log = logging.getLogger(self.__class__.__name__)
+        self.snapshot_path = snapshot_path
+        self.compress = compress
+        self.entries = [(metadata.address_range.start, 0, 0, 0, UNREADABLE_ENCODING)
+                        for metadata in maps_metadata]
+        self.indices = {metadata.address_range.start: index
+                        for index, metadata in enumerate(maps_metadata)}
+        self.stored_size = 0
+        lines = "\n".join(metadata.to_maps_line()
+                          for metadata in maps_metadata).encode("utf-8")
+        try:
+            self.snapshot_file = open(snapshot_path, "wb")
+            self.snapshot_file.write(SNAPSHOT_HEADER.pack(
+                SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(maps_metadata), pid,
+                start_address, len(lines)))
+            self.snapshot_file.write(bytes(SNAPSHOT_ENTRY.size * len(maps_metadata)))
+            self.snapshot_file.write(lines)
+            self.file_offset = align_to_page_end(self.snapshot_file.tell())
+        except (IOError, OSError) as exception:
+            raise SnapshotFileError(self.__log_write_error(exception)) from exception
+
+    def write_memory_map(self, memory_map):
+        index = self.indices.get(memory_map.metadata.address_range.start)
+        if index is None:
+            raise SnapshotFileError("Memory map is not part of the snapshot : {}."
+                                    .format(memory_map.metadata))
+        if memory_map.is_unreadable():
+            return
+
+        memory_bytes = memory_map.memory_bytes
+        if isinstance(memory_bytes, (memoryview, PagedMemory)):
+            memory_bytes = memory_bytes.tobytes()
+        try:
+            if self.compress:
+                encoding = ZLIB_ENCODING
+                stored_size = self.__write_compressed(memory_bytes)
+            else:
+                encoding = RAW_ENCODING
+                stored_size = self.__write_sparse(memory_bytes)
+        except (IOError, OSError) as exception:
+            raise SnapshotFileError(self.__log_write_error(exception)) from exception
+
+        self.entries[index] = (memory_map.address, len(memory_bytes),
+                               self.file_offset, stored_size, encoding)
+        self.stored_size += stored_size
+        self.file_offset = align_to_page_end(self.file_offset + stored_size)
+
+    def close(self):
+        try:
+            self.snapshot_file.truncate(self.file_offset)
+            self.snapshot_file.seek(SNAPSHOT_HEADER.size)
+            for entry in self.entries:
+                self.snapshot_file.write(SNAPSHOT_ENTRY.pack(*entry))
+            self.snapshot_file.close()
+        except (IOError, OSError) as exception:
+            raise SnapshotFileError(self.__log_write_error(exception)) from exception
+
+    def __write_sparse(self, memory_bytes):
+        # All-zero pages are skipped so that they stay holes in the file and
+        # read back as zeros through mmap.
+        memory_view = memoryview(memory_bytes)
+        size = len(memory_bytes)
+        run_start = None
+        for offset in range(0, size, PAGE_SIZE):
+            page_size = min(PAGE_SIZE, size - offset)
+            if memory_bytes.startswith(ZERO_PAGE[:page_size], offset):
+                if run_start is not None:
+                    self.__write_at(run_start, memory_view[run_start:offset])
+                    run_start = None
+            elif run_start is None:
+                run_start = offset
+        if run_start is not None:
+            self.__write_at(run_start, memory_view[run_start:])
+        return size
+
+    def __write_compressed(self, memory_bytes):
+        memory_view = memoryview(memory_bytes)
+        compressor = zlib.compressobj(1)
+        self.snapshot_file.seek(self.file_offset)
+        for offset in range(0, len(memory_bytes), COMPRESSION_CHUNK_SIZE):
+            self.snapshot_file.write(compressor.compress(
+                memory_view[offset:offset + COMPRESSION_CHUNK_SIZE]))
+        self.snapshot_file.write(compressor.flush())
+        return self.snapshot_file.tell() - self.file_offset
+
+    def __write_at(self, offset, data):
+        self.snapshot_file.seek(self.file_offset + offset)
+        self.snapshot_file.write(data)
+
+    def __log_write_error(self, exception):
+        message = "Failed to write snapshot file at : {}. Cause : {}"\
+            .format(self.snapshot_path, str(exception))
+        self._log.error(message)
+        return message
+
+
+class SnapshotFile(object):
+    def __init__(self, snapshot_path):
+        self._log = logging.getLogger(self.__class__.__name__)
+        self.snapshot_path = snapshot_path
+        try:
+            with open(snapshot_path, "rb") as snapshot_file:
+                self.snapshot_mmap = mmap.mmap(
+                    snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.__read_header()
+        except (IOError, OSError, ValueError, struct.error) as exception:
+            message = "Failed to open snapshot file at : {}. Cause : {}"\
+                .format(snapshot_path, str(exception))
+            self._log.error(message)
+            raise SnapshotFileError(message) from exception
+        self.page_store = PageStore()
+
+    def read_memory_maps(self):
+        snapshot_view = memoryview(self.snapshot_mmap)
+        memory_maps = []
+        for metadata, entry in zip(self.maps_metadata, self.entries):
+            address, size, file_offset, stored_size, encoding = entry
+            if encoding == RAW_ENCODING:
+                memory_bytes = snapshot_view[file_offset:file_offset + size]
+            elif encoding == ZLIB_ENCODING:
+                # Decompressed regions live in memory, so they are kept as
+                # deduplicated pages.
+                memory_bytes = self.page_store.add_memory(zlib.decompress(
+                    snapshot_view[file_offset:file_offset + stored_size]))
+            else:
+                memory_bytes = UNREADABLE_MEMORY
+            memory_maps.append(MemoryMap(self.pid, metadata, memory_bytes, address))
+        return memory_maps
+
+    def __read_header(self):
+        magic, version, region_count, self.pid, self.start_address, lines_size = \
+            SNAPSHOT_HEADER.unpack_from(self.snapshot_mmap)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError("Not a version {} memvis snapshot.".format(SNAPSHOT_VERSION))
+
+        self.entries = list(SNAPSHOT_ENTRY.iter_unpack(self.snapshot_mmap[
+            SNAPSHOT_HEADER.size:SNAPSHOT_HEADER.size + SNAPSHOT_ENTRY.size * region_count]))
+        lines_offset = SNAPSHOT_HEADER.size + SNAPSHOT_ENTRY.size * region_count
+        lines = self.snapshot_mmap[lines_offset:lines_offset + lines_size].decode("utf-8")
+        self.maps_metadata = parse_memory_maps(lines.split("\n")) if lines else []
+        if len(self.maps_metadata) != region_count:
+            raise ValueError("Expected {} regions but found {}."
+                             .format(region_count, len(self.maps_metadata)))
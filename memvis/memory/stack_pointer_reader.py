@@ -23,7 +23,7 @@ class PtraceStackPointerReader(object):
     def read_stack_pointer(self, pid):
         process = PtraceProcess(
             debugger=DummyDebugger(), pid=pid, is_attached=False)
-        stack_pointer = hex(process.getStackPointer())
+        stack_pointer = process.getStackPointer()
         process.was_attached = True
         process.detach()
         return stack_pointer
@@ -36,7 +36,7 @@ class SyscallFileStackPointerReader(object):
     def read_stack_pointer(self, pid):
         syscall_line = self.__read_syscall_file(pid)
         matches = regex.findall(HEX_NUMBER_REGEX, syscall_line)
-        stack_pointer = matches[len(matches) - 2]
+        stack_pointer = int(matches[len(matches) - 2], 16)
 
         return stack_pointer
 
@@ -0,0 +1,120 @@
+import time
+import logging
+import threading
+from array import array
+
+
+DEFAULT_SPAN_WINDOW = 512
+MAPS_SPAN = "maps"
+READ_SPAN = "read"
+GET_RANGE_SPAN = "get_range"
+RENDER_SPAN = "render"
+SPAN_NAMES = (MAPS_SPAN, READ_SPAN, GET_RANGE_SPAN, RENDER_SPAN)
+
+
+def format_duration(seconds):
+    if seconds < 1e-3:
+        return "{:.0f}us".format(seconds * 1e6)
+    if seconds < 1:
+        return "{:.1f}ms".format(seconds * 1e3)
+    return "{:.2f}s".format(seconds)
+
+
+def format_throughput(bytes_per_second):
+    return "{:.0f}MB/s".format(bytes_per_second / 1e6)
+
+
+class SpanStatistics(object):
+    __slots__ = ("durations", "position", "count", "total_time", "total_size")
+
+    def __init__(self, window=DEFAULT_SPAN_WINDOW):
+        self.durations = array("d", bytes(8 * window))
+        self.position = 0
+        self.count = 0
+        self.total_time = 0.0
+        self.total_size = 0
+
+    def record(self, duration, size=0):
+        self.durations[self.position] = duration
+        self.position = (self.position + 1) % len(self.durations)
+        self.count += 1
+        self.total_time += duration
+        self.total_size += size
+
+    def get_percentile(self, fraction):
+        durations = sorted(self.durations[:min(self.count, len(self.durations))])
+        if not durations:
+            return 0.0
+        return durations[min(int(len(durations) * fraction), len(durations) - 1)]
+
+    def get_throughput(self):
+        if self.total_time <= 0:
+            return 0.0
+        return self.total_size / self.total_time
+
+
+class TimingSpans(object):
+    def __init__(self, window=DEFAULT_SPAN_WINDOW):
+        self._log = logging.getLogger(self.__class__.__name__)
+        self.__lock = threading.Lock()
+        self.window = window
+        self.enabled = False
+        self.spans = {}
+
+    def enable(self):
+        with self.__lock:
+            self.spans = {}
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def start(self):
+        # Callers pass the returned value to stop, which ignores spans that
+        # started while timing was disabled, so a disabled span costs one
+        # attribute check.
+        if not self.enabled:
+            return None
+        return time.perf_counter()
+
+    def stop(self, name, started_at, size=0):
+        if started_at is None:
+            return
+        duration = time.perf_counter() - started_at
+        with self.__lock:
+            span = self.spans.get(name)
+            if span is None:
+                span = self.spans[name] = SpanStatistics(self.window)
+            span.record(duration, size)
+
+    def get_span(self, name):
+        with self.__lock:
+            return self.spans.get(name)
+
+    def get_summary(self, names=SPAN_NAMES):
+        parts = []
+        for name in names:
+            span = self.get_span(name)
+            if span is None:
+                continue
+            with self.__lock:
+                part = "{} {}/{}".format(name, format_duration(span.get_percentile(0.5)),
+                                         format_duration(span.get_percentile(0.99)))
+                if span.total_size:
+                    part += " " + format_throughput(span.get_throughput())
+            parts.append(part)
+        return "  ".join(parts)
+
+    def log_spans(self):
+        with self.__lock:
+            for name, span in sorted(self.spans.items()):
+                message = "Span : {}, count : {}, p50 : {}, p99 : {}, max : {}".format(
+                    name, span.count, format_duration(span.get_percentile(0.5)),
+                    format_duration(span.get_percentile(0.99)),
+                    format_duration(span.get_percentile(1.0)))
+                if span.total_size:
+                    message += ", throughput : " + format_throughput(span.get_throughput())
+                self._log.info(message)
+
+
+TIMING_SPANS = TimingSpans()
@@ -1,18 +1,46 @@
+import os
 import argparse
 import logging
 import sys
 from memvis import MemvisController
+from memvis import MemvisSnapshotController
+from memvis import MemoryReader
+from memvis import dump_memory
 import time
+from memvis import DEFAULT_PREFETCH_SIZE
+from memvis import PAGE_SIZE
+from memvis import READ_BACKENDS
+from memvis import MEM_FILE_BACKEND
+from memvis import DEFAULT_READ_WORKERS
+from memvis import convert_hex_to_int
+from memvis import get_process_tree
+from memvis import DEFAULT_HISTORY_BUDGET
+from memvis import DEFAULT_SAMPLE_RATE
+from memvis import HEXDUMP_WIDTH
+from memvis import ProcessSessionError
+from memvis import open_process
+
+DUMP_COMMAND = "dump"
+VIEW_COMMAND = "view"
+READ_COMMAND = "read"
+REGIONS_COMMAND = "regions"
+HEXDUMP_COMMAND = "hexdump"
+
+
+def convert_size(size_string):
+    return int(size_string, 0)
 
 
 def get_argument_parser():
     parser = argparse.ArgumentParser()
     parser.add_argument("-s", "--start-address",
-                        dest="start_address", type=str,
+                        dest="start_address", type=convert_hex_to_int,
                         help="Address to start visualizing from." +
                         " If not set the current stack pointer will be used.")
-    parser.add_argument("-p", "--pid", dest="target_pid", type=int,
-                        help="The pid of the process.", required=True)
+    parser.add_argument("-p", "--pid", dest="target_pids", type=int, nargs="+",
+                        help="The pids of the processes. Tab switches between them.", required=True)
+    parser.add_argument("-t", "--process-tree", dest="process_tree", action="store_true",
+                        help="If set all descendants of the given processes are visualized too.")
     parser.add_argument("-n", "--no-ptrace", dest="use_ptrace", action="store_false",
                         help="If set then the stack pointer will " +
                         "be read from /proc/[pid]/syscall file." +
@@ -24,7 +52,114 @@ def get_argument_parser():
     parser.add_argument("-b", "--print-bytes", dest="convert_ascii",
                         help="If set memvis will not convert bytes to readable ascii characters.",
                         action="store_false")
+    parser.add_argument("-f", "--full-snapshot", dest="lazy",
+                        help="If set memvis will read all mapped memory regions on every update" +
+                        " instead of only the pages around the visible window.",
+                        action="store_false")
+    parser.add_argument("-m", "--prefetch-pages", dest="prefetch_pages", type=int,
+                        help="Number of pages to read before and after the visible window.",
+                        default=DEFAULT_PREFETCH_SIZE // PAGE_SIZE)
+    parser.add_argument("-r", "--incremental", dest="incremental",
+                        help="If set memvis will only re-read pages that changed since the last update.",
+                        action="store_true")
+    parser.add_argument("-k", "--read-backend", dest="read_backend",
+                        choices=READ_BACKENDS, default=MEM_FILE_BACKEND,
+                        help="How process memory is read. 'mem' reads /proc/[pid]/mem through one open" +
+                        " file, 'vm' reads all regions with batched process_vm_readv calls," +
+                        " 'parallel' reads regions with positional reads across a pool of threads.")
+    parser.add_argument("-w", "--read-workers", dest="read_workers", type=int,
+                        help="Number of threads used by the 'parallel' read backend.",
+                        default=DEFAULT_READ_WORKERS)
+    parser.add_argument("-u", "--read-budget", dest="read_budget", type=float,
+                        help="Background read budget in MiB per second, shared by all processes." +
+                        " If not set background reads are not limited.")
+    parser.add_argument("-y", "--history-budget", dest="history_budget", type=float,
+                        help="Memory in MiB kept for past snapshots, which '[' and ']' scrub" +
+                        " through. 0 disables the history.",
+                        default=DEFAULT_HISTORY_BUDGET / 2 ** 20)
+    parser.add_argument("-a", "--sample-rate", dest="sample_rate", type=int,
+                        help="Samples per second taken of the visible window while the 'h'" +
+                        " heatmap is shown.", default=DEFAULT_SAMPLE_RATE)
+
+    return parser
+
+
+def get_dump_argument_parser():
+    parser = argparse.ArgumentParser(prog="memvis " + DUMP_COMMAND,
+                                     description="Write all readable memory of a process to a snapshot file.")
+    parser.add_argument("-p", "--pid", dest="target_pid", type=int,
+                        help="The pid of the process.", required=True)
+    parser.add_argument("-o", "--output", dest="snapshot_path",
+                        help="The snapshot file to write.", required=True)
+    parser.add_argument("-n", "--no-ptrace", dest="use_ptrace", action="store_false",
+                        help="If set then the stack pointer will " +
+                        "be read from /proc/[pid]/syscall file.")
+    parser.add_argument("-z", "--compress", dest="compress", action="store_true",
+                        help="If set region data is zlib compressed. Compressed snapshots" +
+                        " are decompressed into memory when viewed.")
+    parser.add_argument("-k", "--read-backend", dest="read_backend",
+                        choices=READ_BACKENDS, default=MEM_FILE_BACKEND,
+                        help="How process memory is read.")
+    parser.add_argument("-w", "--read-workers", dest="read_workers", type=int,
+                        help="Number of threads used by the 'parallel' read backend.",
+                        default=DEFAULT_READ_WORKERS)
+    return parser
+
+
+def get_view_argument_parser():
+    parser = argparse.ArgumentParser(prog="memvis " + VIEW_COMMAND,
+                                     description="Visualize a snapshot file written by memvis dump.")
+    parser.add_argument("snapshot_path", help="The snapshot file to open.")
+    parser.add_argument("-s", "--start-address",
+                        dest="start_address", type=convert_hex_to_int,
+                        help="Address to start visualizing from." +
+                        " If not set the stack pointer at dump time will be used.")
+    parser.add_argument("-j", "--width", dest="width", type=int,
+                        help="Window width.", default=10)
+    parser.add_argument("-i", "--height", dest="height", type=int,
+                        help="Window height.", default=26)
+    parser.add_argument("-b", "--print-bytes", dest="convert_ascii",
+                        help="If set memvis will not convert bytes to readable ascii characters.",
+                        action="store_false")
+    return parser
 
+
+def get_process_argument_parser(command, description):
+    parser = argparse.ArgumentParser(prog="memvis " + command, description=description)
+    parser.add_argument("-p", "--pid", dest="target_pid", type=int,
+                        help="The pid of the process.", required=True)
+    parser.add_argument("-k", "--read-backend", dest="read_backend",
+                        choices=READ_BACKENDS, default=MEM_FILE_BACKEND,
+                        help="How process memory is read.")
+    parser.add_argument("-w", "--read-workers", dest="read_workers", type=int,
+                        help="Number of threads used by the 'parallel' read backend.",
+                        default=DEFAULT_READ_WORKERS)
+    return parser
+
+
+def get_read_argument_parser(command=READ_COMMAND,
+                             description="Write raw process memory to standard output."):
+    parser = get_process_argument_parser(command, description)
+    parser.add_argument("-s", "--start-address", dest="start_address", type=convert_hex_to_int,
+                        help="Address to start reading from.", required=True)
+    parser.add_argument("-l", "--length", dest="length", type=convert_size,
+                        help="Number of bytes to read. Reading stops early at the end of" +
+                        " readable memory.", required=True)
+    return parser
+
+
+def get_hexdump_argument_parser():
+    parser = get_read_argument_parser(HEXDUMP_COMMAND, "Print process memory as a hex dump.")
+    parser.add_argument("-j", "--width", dest="width", type=int,
+                        help="Bytes per line.", default=HEXDUMP_WIDTH)
+    return parser
+
+
+def get_regions_argument_parser():
+    parser = get_process_argument_parser(REGIONS_COMMAND,
+                                         "Print the mapped memory regions of a process.")
+    parser.add_argument("-r", "--readable", dest="readable", action="store_true",
+                        help="If set only readable regions are printed.")
     return parser
 
 
@@ -32,6 +167,69 @@ def verify_arguments(args):
     pass
 
 
+def get_target_pids(args):
+    if not args.process_tree:
+        return args.target_pids
+    target_pids = []
+    for root_pid in args.target_pids:
+        target_pids += [pid for pid in get_process_tree(root_pid) if pid not in target_pids]
+    return target_pids
+
+
+def run_dump(arguments):
+    args = get_dump_argument_parser().parse_args(arguments)
+    memory_reader = MemoryReader(args.target_pid, args.use_ptrace, read_backend=args.read_backend,
+                                 read_workers=args.read_workers)
+    try:
+        snapshot_writer = dump_memory(memory_reader, args.snapshot_path, args.compress)
+    finally:
+        memory_reader.close()
+    print("Wrote {} regions ({} MiB stored) to {}.".format(
+        len(snapshot_writer.entries), snapshot_writer.stored_size // 2 ** 20, args.snapshot_path))
+
+
+def run_view(arguments, err):
+    args = get_view_argument_parser().parse_args(arguments)
+    sys.stderr = err
+    controller = MemvisSnapshotController(
+        args.snapshot_path, width=args.width, height=args.height,
+        start_address=args.start_address, convert_ascii=args.convert_ascii)
+    controller.start()
+
+
+def run_process_command(get_parser, arguments, write_output):
+    args = get_parser().parse_args(arguments)
+    try:
+        with open_process(args.target_pid, args.read_backend, args.read_workers) as session:
+            write_output(session, args)
+            sys.stdout.flush()
+    except ProcessSessionError as exception:
+        sys.exit("memvis: " + str(exception))
+    except BrokenPipeError:
+        # The reader of the pipe exited early, for example head.
+        sys.stdout = open(os.devnull, "w")
+
+
+def write_memory(session, args):
+    session.write_range(sys.stdout.buffer, args.start_address, args.length)
+
+
+def write_hexdump(session, args):
+    session.write_hexdump(sys.stdout, args.start_address, args.length, args.width)
+
+
+def write_regions(session, args):
+    sys.stdout.write("".join(metadata.to_maps_line() + "\n" for metadata in session.regions()
+                             if metadata.is_readable() or not args.readable))
+
+
+PROCESS_COMMANDS = {
+    READ_COMMAND: (get_read_argument_parser, write_memory),
+    HEXDUMP_COMMAND: (get_hexdump_argument_parser, write_hexdump),
+    REGIONS_COMMAND: (get_regions_argument_parser, write_regions),
+}
+
+
 def run():
     formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -42,15 +240,30 @@ def run():
     err = open("memvis.err", "a")
 
     logger.addHandler(fh)
+    if sys.argv[1:2] == [DUMP_COMMAND]:
+        return run_dump(sys.argv[2:])
+    if sys.argv[1:2] == [VIEW_COMMAND]:
+        return run_view(sys.argv[2:], err)
+    if sys.argv[1:2] and sys.argv[1] in PROCESS_COMMANDS:
+        get_parser, write_output = PROCESS_COMMANDS[sys.argv[1]]
+        return run_process_command(get_parser, sys.argv[2:], write_output)
+
     argument_parser = get_argument_parser()
     args = argument_parser.parse_args()
     verify_arguments(args)
 
     sys.stderr = err
+    read_budget = None
+    if args.read_budget is not None:
+        read_budget = int(args.read_budget * 2 ** 20)
     controller = MemvisController(
-        args.target_pid, width=args.width, height=args.height,
+        get_target_pids(args), width=args.width, height=args.height,
         start_address=args.start_address, use_ptrace=args.use_ptrace,
-        convert_ascii=args.convert_ascii)
+        convert_ascii=args.convert_ascii, lazy=args.lazy,
+        prefetch_size=args.prefetch_pages * PAGE_SIZE,
+        incremental=args.incremental, read_backend=args.read_backend,
+        read_workers=args.read_workers, read_budget=read_budget,
+        history_budget=int(args.history_budget * 2 ** 20), sample_rate=args.sample_rate)
     controller.start()
 
 
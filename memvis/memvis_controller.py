@@ -1,23 +1,77 @@
 import threading
+import functools
 from .cli import Console
+from .cli import ConsoleTarget
 from .concurrent import AtomicMemoryReference
-from .concurrent import MemoryUpdater
+from .concurrent import MemorySession
+from .concurrent import DEFAULT_HISTORY_BUDGET
+from .concurrent import DEFAULT_SAMPLE_RATE
+from .concurrent import SamplingMonitor
+from .memory import DEFAULT_PREFETCH_SIZE
+from .memory import MEM_FILE_BACKEND
+from .memory import DEFAULT_READ_WORKERS
+from .memory import SnapshotFile
+from .memory import ProcessMemorySearch
+from .memory import SnapshotMemorySearch
 
 
 class MemvisController(object):
-    def __init__(self, pid, width=26, height=10, start_address=None, use_ptrace=True, convert_ascii=True):
-        self.pid = pid
+    def __init__(self, pids, width=26, height=10, start_address=None, use_ptrace=True, convert_ascii=True,
+                 lazy=True, prefetch_size=DEFAULT_PREFETCH_SIZE, incremental=False,
+                 read_backend=MEM_FILE_BACKEND, read_workers=DEFAULT_READ_WORKERS,
+                 read_budget=None, history_budget=DEFAULT_HISTORY_BUDGET,
+                 sample_rate=DEFAULT_SAMPLE_RATE):
+        self.pids = pids
+        self.sample_rate = sample_rate
+        self.memory_session = MemorySession(
+            pids, use_ptrace, lazy=lazy, prefetch_size=prefetch_size, incremental=incremental,
+            read_backend=read_backend, read_workers=read_workers, read_budget=read_budget,
+            history_budget=history_budget)
+        self.start_address = start_address
+        self.console = Console(
+            [self.__create_console_target(pid, read_workers) for pid in pids],
+            page_height=height, page_width=width, convert_ascii=convert_ascii)
+
+    def start(self):
+        self.memory_session.start()
+        self.console.start()
+        self.memory_session.stop()
+
+    def __create_console_target(self, pid, read_workers):
+        memory_updater = self.memory_session.get_memory_updater(pid)
+        start_address = self.start_address
+        if start_address is None:
+            start_address = memory_updater.get_stack_pointer()
+        memory_search = ProcessMemorySearch(
+            pid, lambda: memory_updater.memory_reader.maps_metadata, workers=read_workers)
+        return ConsoleTarget(pid, self.memory_session.get_memory_reference(pid),
+                             start_address, memory_search,
+                             self.memory_session.get_snapshot_history(pid),
+                             functools.partial(SamplingMonitor, pid, sample_rate=self.sample_rate))
+
+
+class MemvisSnapshotController(object):
+    def __init__(self, snapshot_path, width=26, height=10, start_address=None, convert_ascii=True):
+        self.snapshot_file = SnapshotFile(snapshot_path)
         self.memory_reference = AtomicMemoryReference()
-        self.memory_updater = MemoryUpdater(
-            pid, self.memory_reference, use_ptrace)
+        memory_maps = self.snapshot_file.read_memory_maps()
+        self.memory_reference.set_memory_maps(memory_maps)
+        self.memory_search = SnapshotMemorySearch(memory_maps)
         self.start_address = start_address
         if start_address is None:
-            self.start_address = self.memory_updater.get_stack_pointer()
+            self.start_address = self.__get_default_start_address()
         self.console = Console(
-            pid, self.start_address, self.memory_reference, page_height=height, page_width=width,
-            convert_ascii=convert_ascii)
+            [ConsoleTarget(self.snapshot_file.pid, self.memory_reference, self.start_address,
+                           self.memory_search)],
+            page_height=height, page_width=width, convert_ascii=convert_ascii)
 
     def start(self):
-        self.memory_updater.start()
         self.console.start()
-        self.memory_updater.stop()
+
+    def __get_default_start_address(self):
+        if self.snapshot_file.start_address != 0:
+            return self.snapshot_file.start_address
+        address_range = self.memory_reference.get_adjacent_range(0, 0)
+        if address_range is None:
+            return 0
+        return address_range.start
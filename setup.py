@@ -5,7 +5,7 @@ setup(
     name='memvis',
     version='0.1',
     packages=find_packages(),
-    install_requires=['python-ptrace', 'prettytable'],
+    install_requires=['python-ptrace'],
     author='Mario Nitchev',
     author_email='mail@ala.bala',
     description='Memory Visualisation',
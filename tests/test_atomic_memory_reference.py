@@ -0,0 +1,131 @@
+import unittest
+from memvis.memory.memory_reader import MemoryMap
+from memvis.memory.memory_reader import AddressSpaceMetadata
+from memvis.memory.address_range import AddressRange
+from memvis.concurrent.atomic_memory_reference import AtomicMemoryReference
+from memvis.concurrent.address_range_index import AddressRangeIndex
+
+
+def create_memory_map(start, end, memory_bytes):
+    line = "{:x}-{:x} rw-p 00000000 00:00 0".format(start, end)
+    return MemoryMap(1234, AddressSpaceMetadata(line), memory_bytes)
+
+
+class TestAddressRangeIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = AddressRangeIndex([AddressRange(0x1000, 0x2000),
+                                        AddressRange(0x3000, 0x4000),
+                                        AddressRange(0x4000, 0x5000)])
+
+    def test_find_overlapping(self):
+        self.assertEqual(list(self.index.find_overlapping(0x1800, 0x3800)),
+                         [0, 1])
+
+    def test_find_overlapping_gap(self):
+        self.assertEqual(list(self.index.find_overlapping(0x2000, 0x3000)), [])
+
+    def test_find_overlapping_adjacent_ranges(self):
+        self.assertEqual(list(self.index.find_overlapping(0x3fff, 0x4001)),
+                         [1, 2])
+
+    def test_find_containing(self):
+        self.assertEqual(self.index.find_containing(0x3000), 1)
+        self.assertIsNone(self.index.find_containing(0x2000))
+
+    def test_find_adjacent_inside_range(self):
+        self.assertEqual(self.index.find_adjacent(0x3800, 1), 2)
+        self.assertEqual(self.index.find_adjacent(0x3800, -1), 0)
+
+    def test_find_adjacent_inside_gap(self):
+        self.assertEqual(self.index.find_adjacent(0x2800, 1), 1)
+        self.assertEqual(self.index.find_adjacent(0x2800, -1), 0)
+
+    def test_find_adjacent_clamps(self):
+        self.assertEqual(self.index.find_adjacent(0x0, -1), 0)
+        self.assertEqual(self.index.find_adjacent(0x4800, 1), 2)
+
+    def test_find_adjacent_empty(self):
+        self.assertIsNone(AddressRangeIndex([]).find_adjacent(0x1000, 1))
+
+
+class TestAtomicMemoryReference(unittest.TestCase):
+
+    def setUp(self):
+        self.memory_reference = AtomicMemoryReference()
+        self.first_map = create_memory_map(0x1000, 0x1004, b"\x01\x02\x03\x04")
+        self.second_map = create_memory_map(0x1008, 0x100c, b"\x05\x06\x07\x08")
+        self.memory_reference.set_memory_maps(
+            [self.second_map, self.first_map])
+
+    def test_get_range_inside_map(self):
+        index, metadata, memory_bytes = self.memory_reference.get_range(
+            0x1001, 0x1003)
+
+        self.assertEqual(index, 0)
+        self.assertIs(metadata, self.first_map.metadata)
+        self.assertEqual(memory_bytes, b"\x02\x03")
+
+    def test_get_range_across_maps(self):
+        index, metadata, memory_bytes = self.memory_reference.get_range(
+            0x1002, 0x100a)
+
+        self.assertEqual(index, 1)
+        self.assertIs(metadata, self.second_map.metadata)
+        self.assertEqual(memory_bytes, b"\x03\x04\x00\x00\x00\x00\x05\x06")
+
+    def test_get_range_unmapped(self):
+        index, metadata, memory_bytes = self.memory_reference.get_range(
+            0x2000, 0x2004)
+
+        self.assertEqual(index, 0)
+        self.assertIsNone(metadata)
+        self.assertEqual(memory_bytes, bytes(4))
+
+    def test_get_changed_ranges(self):
+        self.first_map.changed_ranges = [(0x1000, 0x1001), (0x1002, 0x1004)]
+        self.second_map.changed_ranges = [(0x1009, 0x100a)]
+        self.memory_reference.set_memory_maps([self.first_map, self.second_map])
+
+        changed_ranges = self.memory_reference.get_changed_ranges(0x1003, 0x100c)
+
+        self.assertEqual(changed_ranges, [(0x1003, 0x1004), (0x1009, 0x100a)])
+
+    def test_get_adjacent_range(self):
+        address_range = self.memory_reference.get_adjacent_range(0x1002, 1)
+
+        self.assertEqual(address_range, AddressRange(0x1008, 0x100c))
+
+    def test_set_memory_maps_publishes_new_snapshot(self):
+        snapshot = self.memory_reference.get_snapshot()
+
+        generation = self.memory_reference.set_memory_maps([self.first_map])
+
+        self.assertEqual(generation, snapshot.generation + 1)
+        self.assertEqual(self.memory_reference.get_generation(), generation)
+        self.assertEqual(len(self.memory_reference.get_snapshot()), 1)
+        self.assertEqual(len(snapshot), 2)
+        self.assertEqual(snapshot.get_range(0x1008, 0x100a)[2], b"\x05\x06")
+
+    def test_set_memory_maps_notifies_listeners(self):
+        generations = []
+        self.memory_reference.add_snapshot_listener(generations.append)
+
+        generation = self.memory_reference.set_memory_maps([self.first_map])
+
+        self.assertEqual(generations, [generation])
+
+    def test_set_viewport_notifies_listeners(self):
+        viewports = []
+        self.memory_reference.add_viewport_listener(
+            lambda start, end: viewports.append((start, end)))
+
+        self.memory_reference.set_viewport(0x1000, 0x1010)
+
+        self.assertEqual(self.memory_reference.get_viewport(),
+                         (0x1000, 0x1010))
+        self.assertEqual(viewports, [(0x1000, 0x1010)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import curses
+import unittest
+from unittest.mock import MagicMock
+from memvis.memory.memory_reader import AddressSpaceMetadata
+from memvis.cli import console_memory_table as cmt
+from memvis.cli import memory_views
+
+
+class TestConsoleMemoryTable(unittest.TestCase):
+
+    def setUp(self):
+        self.start_address = 0x1000
+        self.table = cmt.ConsoleMemoryTable(self.start_address, height=2, width=4)
+        self.metadata = AddressSpaceMetadata(
+            "1000-2000 rw-p 00000000 00:00 0 [heap]")
+        self.memory_bytes = bytearray(b"\x00\x41\x42\xff\x01\x02\x03\x04")
+        self.window = MagicMock()
+        self.window.getmaxyx.return_value = (100, 200)
+
+    def test_create_glyph_table(self):
+        glyphs = cmt.create_glyph_table(True)
+
+        self.assertEqual(glyphs[0x41].strip(), "A")
+        self.assertEqual(glyphs[0x00].strip(), "0x00")
+        self.assertEqual(glyphs[0xff].strip(), "0xff")
+        self.assertEqual(cmt.create_glyph_table(False)[0x41].strip(), "0x41")
+
+    def test_draw(self):
+        self.table.set_memory_bytes(self.start_address, self.metadata,
+                                    self.memory_bytes)
+
+        lines = self.table.draw().split("\n")
+
+        self.assertEqual(len(lines), 6)
+        self.assertEqual(lines[0], self.table.border)
+        self.assertEqual([cell.strip() for cell in lines[3].split("|")[1:-1]],
+                         ["Addresses:", "0x1000", "0x00", "A", "B", "0xff"])
+
+    def test_render_unchanged_writes_nothing(self):
+        self.table.set_memory_bytes(self.start_address, self.metadata,
+                                    self.memory_bytes)
+        self.table.render(self.window)
+        self.window.addstr.reset_mock()
+
+        self.table.set_memory_bytes(self.start_address, self.metadata,
+                                    bytes(self.memory_bytes))
+        self.table.render(self.window)
+
+        self.window.addstr.assert_not_called()
+
+    def test_render_changed_byte_writes_cell(self):
+        self.table.set_memory_bytes(self.start_address, self.metadata,
+                                    self.memory_bytes)
+        self.table.render(self.window)
+        self.window.addstr.reset_mock()
+
+        self.memory_bytes[5] = 0x43
+        self.table.set_memory_bytes(self.start_address, self.metadata,
+                                    self.memory_bytes)
+        self.table.render(self.window)
+
+        self.window.addstr.assert_called_once_with(
+            cmt.HEADER_ROWS + 1, self.table.column_offsets[3],
+            cmt.ASCII_GLYPHS[0x43], curses.A_NORMAL)
+
+    def test_render_highlights_changed_bytes(self):
+        self.table.set_memory_bytes(self.start_address, self.metadata,
+                                    self.memory_bytes)
+        self.table.render(self.window)
+        self.window.addstr.reset_mock()
+
+        self.table.set_memory_bytes(self.start_address, self.metadata,
+                                    self.memory_bytes, [(0x1005, 0x1006)])
+        self.table.render(self.window)
+
+        self.window.addstr.assert_called_once_with(
+            cmt.HEADER_ROWS + 1, self.table.column_offsets[3],
+            cmt.ASCII_GLYPHS[0x02], cmt.HIGHLIGHT)
+
+    def test_render_heat_replaces_highlights(self):
+        self.table.set_memory_bytes(self.start_address, self.metadata,
+                                    self.memory_bytes, [(0x1005, 0x1006)])
+        self.table.set_heat(bytes([0, 0, 0, 0, 0, 0, 4, 1]))
+        self.table.render(self.window)
+
+        self.window.addstr.assert_any_call(
+            cmt.HEADER_ROWS + 1, self.table.column_offsets[4],
+            cmt.ASCII_GLYPHS[0x03], cmt.HEAT_ATTRIBUTES[4])
+        self.window.addstr.assert_any_call(
+            cmt.HEADER_ROWS + 1, self.table.column_offsets[3],
+            cmt.ASCII_GLYPHS[0x02], curses.A_NORMAL)
+
+    def test_render_invalidate_redraws_frame(self):
+        self.table.set_memory_bytes(self.start_address, self.metadata,
+                                    self.memory_bytes)
+        self.table.render(self.window)
+        self.window.addstr.reset_mock()
+
+        self.table.invalidate()
+        self.table.render(self.window)
+
+        self.window.addstr.assert_any_call(0, 0, self.table.border, curses.A_NORMAL)
+
+    def test_draw_word_view_keeps_width(self):
+        table = cmt.ConsoleMemoryTable(self.start_address, height=2, width=5)
+        border = table.border
+        table.set_view(memory_views.VIEWS[1])
+        table.set_memory_bytes(self.start_address, self.metadata,
+                               self.memory_bytes + b"\x05\x06")
+
+        lines = table.draw().split("\n")
+
+        self.assertEqual(len(table.border), len(border))
+        self.assertEqual([cell.strip() for cell in lines[1].split("|")[1:-1]],
+                         ["Address Space Data", "Address", "0x0", "0x4"])
+        self.assertEqual([cell.strip() for cell in lines[3].split("|")[1:-1]],
+                         ["Addresses:", "0x1000", "0xff424100", "0x1"])
+        self.assertEqual([cell.strip() for cell in lines[4].split("|")[1:-1]][2:],
+                         ["0x05040302", "0x6"])
+
+    def test_render_word_view_highlights_whole_word(self):
+        self.table.set_view(memory_views.VIEWS[1], big_endian=True)
+        self.table.set_memory_bytes(self.start_address, self.metadata,
+                                    self.memory_bytes, [(0x1005, 0x1006)])
+        self.table.render(self.window)
+
+        self.window.addstr.assert_any_call(
+            cmt.HEADER_ROWS + 1, self.table.column_offsets[2],
+            "0x01020304".center(self.table.word_column_width), cmt.HIGHLIGHT)
+
+
+if __name__ == '__main__':
+    unittest.main()
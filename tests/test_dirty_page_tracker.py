@@ -0,0 +1,130 @@
+import array
+import unittest
+import logging
+from unittest.mock import patch, call, MagicMock
+from memvis.memory import dirty_page_tracker as dpt
+
+
+PAGE_SIZE = dpt.PAGE_SIZE
+
+
+class TestUtilities(unittest.TestCase):
+
+    def test_get_process_pagemap_path(self):
+        self.assertEqual(dpt.get_process_pagemap_path(2222),
+                         "/proc/2222/pagemap")
+
+    def test_get_process_clear_refs_path(self):
+        self.assertEqual(dpt.get_process_clear_refs_path(2222),
+                         "/proc/2222/clear_refs")
+
+    def test_merge_page_ranges(self):
+        pages = [0, PAGE_SIZE, 3 * PAGE_SIZE]
+        expected_ranges = [(0, 2 * PAGE_SIZE), (3 * PAGE_SIZE, 4 * PAGE_SIZE)]
+
+        self.assertEqual(dpt.merge_page_ranges(pages), expected_ranges)
+
+
+class TestHashPageTracker(unittest.TestCase):
+
+    def setUp(self):
+        self.address = 0x7fc981a94000
+        self.tracker = dpt.HashPageTracker()
+
+    def test_update_pages_first_read(self):
+        memory_bytes = bytes(3 * PAGE_SIZE)
+
+        changed_ranges = self.tracker.update_pages(self.address, memory_bytes)
+
+        self.assertEqual(changed_ranges,
+                         [(self.address, self.address + 3 * PAGE_SIZE)])
+
+    def test_update_pages_unchanged(self):
+        memory_bytes = bytes(3 * PAGE_SIZE)
+        self.tracker.update_pages(self.address, memory_bytes)
+
+        changed_ranges = self.tracker.update_pages(self.address, memory_bytes)
+
+        self.assertEqual(changed_ranges, [])
+
+    def test_forget_range(self):
+        memory_bytes = bytes(2 * PAGE_SIZE)
+        self.tracker.update_pages(self.address, memory_bytes)
+
+        self.tracker.forget_range(self.address, self.address + PAGE_SIZE)
+        changed_ranges = self.tracker.update_pages(self.address, memory_bytes)
+
+        self.assertEqual(changed_ranges,
+                         [(self.address, self.address + PAGE_SIZE)])
+
+    def test_update_pages_changed_page(self):
+        memory_bytes = bytearray(3 * PAGE_SIZE)
+        self.tracker.update_pages(self.address, memory_bytes)
+        memory_bytes[PAGE_SIZE + 10] = 1
+
+        changed_ranges = self.tracker.update_pages(self.address, memory_bytes)
+
+        self.assertEqual(changed_ranges, [(self.address + PAGE_SIZE,
+                                           self.address + 2 * PAGE_SIZE)])
+
+    def test_get_dirty_ranges_reads_everything(self):
+        self.assertEqual(self.tracker.get_dirty_ranges(0, PAGE_SIZE),
+                         [(0, PAGE_SIZE)])
+
+
+class TestSoftDirtyPageTracker(unittest.TestCase):
+
+    def __init__(self, *args, **kwargs):
+        super(TestSoftDirtyPageTracker, self).__init__(*args, **kwargs)
+        logging.disable(logging.CRITICAL)
+
+    def setUp(self):
+        self.target_pid = 1234
+        self.address = 0x7fc981a94000
+        self.tracker = dpt.SoftDirtyPageTracker(self.target_pid)
+
+    @patch('builtins.open', return_value=MagicMock())
+    def test_get_dirty_ranges(self, context_manager):
+        entries = array.array("Q", [dpt.SOFT_DIRTY_BIT, 0,
+                                    dpt.SOFT_DIRTY_BIT, dpt.SOFT_DIRTY_BIT])
+        pagemap_file = MagicMock()
+        context_manager().__enter__.return_value = pagemap_file
+        pagemap_file.read.return_value = entries.tobytes()
+
+        dirty_ranges = self.tracker.get_dirty_ranges(
+            self.address, self.address + 4 * PAGE_SIZE)
+
+        self.assertEqual(dirty_ranges, [
+            (self.address, self.address + PAGE_SIZE),
+            (self.address + 2 * PAGE_SIZE, self.address + 4 * PAGE_SIZE)])
+        open.assert_has_calls([call("/proc/1234/pagemap", "rb")])
+        pagemap_file.seek.assert_called_once_with(
+            self.address // PAGE_SIZE * dpt.PAGEMAP_ENTRY_SIZE)
+        pagemap_file.read.assert_called_once_with(4 * dpt.PAGEMAP_ENTRY_SIZE)
+
+    @patch('builtins.open', return_value=MagicMock())
+    def test_get_dirty_ranges_IOError(self, context_manager):
+        open.side_effect = IOError()
+
+        self.assertRaises(dpt.DirtyPageTrackerError, self.tracker.get_dirty_ranges,
+                          self.address, self.address + PAGE_SIZE)
+
+    @patch('builtins.open', return_value=MagicMock())
+    def test_reset(self, context_manager):
+        clear_refs_file = MagicMock()
+        context_manager().__enter__.return_value = clear_refs_file
+
+        self.tracker.reset()
+
+        open.assert_has_calls([call("/proc/1234/clear_refs", "w")])
+        clear_refs_file.write.assert_called_once_with(dpt.CLEAR_SOFT_DIRTY)
+
+    @patch('builtins.open', return_value=MagicMock())
+    def test_reset_IOError(self, context_manager):
+        open.side_effect = IOError()
+
+        self.assertRaises(dpt.DirtyPageTrackerError, self.tracker.reset)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import ctypes
+import ctypes.util
+import unittest
+from memvis.memory.memory_reader import AddressSpaceMetadata
+from memvis.memory import elf_symbols as es
+
+
+class TestElfSymbolTable(unittest.TestCase):
+
+    def setUp(self):
+        self.symbol_table = es.ElfSymbolTable(
+            [(0x100, 0x20, "_IO_printf"), (0x100, 0x20, "printf"), (0x200, 0, "marker")],
+            [(0x1000, 0x100, 0x400)])
+
+    def test_find_symbol(self):
+        self.assertEqual(self.symbol_table.find_symbol(0x100), ("printf", 0))
+        self.assertEqual(self.symbol_table.find_symbol(0x105), ("printf", 5))
+        self.assertEqual(self.symbol_table.find_symbol(0x200), ("marker", 0))
+        self.assertIsNone(self.symbol_table.find_symbol(0x120))
+        self.assertIsNone(self.symbol_table.find_symbol(0x50))
+
+    def test_get_virtual_address(self):
+        self.assertEqual(self.symbol_table.get_virtual_address(0x1005), 0x105)
+        self.assertIsNone(self.symbol_table.get_virtual_address(0x10))
+
+    def test_not_elf(self):
+        with self.assertRaises(es.ElfSymbolError):
+            es.ElfFile(b"not an elf file")
+
+
+class TestElfSymbolCache(unittest.TestCase):
+
+    def test_symbolize_libc_function(self):
+        library_path = ctypes.util.find_library("c")
+        if library_path is None:
+            self.skipTest("libc is not available.")
+        libc = ctypes.CDLL(library_path)
+        address = ctypes.cast(libc.printf, ctypes.c_void_p).value
+        with open("/proc/self/maps") as maps_file:
+            metadata = [AddressSpaceMetadata(line) for line in maps_file]
+        metadata = next(metadata for metadata in metadata
+                        if metadata.address_range.start <= address < metadata.address_range.end)
+        symbol_cache = es.ElfSymbolCache()
+
+        self.assertIn(symbol_cache.symbolize(metadata, address), ("printf", "_IO_printf"))
+        symbol_cache.symbolize(metadata, address)
+        self.assertEqual(len(symbol_cache), 1)
+
+    def test_unreadable_file_is_cached_empty(self):
+        metadata = AddressSpaceMetadata(
+            "1000-2000 r-xp 00000000 08:01 42 /nonexistent/library.so")
+        symbol_cache = es.ElfSymbolCache()
+
+        self.assertIsNone(symbol_cache.symbolize(metadata, 0x1000))
+        self.assertEqual(len(symbol_cache.get_symbol_table(metadata)), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
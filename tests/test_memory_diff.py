@@ -0,0 +1,80 @@
+import unittest
+from memvis.memory import memory_diff as md
+from memvis.memory.memory_reader import MemoryMap
+from memvis.memory.memory_reader import AddressSpaceMetadata
+from memvis.memory.memory_reader import UNREADABLE_MEMORY
+
+
+PAGE_SIZE = md.PAGE_SIZE
+
+
+class TestMemoryDiff(unittest.TestCase):
+
+    def setUp(self):
+        self.address = 0x10000
+        self.old_bytes = bytes(4 * PAGE_SIZE)
+        self.new_bytes = bytearray(self.old_bytes)
+        self.metadata = AddressSpaceMetadata("{:x}-{:x} rw-p 00000000 00:00 0".format(
+            self.address, self.address + 4 * PAGE_SIZE))
+
+    def test_diff_memory_bytes_unchanged(self):
+        self.assertEqual(md.diff_memory_bytes(self.old_bytes, self.new_bytes,
+                                              self.address), [])
+
+    def test_diff_memory_bytes_changed_runs(self):
+        self.new_bytes[10:13] = b"abc"
+        self.new_bytes[PAGE_SIZE + 1] = 0x01
+
+        changed_ranges = md.diff_memory_bytes(self.old_bytes, self.new_bytes, self.address)
+
+        self.assertEqual(changed_ranges, [(self.address + 10, self.address + 13),
+                                          (self.address + PAGE_SIZE + 1,
+                                           self.address + PAGE_SIZE + 2)])
+
+    def test_diff_memory_bytes_merges_across_pages(self):
+        self.new_bytes[PAGE_SIZE - 1:PAGE_SIZE + 1] = b"\x01\x02"
+
+        changed_ranges = md.diff_memory_bytes(self.old_bytes, self.new_bytes, self.address)
+
+        self.assertEqual(changed_ranges, [(self.address + PAGE_SIZE - 1,
+                                           self.address + PAGE_SIZE + 1)])
+
+    def test_diff_memory_bytes_only_candidate_ranges(self):
+        self.new_bytes[10] = 0x01
+        self.new_bytes[2 * PAGE_SIZE + 10] = 0x01
+
+        changed_ranges = md.diff_memory_bytes(
+            self.old_bytes, self.new_bytes, self.address,
+            [(self.address + 2 * PAGE_SIZE, self.address + 3 * PAGE_SIZE)])
+
+        self.assertEqual(changed_ranges, [(self.address + 2 * PAGE_SIZE + 10,
+                                           self.address + 2 * PAGE_SIZE + 11)])
+
+    def test_diff_memory_bytes_memoryview(self):
+        self.new_bytes[5] = 0x01
+
+        changed_ranges = md.diff_memory_bytes(self.old_bytes, memoryview(self.new_bytes),
+                                              self.address)
+
+        self.assertEqual(changed_ranges, [(self.address + 5, self.address + 6)])
+
+    def test_diff_memory_map(self):
+        self.new_bytes[5] = 0x01
+        previous_map = MemoryMap(1234, self.metadata, self.old_bytes)
+
+        changed_ranges = md.diff_memory_map(
+            previous_map, MemoryMap(1234, self.metadata, self.new_bytes))
+
+        self.assertEqual(changed_ranges, [(self.address + 5, self.address + 6)])
+
+    def test_diff_memory_map_not_comparable(self):
+        previous_map = MemoryMap(1234, self.metadata, UNREADABLE_MEMORY)
+
+        changed_ranges = md.diff_memory_map(
+            previous_map, MemoryMap(1234, self.metadata, self.new_bytes))
+
+        self.assertIsNone(changed_ranges)
+
+
+if __name__ == '__main__':
+    unittest.main()
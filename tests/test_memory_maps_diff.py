@@ -0,0 +1,44 @@
+import unittest
+from memvis.memory.memory_reader import AddressSpaceMetadata
+from memvis.memory.memory_maps_diff import diff_memory_maps
+
+
+class TestMemoryMapsDiff(unittest.TestCase):
+
+    def setUp(self):
+        self.heap = AddressSpaceMetadata(
+            "1000-2000 rw-p 00000000 00:00 0 [heap]")
+        self.library = AddressSpaceMetadata(
+            "3000-4000 r-xp 00000000 08:06 685615 /lib/libc.so")
+        self.anonymous = AddressSpaceMetadata(
+            "5000-6000 rw-p 00000000 00:00 0")
+
+    def test_diff_memory_maps_unchanged(self):
+        maps_diff = diff_memory_maps([self.heap, self.library],
+                                     [self.heap, self.library])
+
+        self.assertFalse(maps_diff.has_changes())
+        self.assertEqual(maps_diff.unchanged, [self.heap, self.library])
+
+    def test_diff_memory_maps_added_and_removed(self):
+        maps_diff = diff_memory_maps([self.heap, self.library],
+                                     [self.heap, self.anonymous])
+
+        self.assertTrue(maps_diff.has_changes())
+        self.assertEqual(maps_diff.added, [self.anonymous])
+        self.assertEqual(maps_diff.removed, [self.library])
+        self.assertEqual(maps_diff.unchanged, [self.heap])
+
+    def test_diff_memory_maps_changed(self):
+        grown_heap = AddressSpaceMetadata(
+            "1000-3000 rw-p 00000000 00:00 0 [heap]")
+
+        maps_diff = diff_memory_maps([self.heap], [grown_heap])
+
+        self.assertEqual(maps_diff.changed, [(self.heap, grown_heap)])
+        self.assertEqual(maps_diff.added, [])
+        self.assertEqual(maps_diff.removed, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
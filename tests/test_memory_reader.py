@@ -1,9 +1,11 @@
 import unittest
 import logging
-from memvis import memory_reader as mr
+from memvis.memory import memory_reader as mr
 from unittest.mock import patch, call, MagicMock
 from ptrace.debugger.process import ProcessError
-from memvis.stack_pointer_reader import StackPointerReaderError
+from memvis.memory.stack_pointer_reader import StackPointerReaderError
+from memvis.memory.read_backend import ReadResult
+from memvis.memory.shared_mappings import SharedMappingCache
 
 
 class TestUtilities(unittest.TestCase):
@@ -59,7 +61,8 @@ class TestAddressSpaceMetadata(unittest.TestCase):
                                     offset, device, inode, path_name])
         metadata = mr.AddressSpaceMetadata(memory_map_line)
 
-        self.assertEqual(metadata.address_range, address_range)
+        self.assertEqual(metadata.address_range, mr.AddressRange(
+            mr.convert_hex_to_int(address_range[0]), mr.convert_hex_to_int(address_range[1])))
         self.assertEqual(metadata.memory_size, memory_size)
         self.assertEqual(metadata.permissions, permissions)
         self.assertEqual(metadata.offset, mr.convert_hex_to_int(offset))
@@ -76,12 +79,163 @@ class TestAddressSpaceMetadata(unittest.TestCase):
         invalid_line = "invalid line pattern"
         self.assertRaises(ValueError, mr.AddressSpaceMetadata, invalid_line)
 
+    def test_add_address_space_without_path_name(self):
+        memory_map_line = "7fc981a94000-7fc981a95000 rw-p 00000000 00:00 0\n"
+        metadata = mr.AddressSpaceMetadata(memory_map_line)
+
+        self.assertEqual(metadata.path_name, "")
+        self.assertEqual(metadata.inode, "0")
+
+    def test_add_address_space_path_name_with_spaces(self):
+        memory_map_line = "7fc981a94000-7fc981a95000 r--p 00000000 08:06 685615" + \
+            "                     /tmp/file name (deleted)\n"
+        metadata = mr.AddressSpaceMetadata(memory_map_line)
+
+        self.assertEqual(metadata.path_name, "/tmp/file name (deleted)")
+
+    def test_add_address_space_failure_invalid_permissions(self):
+        invalid_line = "7fc981a94000-7fc981a95000 rw 00000000 00:00 0"
+        self.assertRaises(ValueError, mr.AddressSpaceMetadata, invalid_line)
+
+    def test_parse_memory_maps(self):
+        memory_map_lines = ["7fc981a94000-7fc981a95000 r--p 00000000 08:06 685615 /bin/a\n",
+                            "7fc981a95000-7fc981a96000 rw-p 00000000 00:00 0\n"]
+        maps_metadata = mr.parse_memory_maps(memory_map_lines)
+
+        self.assertEqual([metadata.path_name for metadata in maps_metadata],
+                         ["/bin/a", ""])
+
     def __get_memory_size(self, address_range):
         start_address = mr.convert_hex_to_int(address_range[0])
         end_address = mr.convert_hex_to_int(address_range[1])
         return end_address - start_address
 
 
+class TestMemoryMap(unittest.TestCase):
+
+    def setUp(self):
+        memory_map_line = "7fc981a94000-7fc981a95000 rw-p 00000000 00:00 0 [heap]"
+        self.metadata = mr.AddressSpaceMetadata(memory_map_line)
+        self.address = mr.convert_hex_to_int("7fc981a94100")
+
+    def test_get_range_inside_loaded_window(self):
+        memory_map = mr.MemoryMap(
+            1234, self.metadata, bytes([1, 2, 3, 4]), self.address)
+
+        memory_slice = memory_map.get_range(self.address + 1, self.address + 3)
+
+        self.assertIsInstance(memory_slice, memoryview)
+        self.assertEqual(memory_slice, bytes([2, 3]))
+
+    def test_get_range_pads_unloaded_bytes(self):
+        memory_map = mr.MemoryMap(
+            1234, self.metadata, bytes([1, 2, 3, 4]), self.address)
+
+        self.assertEqual(memory_map.get_range(
+            self.address - 2, self.address + 6), bytes([0, 0, 1, 2, 3, 4, 0, 0]))
+
+    def test_get_range_not_loaded(self):
+        memory_map = mr.MemoryMap(1234, self.metadata, b"")
+
+        self.assertEqual(memory_map.get_range(
+            self.address, self.address + 3), bytes(3))
+
+    def test_get_range_unreadable(self):
+        memory_map = mr.MemoryMap(1234, self.metadata, mr.UNREADABLE_MEMORY)
+
+        self.assertTrue(memory_map.is_unreadable())
+        self.assertEqual(memory_map.get_range(
+            self.address, self.address + 3), bytes(3))
+
+
+class TestMemoryReadPass(unittest.TestCase):
+
+    def setUp(self):
+        self.read_backend = MagicMock()
+        self.read_backend.read_ranges.side_effect = lambda read_ranges: [
+            ReadResult(address, bytes([0x01]) * size) for address, size in read_ranges]
+        self.regions = [self.__create_region(0x1000, 0x3000),
+                        self.__create_region(0x5000, 0x6000),
+                        self.__create_region(0x8000, 0x9000)]
+
+    def test_read_next_batch(self):
+        read_pass = mr.MemoryReadPass(1234, self.read_backend, None, self.regions)
+
+        self.assertTrue(read_pass.read_next(0x1000))
+
+        self.read_backend.read_ranges.assert_called_once_with([(0x1000, 0x2000)])
+        memory_maps = read_pass.get_memory_maps()
+        self.assertEqual(memory_maps[0].memory_bytes, bytes([0x01]) * 0x2000)
+        self.assertEqual(len(memory_maps[1].memory_bytes), 0)
+
+    def test_read_overlapping_first(self):
+        read_pass = mr.MemoryReadPass(1234, self.read_backend, None, self.regions)
+
+        read_pass.read_overlapping(0x5800, 0x5900)
+        read_pass.read_all()
+
+        self.assertEqual(self.read_backend.read_ranges.call_args_list,
+                         [call([(0x5000, 0x1000)]),
+                          call([(0x1000, 0x2000), (0x8000, 0x1000)])])
+        self.assertTrue(read_pass.is_done())
+
+    def test_cancel_marks_unread_regions_stale(self):
+        page_tracker = MagicMock()
+        page_tracker.get_dirty_ranges.side_effect = lambda start, end: [(start, start + 1)]
+        previous_maps = [mr.MemoryMap(1234, metadata, bytes(end - start), start)
+                         for metadata, start, end in self.regions]
+        stale_regions = set()
+        read_pass = mr.MemoryReadPass(1234, self.read_backend, page_tracker, self.regions,
+                                      previous_maps, stale_regions)
+
+        read_pass.read_next(1)
+        read_pass.cancel()
+
+        self.assertEqual(stale_regions, {0x5000, 0x8000})
+        self.assertIs(read_pass.get_memory_maps()[1].memory_bytes,
+                      previous_maps[1].memory_bytes)
+        next_pass = mr.MemoryReadPass(1234, self.read_backend, page_tracker, self.regions,
+                                      previous_maps, stale_regions)
+        self.assertEqual(next_pass.dirty_ranges,
+                         [[(0x1000, 0x1001)], None, None])
+        self.assertEqual(stale_regions, set())
+
+    def test_shared_mappings_read_once(self):
+        shared_mappings = SharedMappingCache()
+        library = mr.AddressSpaceMetadata("1000-3000 r--p 00000000 08:01 42 /lib/libc.so")
+        other_library = mr.AddressSpaceMetadata("7000-9000 r--p 00000000 08:01 42 /lib/libc.so")
+        first_pass = mr.MemoryReadPass(1, self.read_backend, None, [(library, 0x1000, 0x3000)],
+                                       shared_mappings=shared_mappings,
+                                       shareable_regions={0x1000})
+        second_pass = mr.MemoryReadPass(2, self.read_backend, None,
+                                        [(other_library, 0x7000, 0x9000)],
+                                        shared_mappings=shared_mappings,
+                                        shareable_regions={0x7000})
+
+        first_pass.read_all()
+        second_pass.read_all()
+
+        self.read_backend.read_ranges.assert_has_calls([call([(0x1000, 0x2000)]), call([])])
+        self.assertIs(second_pass.get_memory_maps()[0].memory_bytes,
+                      first_pass.get_memory_maps()[0].memory_bytes)
+        self.assertEqual(shared_mappings.saved_size, 0x2000)
+
+    def test_shared_mappings_not_shareable(self):
+        shared_mappings = SharedMappingCache()
+        library = mr.AddressSpaceMetadata("1000-3000 r--p 00000000 08:01 42 /lib/libc.so")
+        read_pass = mr.MemoryReadPass(1, self.read_backend, None, [(library, 0x1000, 0x3000)],
+                                      shared_mappings=shared_mappings)
+
+        read_pass.read_all()
+
+        self.assertEqual(len(shared_mappings), 0)
+
+    def __create_region(self, start, end):
+        metadata = mr.AddressSpaceMetadata(
+            "{:x}-{:x} rw-p 00000000 00:00 0".format(start, end))
+        return metadata, start, end
+
+
 class TestMemoryReader(unittest.TestCase):
 
     def __init__(self, *args, **kwargs):
@@ -95,10 +249,11 @@ class TestMemoryReader(unittest.TestCase):
         self.mem_path = "/proc/" + pid_string + "/mem"
         self.syscall_path = "/proc/" + pid_string + "/syscall"
         self.memory_map_line = "7fc981a94000-7fc981a95000 rw-- 00026000 08:06 685615 [stack]"
+        self.heap_map_line = "7fc981a94000-7fc981a95000 rw-p 00000000 00:00 0 [heap]"
         self.memory_size = 4096
         self.memory_bytes = bytes([0x06, 0x05, 0x04, 0x03, 0x02, 0x01])
         self.seek_offset = mr.convert_hex_to_int("7fc981a94000")
-        self.stack_pointer = "0x7fc981a940ff"
+        self.stack_pointer = 0x7fc981a940ff
 
     @patch('builtins.open', return_value=MagicMock())
     def test_MemoryReader(self, context_manager):
@@ -134,6 +289,7 @@ class TestMemoryReader(unittest.TestCase):
 
     @patch('builtins.open', return_value=MagicMock())
     def test_read_memory(self, context_manager):
+        self.memory_map_line = self.heap_map_line
         reader = self.__initialize_reader(context_manager)
 
         mem_file = self.__mock_mem_file_object(context_manager)
@@ -144,6 +300,7 @@ class TestMemoryReader(unittest.TestCase):
 
     @patch('builtins.open', return_value=MagicMock())
     def test_read_memory_open_IOError(self, context_manager):
+        self.memory_map_line = self.heap_map_line
         reader = self.__initialize_reader(context_manager)
 
         open.side_effect = IOError()
@@ -152,6 +309,7 @@ class TestMemoryReader(unittest.TestCase):
 
     @patch('builtins.open', return_value=MagicMock())
     def test_read_memory_mem_file_seek_IOError(self, context_manager):
+        self.memory_map_line = self.heap_map_line
         reader = self.__initialize_reader(context_manager)
 
         mem_file = self.__mock_mem_file_object(context_manager)
@@ -161,17 +319,133 @@ class TestMemoryReader(unittest.TestCase):
 
     @patch('builtins.open', return_value=MagicMock())
     def test_read_memory_mem_file_read_IOError(self, context_manager):
+        self.memory_map_line = self.heap_map_line
         reader = self.__initialize_reader(context_manager)
 
         mem_file = self.__mock_mem_file_object(context_manager)
-        mem_file().seek.side_effect = IOError()
+        mem_file().read.side_effect = IOError()
         memory_maps = reader.read_memory()
         self.__assert_empty_memory_map(memory_maps[0])
 
+    @patch('builtins.open', return_value=MagicMock())
+    def test_read_memory_window(self, context_manager):
+        self.memory_map_line = self.heap_map_line
+        reader = self.__initialize_reader(context_manager)
+
+        mem_file = self.__mock_mem_file_object(context_manager)
+        memory_maps = reader.read_memory_window(
+            0x7fc981a94100, 0x7fc981a94200)
+
+        self.__assert_memory_map(memory_maps[0])
+        self.assertEqual(memory_maps[0].address, self.seek_offset)
+        self.__verify_read_mem_file_interactions(context_manager, mem_file)
+
+    @patch('builtins.open', return_value=MagicMock())
+    def test_read_memory_window_outside_mapping(self, context_manager):
+        self.memory_map_line = self.heap_map_line
+        reader = self.__initialize_reader(context_manager)
+
+        mem_file = self.__mock_mem_file_object(context_manager)
+        memory_maps = reader.read_memory_window(
+            0x7fc981aa4000, 0x7fc981aa4100, mr.PAGE_SIZE)
+
+        self.assertEqual(len(memory_maps[0].memory_bytes), 0)
+        self.assertFalse(memory_maps[0].is_unreadable())
+        mem_file().read.assert_not_called()
+
+    @patch('builtins.open', return_value=MagicMock())
+    def test_read_memory_window_read_IOError(self, context_manager):
+        self.memory_map_line = self.heap_map_line
+        reader = self.__initialize_reader(context_manager)
+
+        mem_file = self.__mock_mem_file_object(context_manager)
+        mem_file().read.side_effect = IOError()
+        memory_maps = reader.read_memory_window(
+            0x7fc981a94100, 0x7fc981a94200)
+
+        self.assertTrue(memory_maps[0].is_unreadable())
+
+    @patch('memvis.memory.memory_reader.create_page_tracker')
+    @patch('builtins.open', return_value=MagicMock())
+    def test_read_memory_window_incremental(self, context_manager, create_page_tracker):
+        self.memory_map_line = self.heap_map_line
+        page_tracker = MagicMock()
+        page_tracker.get_dirty_ranges.return_value = [
+            (self.seek_offset + 2, self.seek_offset + 4)]
+        page_tracker.update_pages.return_value = [
+            (self.seek_offset + 2, self.seek_offset + 3)]
+        create_page_tracker.return_value = page_tracker
+        self.__mock_maps_file_object(context_manager)
+        reader = mr.MemoryReader(self.target_pid, incremental=True)
+        metadata = mr.AddressSpaceMetadata(self.memory_map_line)
+        previous_map = mr.MemoryMap(self.target_pid, metadata,
+                                    bytes(self.memory_size), self.seek_offset)
+
+        mem_file = self.__mock_mem_file_object(context_manager)
+        memory_maps = reader.read_memory_window(
+            0x7fc981a94100, 0x7fc981a94200,
+            previous_memory_maps=[previous_map])
+
+        expected_bytes = bytearray(self.memory_size)
+        expected_bytes[2] = self.memory_bytes[0]
+        self.assertEqual(memory_maps[0].memory_bytes, expected_bytes)
+        self.assertEqual(memory_maps[0].changed_ranges,
+                         [(self.seek_offset + 2, self.seek_offset + 3)])
+        page_tracker.reset.assert_called_once_with()
+        mem_file().seek.assert_called_once_with(self.seek_offset + 2)
+        mem_file().read.assert_called_once_with(2)
+
+    @patch('builtins.open', return_value=MagicMock())
+    def test_read_memory_reuses_immutable_mapping(self, context_manager):
+        self.memory_map_line = "7fc981a94000-7fc981a95000 r--p 00000000 08:06 685615 /lib/libc.so"
+        reader = self.__initialize_reader(context_manager)
+        metadata = mr.AddressSpaceMetadata(self.memory_map_line)
+        previous_bytes = bytes(self.memory_size)
+        previous_map = mr.MemoryMap(self.target_pid, metadata,
+                                    previous_bytes, self.seek_offset)
+
+        mem_file = self.__mock_mem_file_object(context_manager)
+        memory_maps = reader.read_memory(previous_memory_maps=[previous_map])
+
+        self.assertIs(memory_maps[0].memory_bytes, previous_bytes)
+        self.assertEqual(memory_maps[0].changed_ranges, [])
+        mem_file().read.assert_not_called()
+
+    @patch('builtins.open', return_value=MagicMock())
+    def test_read_memory_rereads_changed_mapping(self, context_manager):
+        reader = self.__initialize_reader(context_manager)
+        previous_line = "7fc981a94000-7fc981a95000 r--p 00000000 08:06 685616 /lib/libc.so"
+        previous_map = mr.MemoryMap(self.target_pid,
+                                    mr.AddressSpaceMetadata(previous_line),
+                                    bytes(self.memory_size), self.seek_offset)
+
+        self.memory_map_line = "7fc981a94000-7fc981a95000 r--p 00000000 08:06 685615 /lib/libc.so"
+        self.__mock_maps_file_object(context_manager)
+        reader.refresh_memory_map_metadata()
+        mem_file = self.__mock_mem_file_object(context_manager)
+        memory_maps = reader.read_memory(previous_memory_maps=[previous_map])
+
+        self.__assert_memory_map(memory_maps[0])
+        mem_file().read.assert_called_once_with(self.memory_size)
+
+    @patch('builtins.open', return_value=MagicMock())
+    def test_refresh_memory_map_metadata(self, context_manager):
+        self.memory_map_line = self.heap_map_line
+        reader = self.__initialize_reader(context_manager)
+
+        self.memory_map_line = "7fc981a96000-7fc981a97000 rw-p 00000000 00:00 0"
+        self.__mock_maps_file_object(context_manager)
+        maps_diff = reader.refresh_memory_map_metadata()
+
+        self.assertTrue(maps_diff.has_changes())
+        self.assertEqual(maps_diff.added, reader.maps_metadata)
+        self.assertEqual(maps_diff.removed,
+                         [mr.AddressSpaceMetadata(self.heap_map_line)])
+
     @patch('builtins.open', return_value=MagicMock())
     def test_read_current_call_stack(self, context_manager):
         stack_pointer_reader = self.__mock_stack_pointer_reader()
-        self.seek_offset = mr.convert_hex_to_int(self.stack_pointer)
+        self.seek_offset = self.stack_pointer
         self.memory_size = 3841
         reader = self.__initialize_reader(
             context_manager, stack_pointer_reader)
@@ -181,7 +455,7 @@ class TestMemoryReader(unittest.TestCase):
         actual_stack_pointer, memory_map = reader.read_current_call_stack()
 
         self.assertEqual(actual_stack_pointer, self.stack_pointer)
-        self.__assert_memory_map(memory_map)
+        self.__assert_memory_map(memory_map, self.stack_pointer)
         self.__verify_stack_pointer_reader_interaction(stack_pointer_reader)
         self.__verify_read_mem_file_interactions(context_manager, file)
 
@@ -229,14 +503,15 @@ class TestMemoryReader(unittest.TestCase):
 
     def __initialize_reader(self, context_manager, stack_pointer_reader=None):
         maps_file = self.__mock_maps_file_object(context_manager)
-        reader = mr.MemoryReader(self.target_pid, stack_pointer_reader)
+        reader = mr.MemoryReader(
+            self.target_pid, stack_pointer_reader=stack_pointer_reader)
         self.__verify_read_maps_file_interactions(context_manager, maps_file)
 
         return reader
 
     def __mock_mem_file_object(self, context_manager):
         mocked_file = MagicMock()
-        context_manager().__enter__.return_value = mocked_file()
+        context_manager.return_value = mocked_file()
         mocked_file().read.return_value = self.memory_bytes
 
         return mocked_file
@@ -254,23 +529,25 @@ class TestMemoryReader(unittest.TestCase):
 
         return stack_pointer_reader
 
-    def __assert_memory_map(self, actual_memory_map):
+    def __assert_memory_map(self, actual_memory_map, start_address=None):
         expected_metadata = mr.AddressSpaceMetadata(self.memory_map_line)
+        if start_address is not None:
+            expected_metadata.address_range = mr.AddressRange(
+                start_address, expected_metadata.address_range.end)
+            expected_metadata.update_memory_size()
         self.assertEqual(actual_memory_map.metadata, expected_metadata)
         self.assertEqual(actual_memory_map.memory_bytes, self.memory_bytes)
 
     def __assert_empty_memory_map(self, actual_memory_map):
         expected_metadata = mr.AddressSpaceMetadata(self.memory_map_line)
         self.assertEqual(actual_memory_map.metadata, expected_metadata)
-        self.assertEqual(actual_memory_map.memory_bytes, bytes(0))
+        self.assertTrue(actual_memory_map.is_unreadable())
 
     def __verify_read_mem_file_interactions(self, context_manager, mem_file):
-        open_calls = [call(self.mem_path, "rb")]
+        open_calls = [call(self.mem_path, "rb", buffering=0)]
         open.assert_has_calls(open_calls)
         mem_file().seek.assert_called_once_with(self.seek_offset)
         mem_file().read.assert_called_once_with(self.memory_size)
-        context_manager().__exit__.assert_has_calls([call(None, None, None),
-                                                     call(None, None, None)])
 
     def __verify_read_maps_file_interactions(self, context_manager, maps_file):
         open.assert_has_calls([call(self.maps_path)])
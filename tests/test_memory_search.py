@@ -0,0 +1,90 @@
+import os
+import ctypes
+import struct
+import unittest
+from memvis.memory import memory_search as ms
+from memvis.memory.memory_reader import MemoryMap
+from memvis.memory.memory_reader import AddressSpaceMetadata
+from memvis.memory.memory_reader import UNREADABLE_MEMORY
+
+
+def create_memory_map(address, memory_bytes):
+    metadata = AddressSpaceMetadata("{:x}-{:x} rw-p 00000000 00:00 0".format(
+        address, address + len(memory_bytes)))
+    return MemoryMap(1, metadata, memory_bytes, address)
+
+
+class TestMemorySearch(unittest.TestCase):
+
+    def test_parse_search_query_text(self):
+        self.assertEqual(ms.parse_search_query("ab"), [b"ab", b"a\x00b\x00"])
+
+    def test_parse_search_query_hex(self):
+        self.assertEqual(ms.parse_search_query("x:de ad"), [b"\xde\xad"])
+
+    def test_parse_search_query_pointer(self):
+        self.assertEqual(ms.parse_search_query("p:0x1000"), [struct.pack("<Q", 0x1000)])
+
+    def test_parse_search_query_string_prefix(self):
+        self.assertEqual(ms.parse_search_query("s:x:1")[0], b"x:1")
+
+    def test_parse_search_query_empty(self):
+        self.assertRaises(ValueError, ms.parse_search_query, "")
+
+    def test_get_search_chunks_overlap(self):
+        chunks = ms.get_search_chunks([(0, 10)], 4, 2)
+
+        self.assertEqual(chunks, [(0, 6, 4), (4, 10, 8), (8, 10, 10)])
+
+    def test_search_finds_multiple_patterns(self):
+        memory_bytes = bytearray(100)
+        memory_bytes[10:13] = b"abc"
+        memory_bytes[50:52] = b"xy"
+        memory_search = ms.SnapshotMemorySearch(
+            [create_memory_map(0x1000, bytes(memory_bytes))], workers=2)
+
+        matches = memory_search.search([b"abc", b"xy"])
+
+        self.assertEqual(matches, [ms.SearchMatch(0x100a, 3), ms.SearchMatch(0x1032, 2)])
+
+    def test_search_across_chunk_boundary_once(self):
+        memory_bytes = bytearray(64)
+        memory_bytes[14:18] = b"abcd"
+        memory_bytes[16:18] = b"cd"
+        memory_search = ms.SnapshotMemorySearch(
+            [create_memory_map(0x1000, bytes(memory_bytes))], chunk_size=16)
+
+        matches = memory_search.search([b"abcd"])
+
+        self.assertEqual(matches, [ms.SearchMatch(0x100e, 4)])
+
+    def test_search_skips_unreadable_maps(self):
+        memory_maps = [create_memory_map(0x1000, b"needle"),
+                       create_memory_map(0x2000, UNREADABLE_MEMORY),
+                       create_memory_map(0x3000, b"..needle")]
+        memory_search = ms.SnapshotMemorySearch(memory_maps)
+
+        matches = memory_search.search([b"needle"])
+
+        self.assertEqual([match.address for match in matches], [0x1000, 0x3002])
+
+    def test_search_limits_matches(self):
+        memory_search = ms.SnapshotMemorySearch(
+            [create_memory_map(0x1000, b"a" * 100)], chunk_size=16, max_matches=5)
+
+        matches = memory_search.search([b"a"])
+
+        self.assertEqual([match.address for match in matches],
+                         [0x1000, 0x1001, 0x1002, 0x1003, 0x1004])
+
+    def test_process_search_finds_own_buffer(self):
+        needle = b"memvis-search-needle-" + os.urandom(8).hex().encode("ascii")
+        buffer = ctypes.create_string_buffer(needle)
+        buffer_address = ctypes.addressof(buffer)
+        metadata = AddressSpaceMetadata("{:x}-{:x} rw-p 00000000 00:00 0".format(
+            buffer_address, buffer_address + len(needle)))
+        memory_search = ms.ProcessMemorySearch(os.getpid(), lambda: [metadata])
+
+        matches = memory_search.search([needle])
+
+        self.assertEqual(matches, [ms.SearchMatch(buffer_address, len(needle))])
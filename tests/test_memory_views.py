@@ -0,0 +1,90 @@
+import struct
+import unittest
+from unittest.mock import MagicMock
+from memvis.memory.memory_reader import AddressSpaceMetadata
+from memvis.concurrent import MemorySnapshot
+from memvis.cli import memory_views as mv
+
+
+class TestMemoryView(unittest.TestCase):
+
+    def test_decode_endianness(self):
+        view = mv.VIEWS[1]
+
+        self.assertEqual(view.decode(b"\x01\x00\x00\x00\x02"), [1])
+        self.assertEqual(view.decode(b"\x00\x00\x00\x01", big_endian=True), [1])
+
+    def test_decode_floats(self):
+        f64_view = mv.VIEWS[4]
+
+        self.assertEqual(f64_view.decode(struct.pack("<d", 1.5)), [1.5])
+        self.assertEqual(f64_view.format_value(1.5, None), "1.5")
+
+    def test_decode_rows_whole_words(self):
+        rows = mv.decode_rows(mv.VIEWS[1], bytes(range(16)), 8, 2)
+
+        self.assertEqual(rows, [[0x03020100, 0x07060504], [0x0b0a0908, 0x0f0e0d0c]])
+
+    def test_decode_rows_with_leftover_bytes(self):
+        rows = mv.decode_rows(mv.VIEWS[1], bytes(range(10)), 5, 2)
+
+        self.assertEqual(rows, [[0x03020100], [0x08070605]])
+
+    def test_format_hex_word(self):
+        self.assertEqual(mv.VIEWS[2].format_value(0x10, None), "0x0000000000000010")
+
+    def test_format_pointer(self):
+        self.assertEqual(mv.format_pointer(0x10, None), "0x10")
+        self.assertEqual(mv.format_pointer(0x10, lambda value: "libc.so!printf"),
+                         "0x10 libc.so!printf")
+        self.assertEqual(mv.format_pointer(0x10, lambda value: None), "0x10")
+
+
+class TestPointerAnnotator(unittest.TestCase):
+
+    def setUp(self):
+        self.symbol_cache = MagicMock()
+        self.symbol_cache.symbolize.return_value = None
+        self.annotator = mv.PointerAnnotator(self.symbol_cache)
+
+    def create_snapshot(self, *maps_lines):
+        memory_maps = []
+        for maps_line in maps_lines:
+            memory_map = MagicMock()
+            memory_map.metadata = AddressSpaceMetadata(maps_line)
+            memory_maps.append(memory_map)
+        return MemorySnapshot(memory_maps)
+
+    def test_annotate_anonymous_and_unmapped(self):
+        self.annotator.set_snapshot(self.create_snapshot(
+            "1000-2000 rw-p 00000000 00:00 0 [heap]",
+            "3000-4000 rw-p 00000000 00:00 0"))
+
+        self.assertEqual(self.annotator.annotate(0x1800), "[heap]")
+        self.assertEqual(self.annotator.annotate(0x3000), "anon")
+        self.assertIsNone(self.annotator.annotate(0x2000))
+
+    def test_annotate_file_symbol_and_offset(self):
+        self.annotator.set_snapshot(self.create_snapshot(
+            "1000-2000 r-xp 00010000 08:01 42 /usr/lib/libc.so.6"))
+        self.assertEqual(self.annotator.annotate(0x1010), "libc.so.6+0x10010")
+
+        self.symbol_cache.symbolize.return_value = "printf+0x5"
+        self.annotator.set_snapshot(self.create_snapshot(
+            "1000-3000 r-xp 00010000 08:01 42 /usr/lib/libc.so.6"))
+
+        self.assertEqual(self.annotator.annotate(0x1010), "libc.so.6!printf+0x5")
+
+    def test_annotate_is_memoized_per_address_space(self):
+        snapshot = self.create_snapshot("1000-2000 r-xp 00000000 08:01 42 /bin/true")
+        self.annotator.set_snapshot(snapshot)
+        self.annotator.annotate(0x1010)
+        self.annotator.set_snapshot(self.create_snapshot(
+            "1000-2000 r-xp 00000000 08:01 42 /bin/true"))
+        self.annotator.annotate(0x1010)
+
+        self.assertEqual(self.symbol_cache.symbolize.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+from memvis.memory import page_store as ps
+from memvis.memory.memory_reader import MemoryMap
+from memvis.memory.memory_reader import AddressSpaceMetadata
+from memvis.memory.memory_diff import diff_memory_bytes
+
+PAGE_SIZE = ps.PAGE_SIZE
+
+
+class TestPageStore(unittest.TestCase):
+
+    def setUp(self):
+        self.page_store = ps.PageStore()
+        self.memory_bytes = bytearray(4 * PAGE_SIZE)
+        self.memory_bytes[PAGE_SIZE:2 * PAGE_SIZE] = b"\x01" * PAGE_SIZE
+        self.memory_bytes[3 * PAGE_SIZE:] = b"\x01" * PAGE_SIZE
+
+    def test_add_memory_deduplicates_pages(self):
+        paged_memory = self.page_store.add_memory(bytes(self.memory_bytes))
+
+        self.assertEqual(list(paged_memory.page_ids), [0, 1, 0, 1])
+        self.assertEqual(len(self.page_store), 1)
+        self.assertEqual(self.page_store.get_stored_size(), PAGE_SIZE)
+        self.assertEqual(paged_memory.tobytes(), bytes(self.memory_bytes))
+
+    def test_add_memory_from_memoryview(self):
+        paged_memory = self.page_store.add_memory(memoryview(self.memory_bytes))
+
+        self.assertEqual(list(paged_memory.page_ids), [0, 1, 0, 1])
+
+    def test_add_memory_partial_page(self):
+        paged_memory = self.page_store.add_memory(b"\x00" * PAGE_SIZE + b"ab")
+
+        self.assertEqual(len(paged_memory), PAGE_SIZE + 2)
+        self.assertEqual(paged_memory[PAGE_SIZE - 1:], b"\x00ab")
+        self.assertEqual(paged_memory[-1], ord("b"))
+
+    def test_slices_across_pages(self):
+        paged_memory = self.page_store.add_memory(bytes(self.memory_bytes))
+
+        self.assertEqual(paged_memory[PAGE_SIZE - 2:PAGE_SIZE + 2], b"\x00\x00\x01\x01")
+
+    def test_release_frees_unreferenced_pages(self):
+        first = self.page_store.add_memory(bytes(self.memory_bytes))
+        second = self.page_store.add_memory(b"\x02" * PAGE_SIZE)
+
+        first.release()
+
+        self.assertEqual(len(self.page_store), 1)
+        third = self.page_store.add_memory(b"\x03" * PAGE_SIZE)
+        self.assertEqual(list(third.page_ids), [1])
+        self.assertEqual(second.tobytes(), b"\x02" * PAGE_SIZE)
+
+    def test_retain_keeps_pages(self):
+        paged_memory = self.page_store.add_memory(b"\x02" * PAGE_SIZE)
+        self.page_store.retain(paged_memory.page_ids)
+
+        paged_memory.release()
+
+        self.assertEqual(paged_memory.tobytes(), b"\x02" * PAGE_SIZE)
+
+    def test_get_changed_pages(self):
+        old = self.page_store.add_memory(bytes(self.memory_bytes))
+        self.memory_bytes[2 * PAGE_SIZE + 5] = 0x07
+        new = self.page_store.add_memory(bytes(self.memory_bytes))
+
+        self.assertEqual(new.get_changed_pages(old), [2])
+        self.assertEqual(diff_memory_bytes(old, new, 0x1000),
+                         [(0x1000 + 2 * PAGE_SIZE + 5, 0x1000 + 2 * PAGE_SIZE + 6)])
+
+    def test_diff_with_flat_bytes(self):
+        old = self.page_store.add_memory(bytes(self.memory_bytes))
+        self.memory_bytes[0] = 0x07
+
+        self.assertEqual(diff_memory_bytes(old, bytes(self.memory_bytes)), [(0, 1)])
+
+    def test_memory_map_store_pages(self):
+        metadata = AddressSpaceMetadata("{:x}-{:x} rw-p 00000000 00:00 0".format(
+            0x10000, 0x10000 + len(self.memory_bytes)))
+        memory_map = MemoryMap(1, metadata, bytes(self.memory_bytes)).store_pages(self.page_store)
+
+        self.assertTrue(memory_map.is_paged())
+        self.assertEqual(memory_map.get_range(0x10000 + PAGE_SIZE - 1, 0x10000 + PAGE_SIZE + 1),
+                         b"\x00\x01")
+        buffer = bytearray(4)
+        memory_map.copy_range(buffer, 0, 0x10000 + PAGE_SIZE - 2, 0x10000 + PAGE_SIZE + 2)
+        self.assertEqual(buffer, b"\x00\x00\x01\x01")
+
+    def test_add_memory_delta_shares_unchanged_pages(self):
+        previous_bytes = bytes(self.memory_bytes)
+        old = self.page_store.add_memory(previous_bytes)
+        self.memory_bytes[3 * PAGE_SIZE] = 0x07
+        new = self.page_store.add_memory(bytes(self.memory_bytes), old, previous_bytes)
+
+        self.assertEqual(new.get_changed_pages(old), [3])
+        self.assertEqual(new.page_ids[1], old.page_ids[1])
+        self.assertEqual(new.tobytes(), bytes(self.memory_bytes))
+        old.release()
+        self.assertEqual(new.tobytes(), bytes(self.memory_bytes))
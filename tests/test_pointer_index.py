@@ -0,0 +1,107 @@
+import struct
+import unittest
+from memvis.concurrent import pointer_index as pi
+from memvis.concurrent.memory_snapshot import MemorySnapshot
+from memvis.memory.memory_reader import MemoryMap
+from memvis.memory.memory_reader import AddressSpaceMetadata
+from memvis.memory.memory_reader import UNREADABLE_MEMORY
+
+PAGE_SIZE = pi.PAGE_SIZE
+HEAP_ADDRESS = 0x555555554000
+STACK_ADDRESS = 0x7ffffffde000
+
+
+def create_memory_map(address, memory_bytes):
+    metadata = AddressSpaceMetadata("{:x}-{:x} rw-p 00000000 00:00 0".format(
+        address, address + len(memory_bytes)))
+    return MemoryMap(1, metadata, memory_bytes, address)
+
+
+def write_pointer(memory_bytes, offset, pointer):
+    memory_bytes[offset:offset + 8] = struct.pack("<Q", pointer)
+
+
+class TestPointerIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.heap = bytearray(2 * PAGE_SIZE)
+        self.stack = bytearray(PAGE_SIZE)
+        write_pointer(self.heap, 0, STACK_ADDRESS + 16)
+        write_pointer(self.heap, 8, HEAP_ADDRESS + 4)
+        write_pointer(self.stack, 32, STACK_ADDRESS + 16)
+        write_pointer(self.stack, 40, 0x1234)
+        write_pointer(self.stack, 48, HEAP_ADDRESS + 2 * PAGE_SIZE)
+        self.pointer_index = pi.PointerIndex()
+        self.pointer_index.update(self.create_snapshot(self.heap, self.stack))
+
+    def create_snapshot(self, heap, stack):
+        return MemorySnapshot([create_memory_map(HEAP_ADDRESS, bytes(heap)),
+                               create_memory_map(STACK_ADDRESS, bytes(stack))])
+
+    def test_get_prefix_regex_without_common_prefix(self):
+        self.assertIsNone(pi.get_prefix_regex(0x400000, 0x7fffffffffff))
+
+    def test_extract_pointers_only_mapped_targets(self):
+        snapshot = self.create_snapshot(self.heap, self.stack)
+
+        pointers = pi.extract_pointers(snapshot.ordered_memory_maps[1], snapshot.address_index)
+
+        self.assertEqual(pointers, [(STACK_ADDRESS + 16, STACK_ADDRESS + 32)])
+
+    def test_extract_pointers_aligned_words_only(self):
+        heap = bytearray(PAGE_SIZE)
+        write_pointer(heap, 12, HEAP_ADDRESS)
+        memory_map = create_memory_map(HEAP_ADDRESS, bytes(heap))
+
+        pointers = pi.extract_pointers(memory_map, MemorySnapshot([memory_map]).address_index)
+
+        self.assertEqual(pointers, [])
+
+    def test_extract_pointers_skips_unreadable(self):
+        memory_map = create_memory_map(HEAP_ADDRESS, UNREADABLE_MEMORY)
+
+        self.assertEqual(pi.extract_pointers(memory_map, MemorySnapshot().address_index), [])
+
+    def test_find_referrers(self):
+        self.assertEqual(self.pointer_index.find_referrers(STACK_ADDRESS + 16),
+                         [HEAP_ADDRESS, STACK_ADDRESS + 32])
+        self.assertEqual(self.pointer_index.find_referrers(HEAP_ADDRESS + 4), [HEAP_ADDRESS + 8])
+        self.assertEqual(self.pointer_index.find_referrers(0x1234), [])
+        self.assertEqual(len(self.pointer_index), 3)
+
+    def test_find_references(self):
+        self.assertEqual(self.pointer_index.find_references(HEAP_ADDRESS, HEAP_ADDRESS + 8),
+                         [(HEAP_ADDRESS + 4, HEAP_ADDRESS + 8)])
+
+    def test_update_changed_words(self):
+        write_pointer(self.stack, 32, HEAP_ADDRESS + 4)
+        write_pointer(self.heap, PAGE_SIZE, STACK_ADDRESS)
+
+        self.pointer_index.update(self.create_snapshot(self.heap, self.stack))
+
+        self.assertEqual(self.pointer_index.find_referrers(STACK_ADDRESS + 16), [HEAP_ADDRESS])
+        self.assertEqual(self.pointer_index.find_referrers(HEAP_ADDRESS + 4),
+                         [HEAP_ADDRESS + 8, STACK_ADDRESS + 32])
+        self.assertEqual(self.pointer_index.find_referrers(STACK_ADDRESS),
+                         [HEAP_ADDRESS + PAGE_SIZE])
+
+    def test_update_many_changes(self):
+        for offset in range(0, PAGE_SIZE, 8):
+            write_pointer(self.heap, PAGE_SIZE + offset, STACK_ADDRESS)
+
+        self.pointer_index.update(self.create_snapshot(self.heap, self.stack))
+
+        self.assertEqual(len(self.pointer_index.find_referrers(STACK_ADDRESS)), PAGE_SIZE // 8)
+        self.assertEqual(self.pointer_index.find_referrers(STACK_ADDRESS + 16),
+                         [HEAP_ADDRESS, STACK_ADDRESS + 32])
+
+    def test_update_new_mapping_rebuilds(self):
+        write_pointer(self.stack, 40, 0x10000)
+        snapshot = MemorySnapshot([create_memory_map(HEAP_ADDRESS, bytes(self.heap)),
+                                   create_memory_map(STACK_ADDRESS, bytes(self.stack)),
+                                   create_memory_map(0x10000, bytes(PAGE_SIZE))])
+
+        self.pointer_index.update(snapshot)
+
+        self.assertEqual(self.pointer_index.find_referrers(0x10000), [STACK_ADDRESS + 40])
+        self.assertEqual(len(self.pointer_index), 4)
@@ -0,0 +1,93 @@
+import io
+import unittest
+from unittest.mock import MagicMock
+from memvis.memory import process_session as ps
+from memvis.memory.read_backend import ReadResult
+from memvis.memory.memory_reader import AddressSpaceMetadata
+
+START = 0x1000
+
+
+class FakeReadBackend(object):
+    def __init__(self, memory_bytes):
+        self.memory_bytes = memory_bytes
+        self.requests = []
+
+    def read_ranges(self, ranges):
+        self.requests.append(ranges)
+        results = []
+        for address, size in ranges:
+            offset = address - START
+            if not 0 <= offset < len(self.memory_bytes):
+                results.append(ReadResult(address, b"", OSError(5, "Input/output error")))
+            else:
+                results.append(ReadResult(address, self.memory_bytes[offset:offset + size]))
+        return results
+
+
+class TestProcessSession(unittest.TestCase):
+
+    def setUp(self):
+        self.memory_bytes = bytes(range(256)) * 4
+        self.read_backend = FakeReadBackend(self.memory_bytes)
+        self.memory_reader = MagicMock()
+        self.memory_reader.read_backend = self.read_backend
+        self.session = ps.ProcessSession(1234, read_workers=2, memory_reader=self.memory_reader)
+
+    def test_read(self):
+        self.assertEqual(self.session.read(START + 16, 32), self.memory_bytes[16:48])
+
+    def test_read_stops_at_end_of_readable_memory(self):
+        self.assertEqual(self.session.read(START + 1000, 100), self.memory_bytes[1000:])
+
+    def test_read_unreadable_address(self):
+        self.assertRaises(ps.ProcessSessionError, self.session.read, 0, 16)
+
+    def test_iter_read_batches_chunks_by_workers(self):
+        chunks = list(self.session.iter_read(START, 1000, chunk_size=256))
+
+        self.assertEqual(b"".join(chunks), self.memory_bytes[:1000])
+        self.assertEqual([len(ranges) for ranges in self.read_backend.requests], [2, 2])
+
+    def test_write_range(self):
+        output = io.BytesIO()
+
+        written = self.session.write_range(output, START, 300)
+
+        self.assertEqual(written, 300)
+        self.assertEqual(output.getvalue(), self.memory_bytes[:300])
+
+    def test_write_hexdump(self):
+        output = io.StringIO()
+
+        written = self.session.write_hexdump(output, START + 0x41, 20)
+
+        self.assertEqual(written, 20)
+        self.assertEqual(output.getvalue().splitlines(), [
+            "0000000000001041  41 42 43 44 45 46 47 48 49 4a 4b 4c 4d 4e 4f 50  |ABCDEFGHIJKLMNOP|",
+            "0000000000001051  51 52 53 54" + " " * 36 + "  |QRST|"])
+
+    def test_format_hexdump_line_replaces_unprintable_bytes(self):
+        self.assertEqual(ps.format_hexdump_line(0, b"a\x00\xff", 4),
+                         "0000000000000000  61 00 ff     |a..|")
+
+    def test_regions_refreshes_metadata(self):
+        metadata = AddressSpaceMetadata("1000-2000 rw-p 00000000 00:00 0")
+        self.memory_reader.maps_metadata = [metadata]
+
+        self.assertEqual(self.session.regions(), [metadata])
+        self.memory_reader.refresh_memory_map_metadata.assert_called_once_with()
+
+    def test_search_parses_query(self):
+        self.session.memory_search = MagicMock()
+
+        self.session.search("x:de ad", max_matches=5)
+
+        self.session.memory_search.search.assert_called_once_with([b"\xde\xad"])
+        self.assertEqual(self.session.memory_search.max_matches, 5)
+
+    def test_close(self):
+        with self.session:
+            pass
+
+        self.memory_reader.close.assert_called_once_with()
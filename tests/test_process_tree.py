@@ -0,0 +1,20 @@
+import os
+import unittest
+from memvis.memory import process_tree as pt
+
+
+class TestProcessTree(unittest.TestCase):
+
+    def test_parse_parent_pid(self):
+        self.assertEqual(pt.parse_parent_pid("42 (a) b) S 7 42 42 0 -1"), 7)
+
+    def test_get_process_tree(self):
+        parent_pids = {1: 0, 10: 1, 11: 10, 12: 10, 13: 11, 20: 1}
+
+        self.assertEqual(pt.get_process_tree(10, parent_pids), [10, 11, 12, 13])
+
+    def test_get_process_tree_without_children(self):
+        self.assertEqual(pt.get_process_tree(5, {5: 1}), [5])
+
+    def test_read_parent_pids_includes_self(self):
+        self.assertEqual(pt.read_parent_pids()[os.getpid()], os.getppid())
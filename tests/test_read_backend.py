@@ -0,0 +1,191 @@
+import os
+import errno
+import ctypes
+import unittest
+import logging
+from unittest.mock import patch, call, MagicMock
+from memvis.memory import read_backend as rb
+
+
+class TestUtilities(unittest.TestCase):
+
+    def test_create_mem_file_backend(self):
+        backend = rb.create_read_backend(rb.MEM_FILE_BACKEND, 1234)
+
+        self.assertIsInstance(backend, rb.MemFileReadBackend)
+
+    def test_create_process_vm_backend(self):
+        backend = rb.create_read_backend(rb.PROCESS_VM_BACKEND, 1234)
+
+        self.assertIsInstance(backend, rb.ProcessVmReadBackend)
+
+    def test_create_parallel_backend(self):
+        backend = rb.create_read_backend(rb.PARALLEL_MEM_FILE_BACKEND, 1234, 3)
+
+        self.assertIsInstance(backend, rb.ParallelMemFileReadBackend)
+        self.assertEqual(backend.workers, 3)
+        backend.close()
+
+    def test_shard_read_pieces_balances_sizes(self):
+        pieces = [(index, 0, 0, size) for index, size in enumerate([5, 8, 6, 7])]
+
+        shards = rb.shard_read_pieces(pieces, 2)
+
+        self.assertEqual([sum(piece[3] for piece in shard) for shard in shards],
+                         [13, 13])
+
+    def test_create_unknown_backend(self):
+        self.assertRaises(ValueError, rb.create_read_backend, "unknown", 1234)
+
+
+class TestMemFileReadBackend(unittest.TestCase):
+
+    def setUp(self):
+        self.target_pid = 1234
+        self.backend = rb.MemFileReadBackend(self.target_pid)
+
+    @patch('builtins.open', return_value=MagicMock())
+    def test_read_ranges_keeps_file_open(self, context_manager):
+        mem_file = context_manager.return_value
+        mem_file.read.side_effect = [b"\x01\x02", b"\x03"]
+
+        results = self.backend.read_ranges([(0x1000, 2), (0x3000, 1)])
+
+        self.assertEqual([result.memory_bytes for result in results],
+                         [b"\x01\x02", b"\x03"])
+        open.assert_has_calls([call("/proc/1234/mem", "rb", buffering=0)])
+        self.assertEqual(open.call_count, 1)
+        mem_file.seek.assert_has_calls([call(0x1000), call(0x3000)])
+
+    @patch('builtins.open', return_value=MagicMock())
+    def test_read_ranges_reports_failed_range(self, context_manager):
+        mem_file = context_manager.return_value
+        mem_file.read.side_effect = [OSError(errno.EIO, "EIO"), b"\x03"]
+
+        results = self.backend.read_ranges([(0x1000, 2), (0x3000, 1)])
+
+        self.assertFalse(results[0].is_successful())
+        self.assertTrue(results[1].is_successful())
+        self.assertEqual(results[1].memory_bytes, b"\x03")
+
+    @patch('builtins.open', return_value=MagicMock())
+    def test_close(self, context_manager):
+        self.backend.read(0x1000, 1)
+
+        self.backend.close()
+
+        context_manager.return_value.close.assert_called_once_with()
+
+
+class TestParallelMemFileReadBackend(unittest.TestCase):
+
+    def __init__(self, *args, **kwargs):
+        super(TestParallelMemFileReadBackend, self).__init__(*args, **kwargs)
+        logging.disable(logging.CRITICAL)
+
+    def setUp(self):
+        self.backend = rb.ParallelMemFileReadBackend(os.getpid(), workers=2, chunk_size=4)
+        self.first = ctypes.create_string_buffer(b"first buffer")
+        self.second = ctypes.create_string_buffer(b"second buffer")
+
+    def tearDown(self):
+        self.backend.close()
+
+    def test_read(self):
+        memory_bytes = self.backend.read(ctypes.addressof(self.first), 5)
+
+        self.assertEqual(memory_bytes, b"first")
+
+    def test_read_ranges_split_into_chunks(self):
+        results = self.backend.read_ranges([
+            (ctypes.addressof(self.first), 12),
+            (ctypes.addressof(self.second), 13)])
+
+        self.assertEqual([result.memory_bytes for result in results],
+                         [b"first buffer", b"second buffer"])
+
+    def test_read_ranges_reports_failed_range(self):
+        results = self.backend.read_ranges([
+            (ctypes.addressof(self.first), 5),
+            (0, 16)])
+
+        self.assertTrue(results[0].is_successful())
+        self.assertFalse(results[1].is_successful())
+        self.assertEqual(results[1].memory_bytes, b"")
+
+
+class TestProcessVmReadBackend(unittest.TestCase):
+
+    def __init__(self, *args, **kwargs):
+        super(TestProcessVmReadBackend, self).__init__(*args, **kwargs)
+        logging.disable(logging.CRITICAL)
+
+    def setUp(self):
+        self.backend = rb.ProcessVmReadBackend(os.getpid())
+        self.first = ctypes.create_string_buffer(b"first buffer")
+        self.second = ctypes.create_string_buffer(b"second buffer")
+
+    def test_read(self):
+        memory_bytes = self.backend.read(ctypes.addressof(self.first), 5)
+
+        self.assertEqual(memory_bytes, b"first")
+
+    def test_read_ranges(self):
+        results = self.backend.read_ranges([
+            (ctypes.addressof(self.first), 5),
+            (ctypes.addressof(self.second), 6)])
+
+        self.assertEqual([result.memory_bytes for result in results],
+                         [b"first", b"second"])
+
+    def test_read_ranges_reports_failed_iovec(self):
+        results = self.backend.read_ranges([
+            (ctypes.addressof(self.first), 5),
+            (0, 16),
+            (ctypes.addressof(self.second), 6)])
+
+        self.assertTrue(results[0].is_successful())
+        self.assertFalse(results[1].is_successful())
+        self.assertEqual(results[1].error.errno, errno.EFAULT)
+        self.assertEqual(results[2].memory_bytes, b"second")
+
+    def test_read_ranges_more_than_iov_max(self):
+        ranges = [(ctypes.addressof(self.first), 5)] * (rb.IOV_MAX + 1)
+
+        results = self.backend.read_ranges(ranges)
+
+        self.assertEqual(len(results), rb.IOV_MAX + 1)
+        self.assertTrue(all(result.memory_bytes == b"first"
+                            for result in results))
+
+    def test_read_failed_iovec_raises(self):
+        self.assertRaises(OSError, self.backend.read, 0, 16)
+
+
+class TestRangeReaders(unittest.TestCase):
+
+    def setUp(self):
+        self.data = ctypes.create_string_buffer(b"sampled memory", 16)
+        self.address = ctypes.addressof(self.data)
+
+    def test_create_range_reader_prefers_process_vm(self):
+        range_reader = rb.create_range_reader(os.getpid(),
+                                              [(self.address, 7), (self.address + 8, 6)])
+
+        self.assertIsInstance(range_reader, rb.ProcessVmRangeReader)
+        self.assertEqual(range_reader.read(), 13)
+        self.assertEqual(bytes(range_reader.buffer), b"sampledmemory")
+        range_reader.close()
+
+    def test_mem_file_range_reader(self):
+        range_reader = rb.MemFileRangeReader(os.getpid(), [(self.address, 7)])
+
+        self.data[0:1] = b"S"
+
+        self.assertEqual(range_reader.read(), 7)
+        self.assertEqual(bytes(range_reader.buffer), b"Sampled")
+        range_reader.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
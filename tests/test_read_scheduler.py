@@ -0,0 +1,43 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock
+from memvis.concurrent.read_scheduler import ReadScheduler
+
+
+class TestReadScheduler(unittest.TestCase):
+
+    def test_run_scheduled_coroutines(self):
+        read_scheduler = ReadScheduler()
+        close_callback = MagicMock()
+        read_scheduler.add_close_callback(close_callback)
+        results = []
+
+        async def read(value):
+            results.append(await read_scheduler.run(lambda: value * 2))
+
+        read_scheduler.schedule(read, 1)
+        read_scheduler.schedule(read, 2)
+        read_scheduler.start()
+        read_scheduler.stop()
+        read_scheduler.join()
+
+        self.assertEqual(sorted(results), [2, 4])
+        close_callback.assert_called_once_with()
+
+    def test_acquire_unlimited(self):
+        read_scheduler = ReadScheduler()
+
+        read_scheduler.loop.run_until_complete(read_scheduler.acquire(2 ** 40))
+
+        read_scheduler.loop.close()
+
+    def test_acquire_waits_for_budget(self):
+        read_scheduler = ReadScheduler(read_budget=1000)
+        loop = read_scheduler.loop
+
+        start = loop.time()
+        loop.run_until_complete(read_scheduler.acquire(1000))
+        loop.run_until_complete(read_scheduler.acquire(100))
+
+        self.assertGreaterEqual(loop.time() - start, 0.09)
+        loop.close()
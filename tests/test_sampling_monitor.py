@@ -0,0 +1,94 @@
+import unittest
+from unittest.mock import MagicMock
+from memvis.concurrent import sampling_monitor as sm
+
+START = 0x1000
+
+
+class FakeRangeReader(object):
+    def __init__(self, size):
+        self.buffer = bytearray(size)
+        self.closed = False
+
+    def read(self):
+        return len(self.buffer)
+
+    def close(self):
+        self.closed = True
+
+
+class TestSamplingMonitor(unittest.TestCase):
+
+    def setUp(self):
+        self.range_reader = FakeRangeReader(64)
+        self.monitor = sm.SamplingMonitor(1234, [(START + 3, START + 61)],
+                                          range_reader=self.range_reader)
+
+    def test_align_to_words(self):
+        self.assertEqual(sm.align_to_words(0x1003, 0x1011), (0x1000, 0x1018))
+        self.assertEqual(sm.align_to_words(0x1000, 0x1008), (0x1000, 0x1008))
+
+    def test_sample_counts_changed_words(self):
+        self.monitor.sample(1.0)
+        self.range_reader.buffer[9] = 1
+        self.monitor.sample(2.0)
+        self.range_reader.buffer[9] = 2
+        self.range_reader.buffer[16] = 1
+        self.monitor.sample(3.0)
+
+        self.assertEqual(self.monitor.get_change_count(START + 8), 2)
+        self.assertEqual(self.monitor.get_change_count(START + 20), 1)
+        self.assertEqual(self.monitor.get_change_count(START), 0)
+        self.assertEqual(self.monitor.get_change_count(START + 64), 0)
+        self.assertEqual(self.monitor.get_last_change(START + 15), 3.0)
+        self.assertIsNone(self.monitor.get_last_change(START))
+        self.assertEqual(self.monitor.statistics.changed_word_count, 2)
+        self.assertEqual(self.monitor.statistics.sample_count, 3)
+        self.assertEqual(self.monitor.change_generation, 2)
+
+    def test_change_across_words(self):
+        self.monitor.sample()
+        self.range_reader.buffer[7:9] = b"\x01\x01"
+        self.monitor.sample()
+
+        self.assertEqual(self.monitor.get_change_count(START), 1)
+        self.assertEqual(self.monitor.get_change_count(START + 8), 1)
+
+    def test_failed_sample(self):
+        self.range_reader.read = MagicMock(side_effect=OSError(3, "No such process"))
+
+        self.monitor.sample()
+
+        self.assertEqual(self.monitor.statistics.failed_count, 1)
+        self.assertEqual(self.monitor.statistics.sample_count, 0)
+
+    def test_get_heat(self):
+        self.monitor.sample()
+        for value in range(1, 9):
+            self.range_reader.buffer[0] = value
+            if value == 1:
+                self.range_reader.buffer[8] = 1
+            self.monitor.sample()
+
+        heat = self.monitor.get_heat(START - 4, START + 12)
+
+        self.assertEqual(list(heat), [0] * 4 + [sm.HEAT_LEVELS] * 8 + [1] * 4)
+
+    def test_statistics(self):
+        statistics = sm.SamplingStatistics(sample_count=500, elapsed_time=0.5, busy_time=0.05)
+
+        self.assertEqual(statistics.get_sample_rate(), 1000)
+        self.assertAlmostEqual(statistics.get_busy_fraction(), 0.1)
+        self.assertAlmostEqual(statistics.get_sample_time(), 0.0001)
+
+    def test_start_and_stop(self):
+        monitor = sm.SamplingMonitor(1234, [(START, START + 8)], sample_rate=10000,
+                                     range_reader=self.range_reader)
+
+        monitor.start()
+        monitor.stop()
+
+        self.assertFalse(monitor.thread.is_alive())
+        self.assertTrue(self.range_reader.closed)
+        self.assertGreater(monitor.get_statistics().elapsed_time, 0)
+
@@ -0,0 +1,48 @@
+import unittest
+from memvis.memory import shared_mappings as sm
+from memvis.memory.memory_reader import AddressSpaceMetadata
+
+SMAPS_LINES = [
+    "55f0c0a00000-55f0c0a02000 r--p 00000000 08:01 42    /usr/bin/sleep\n",
+    "Size:                  8 kB\n",
+    "Anonymous:             0 kB\n",
+    "VmFlags: rd mr mw me sd\n",
+    "7f0000000000-7f0000004000 r--p 001f0000 08:01 77    /usr/lib/libc.so.6\n",
+    "Anonymous:            16 kB\n",
+    "7ffd00000000-7ffd00021000 rw-p 00000000 00:00 0     [stack]\n",
+    "Anonymous:           132 kB\n",
+]
+
+
+class TestSharedMappings(unittest.TestCase):
+
+    def setUp(self):
+        self.metadata = AddressSpaceMetadata("1000-3000 r--p 00002000 08:01 42 /lib/libc.so")
+        self.other_metadata = AddressSpaceMetadata("9000-b000 r--p 00002000 08:01 42 /lib/libc.so")
+
+    def test_parse_anonymous_sizes(self):
+        self.assertEqual(sm.parse_anonymous_sizes(SMAPS_LINES),
+                         {0x55f0c0a00000: 0, 0x7f0000000000: 16, 0x7ffd00000000: 132})
+
+    def test_get_mapping_key_ignores_address(self):
+        self.assertEqual(sm.get_mapping_key(self.metadata),
+                         sm.get_mapping_key(self.other_metadata))
+
+    def test_cache_get_and_put(self):
+        shared_mappings = sm.SharedMappingCache()
+        memory_bytes = bytes(0x2000)
+
+        self.assertIsNone(shared_mappings.get(self.metadata))
+        self.assertIs(shared_mappings.put(self.metadata, memory_bytes), memory_bytes)
+        self.assertIs(shared_mappings.put(self.other_metadata, bytes(0x2000)), memory_bytes)
+        self.assertIs(shared_mappings.get(self.other_metadata), memory_bytes)
+        self.assertEqual(shared_mappings.hits, 1)
+        self.assertEqual(shared_mappings.get_stored_size(), 0x2000)
+
+    def test_cache_retain(self):
+        shared_mappings = sm.SharedMappingCache()
+        shared_mappings.put(self.metadata, bytes(0x2000))
+
+        shared_mappings.retain([])
+
+        self.assertEqual(len(shared_mappings), 0)
@@ -0,0 +1,105 @@
+import os
+import shutil
+import logging
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from memvis.memory import snapshot_file as sf
+from memvis.memory.memory_reader import MemoryMap
+from memvis.memory.memory_reader import UNREADABLE_MEMORY
+from memvis.memory.memory_reader import MemoryReaderError
+from memvis.memory.memory_reader import AddressSpaceMetadata
+
+
+PAGE_SIZE = sf.PAGE_SIZE
+
+
+class TestSnapshotFile(unittest.TestCase):
+
+    def __init__(self, *args, **kwargs):
+        super(TestSnapshotFile, self).__init__(*args, **kwargs)
+        logging.disable(logging.CRITICAL)
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.snapshot_path = os.path.join(self.directory, "snapshot.mvs")
+        self.heap = AddressSpaceMetadata(
+            "{:x}-{:x} rw-p 00000000 00:00 0 [heap]".format(0x10000, 0x10000 + 3 * PAGE_SIZE))
+        self.library = AddressSpaceMetadata(
+            "{:x}-{:x} r--p 00001000 08:06 685615 /lib/lib c.so".format(0x20000, 0x20000 + PAGE_SIZE))
+        self.heap_bytes = bytearray(3 * PAGE_SIZE)
+        self.heap_bytes[2 * PAGE_SIZE + 5] = 0x41
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_to_maps_line(self):
+        self.assertEqual(AddressSpaceMetadata(self.library.to_maps_line()), self.library)
+
+    def test_write_and_read_raw(self):
+        self.__write_snapshot(compress=False)
+
+        snapshot_file = sf.SnapshotFile(self.snapshot_path)
+        memory_maps = snapshot_file.read_memory_maps()
+
+        self.assertEqual(snapshot_file.pid, 1234)
+        self.assertEqual(snapshot_file.start_address, 0x10010)
+        self.assertEqual([memory_map.metadata for memory_map in memory_maps],
+                         [self.heap, self.library])
+        self.assertIsInstance(memory_maps[0].memory_bytes, memoryview)
+        self.assertEqual(memory_maps[0].memory_bytes, self.heap_bytes)
+        self.assertTrue(memory_maps[1].is_unreadable())
+
+    def test_write_and_read_compressed(self):
+        self.__write_snapshot(compress=True)
+
+        memory_maps = sf.SnapshotFile(self.snapshot_path).read_memory_maps()
+
+        self.assertEqual(memory_maps[0].memory_bytes, self.heap_bytes)
+        self.assertLessEqual(os.path.getsize(self.snapshot_path), 2 * PAGE_SIZE)
+
+    def test_write_unknown_memory_map(self):
+        snapshot_writer = sf.SnapshotFileWriter(self.snapshot_path, 1234, [self.heap])
+
+        self.assertRaises(sf.SnapshotFileError, snapshot_writer.write_memory_map,
+                          MemoryMap(1234, self.library, bytes(PAGE_SIZE)))
+        snapshot_writer.close()
+
+    def test_open_invalid_file(self):
+        with open(self.snapshot_path, "wb") as invalid_file:
+            invalid_file.write(b"not a snapshot" * 10)
+
+        self.assertRaises(sf.SnapshotFileError, sf.SnapshotFile, self.snapshot_path)
+
+    def test_dump_memory(self):
+        memory_reader = MagicMock()
+        memory_reader.target_pid = 1234
+        memory_reader.maps_metadata = [self.heap, self.library]
+        memory_reader.get_stack_pointer.side_effect = MemoryReaderError()
+        memory_reader.read_memory_regions.side_effect = lambda maps_metadata: [
+            MemoryMap(1234, metadata, bytes(metadata.memory_size)) for metadata in maps_metadata]
+
+        sf.dump_memory(memory_reader, self.snapshot_path, batch_size=PAGE_SIZE)
+
+        self.assertEqual(memory_reader.read_memory_regions.call_count, 2)
+        snapshot_file = sf.SnapshotFile(self.snapshot_path)
+        self.assertEqual(snapshot_file.start_address, 0)
+        self.assertEqual([len(memory_map.memory_bytes)
+                          for memory_map in snapshot_file.read_memory_maps()],
+                         [3 * PAGE_SIZE, PAGE_SIZE])
+
+    def test_get_dump_batches(self):
+        batches = list(sf.get_dump_batches([self.heap, self.library, self.heap], 4 * PAGE_SIZE))
+
+        self.assertEqual(batches, [[self.heap, self.library], [self.heap]])
+
+    def __write_snapshot(self, compress):
+        snapshot_writer = sf.SnapshotFileWriter(self.snapshot_path, 1234, [self.heap, self.library],
+                                                0x10010, compress)
+        snapshot_writer.write_memory_map(MemoryMap(1234, self.heap, self.heap_bytes))
+        snapshot_writer.write_memory_map(MemoryMap(1234, self.library, UNREADABLE_MEMORY))
+        snapshot_writer.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
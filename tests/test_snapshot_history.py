@@ -0,0 +1,94 @@
+import unittest
+from memvis.memory import PAGE_SIZE
+from memvis.memory.memory_reader import MemoryMap
+from memvis.memory.memory_reader import AddressSpaceMetadata
+from memvis.concurrent.memory_snapshot import MemorySnapshot
+from memvis.concurrent import snapshot_history as sh
+
+START = 0x10000
+PAGE_COUNT = 4
+
+
+def create_snapshot(memory_bytes, generation):
+    metadata = AddressSpaceMetadata("{:x}-{:x} rw-p 00000000 00:00 0".format(
+        START, START + len(memory_bytes)))
+    return MemorySnapshot([MemoryMap(1, metadata, memory_bytes)], generation)
+
+
+def create_memory(value):
+    memory_bytes = bytearray(b"\x01" * PAGE_COUNT * PAGE_SIZE)
+    memory_bytes[0] = value
+    return bytes(memory_bytes)
+
+
+class TestSnapshotHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.history = sh.SnapshotHistory(memory_budget=2 ** 20)
+
+    def test_record_shares_unchanged_pages(self):
+        self.history.record(create_snapshot(create_memory(2), 1), 1.0)
+        self.history.record(create_snapshot(create_memory(3), 2), 2.0)
+
+        self.assertEqual(len(self.history), 2)
+        self.assertEqual(len(self.history.page_store), 3)
+        self.assertEqual(self.history.get_snapshot(0).get_range(START, START + 2)[2], b"\x02\x01")
+        self.assertEqual(self.history.get_snapshot(1).get_range(START, START + 2)[2], b"\x03\x01")
+        self.assertEqual(self.history.get_timestamp(1), 2.0)
+
+    def test_record_skips_same_generation(self):
+        snapshot = create_snapshot(create_memory(2), 1)
+
+        self.history.record(snapshot)
+        self.history.record(snapshot)
+
+        self.assertEqual(len(self.history), 1)
+
+    def test_record_same_buffer_reuses_pages(self):
+        memory_bytes = create_memory(2)
+        self.history.record(create_snapshot(memory_bytes, 1))
+        self.history.record(create_snapshot(memory_bytes, 2))
+
+        first = self.history.get_snapshot(0).ordered_memory_maps[0].memory_bytes
+        second = self.history.get_snapshot(1).ordered_memory_maps[0].memory_bytes
+        self.assertIs(first, second)
+        self.assertEqual(len(self.history.page_store), 2)
+
+    def test_evicts_oldest_over_budget(self):
+        self.history.memory_budget = 5 * PAGE_SIZE
+        for generation in range(1, 6):
+            self.history.record(create_snapshot(create_memory(generation + 1), generation),
+                                float(generation))
+
+        self.assertLessEqual(self.history.get_memory_size(), 5 * PAGE_SIZE)
+        self.assertEqual(self.history.get_generation(-1), 5)
+        self.assertEqual(self.history.get_generation(0), 3)
+        self.assertEqual(self.history.get_snapshot(0).get_range(START, START + 1)[2], b"\x04")
+
+    def test_evicts_least_recently_viewed(self):
+        self.history.memory_budget = 5 * PAGE_SIZE
+        for generation in range(1, 4):
+            self.history.record(create_snapshot(create_memory(generation + 1), generation),
+                                float(generation))
+        self.history.get_snapshot(0)
+
+        self.history.record(create_snapshot(create_memory(5), 4), 4.0)
+
+        self.assertEqual([self.history.get_generation(index) for index in range(3)], [1, 3, 4])
+
+    def test_never_evicts_newest(self):
+        self.history.memory_budget = 0
+
+        self.history.record(create_snapshot(create_memory(2), 1))
+        self.history.record(create_snapshot(create_memory(3), 2))
+
+        self.assertEqual(len(self.history), 1)
+        self.assertEqual(self.history.get_generation(0), 2)
+
+    def test_find_index(self):
+        for generation in (2, 4, 6):
+            self.history.record(create_snapshot(create_memory(generation), generation))
+
+        self.assertEqual(self.history.find_index(4), 1)
+        self.assertEqual(self.history.find_index(3), 1)
+        self.assertEqual(self.history.find_index(7), 2)
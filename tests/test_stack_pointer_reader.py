@@ -1,8 +1,8 @@
 import unittest
 import logging
 from unittest.mock import patch, call, MagicMock
-from memvis.stack_pointer_reader import get_process_syscall_path
-from memvis.stack_pointer_reader import PtraceStackPointerReader
+from memvis.memory.stack_pointer_reader import get_process_syscall_path
+from memvis.memory.stack_pointer_reader import PtraceStackPointerReader
 
 
 class TestUtilities(unittest.TestCase):
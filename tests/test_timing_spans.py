@@ -0,0 +1,93 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from memvis.memory import timing_spans as ts
+
+
+class TestSpanStatistics(unittest.TestCase):
+
+    def test_percentiles(self):
+        span = ts.SpanStatistics()
+        for duration in range(1, 101):
+            span.record(duration / 1000.0)
+
+        self.assertEqual(span.get_percentile(0.5), 0.051)
+        self.assertEqual(span.get_percentile(0.99), 0.1)
+        self.assertEqual(span.get_percentile(1.0), 0.1)
+
+    def test_percentiles_of_rolling_window(self):
+        span = ts.SpanStatistics(window=4)
+        for duration in [10.0, 10.0, 1.0, 2.0, 3.0, 4.0]:
+            span.record(duration)
+
+        self.assertEqual(span.get_percentile(1.0), 4.0)
+        self.assertEqual(span.count, 6)
+
+    def test_empty_percentile(self):
+        self.assertEqual(ts.SpanStatistics().get_percentile(0.5), 0.0)
+
+    def test_throughput(self):
+        span = ts.SpanStatistics()
+        span.record(0.5, 1000)
+        span.record(0.5, 3000)
+
+        self.assertEqual(span.get_throughput(), 4000)
+
+
+class TestTimingSpans(unittest.TestCase):
+
+    def setUp(self):
+        self.timing_spans = ts.TimingSpans()
+
+    def test_disabled_spans_are_not_recorded(self):
+        started_at = self.timing_spans.start()
+        self.timing_spans.stop(ts.READ_SPAN, started_at, 100)
+
+        self.assertIsNone(started_at)
+        self.assertIsNone(self.timing_spans.get_span(ts.READ_SPAN))
+
+    @patch("memvis.memory.timing_spans.time.perf_counter")
+    def test_records_span(self, perf_counter):
+        perf_counter.side_effect = [1.0, 1.25]
+        self.timing_spans.enable()
+
+        self.timing_spans.stop(ts.READ_SPAN, self.timing_spans.start(), 4096)
+
+        span = self.timing_spans.get_span(ts.READ_SPAN)
+        self.assertEqual(span.count, 1)
+        self.assertEqual(span.total_time, 0.25)
+        self.assertEqual(span.total_size, 4096)
+
+    def test_enable_resets_spans(self):
+        self.timing_spans.enable()
+        self.timing_spans.stop(ts.MAPS_SPAN, self.timing_spans.start())
+        self.timing_spans.disable()
+
+        self.timing_spans.enable()
+
+        self.assertIsNone(self.timing_spans.get_span(ts.MAPS_SPAN))
+
+    def test_get_summary(self):
+        self.timing_spans.enable()
+        self.timing_spans.spans[ts.READ_SPAN] = ts.SpanStatistics()
+        self.timing_spans.spans[ts.READ_SPAN].record(0.002, 2 * 10 ** 6)
+        self.timing_spans.spans[ts.RENDER_SPAN] = ts.SpanStatistics()
+        self.timing_spans.spans[ts.RENDER_SPAN].record(0.00015)
+
+        self.assertEqual(self.timing_spans.get_summary(),
+                         "read 2.0ms/2.0ms 1000MB/s  render 150us/150us")
+
+    def test_log_spans(self):
+        self.timing_spans.spans[ts.MAPS_SPAN] = ts.SpanStatistics()
+        self.timing_spans.spans[ts.MAPS_SPAN].record(0.0004)
+
+        self.timing_spans._log = MagicMock()
+
+        self.timing_spans.log_spans()
+
+        self.timing_spans._log.info.assert_called_once_with(
+            "Span : maps, count : 1, p50 : 400us, p99 : 400us, max : 400us")
+
+    def test_format_duration(self):
+        self.assertEqual(ts.format_duration(0.0000042), "4us")
+        self.assertEqual(ts.format_duration(0.0123), "12.3ms")
+        self.assertEqual(ts.format_duration(2.5), "2.50s")